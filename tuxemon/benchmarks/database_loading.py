@@ -0,0 +1,85 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+#
+# benchmarks.database_loading Compares reading the JSON database against the database bundle.
+#
+"""Measures how long it takes to load every table of the game database by parsing each JSON
+file under resources/db compared to loading the packed database bundle.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/database_loading.py
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.components import db
+
+ROUNDS = 50
+
+
+def best_of(rounds, function):
+    """Runs a function several times and returns the fastest run in milliseconds."""
+    times = []
+    for i in range(rounds):
+        start = time.time()
+        function()
+        times.append((time.time() - start) * 1000.)
+    return min(times)
+
+
+def load_json():
+    database = db.JSONDatabase()
+    for table in database.database:
+        database.read_json(table)
+
+
+def load_bundle():
+    database = db.JSONDatabase()
+    if not database.load_bundle():
+        raise RuntimeError("The database bundle is out of date")
+
+
+def main():
+    # Make sure the bundle is up to date.
+    db.JSONDatabase().load()
+
+    files = sum(len(files) for files in db.JSONDatabase().get_sources().values())
+    json_time = best_of(ROUNDS, load_json)
+    bundle_time = best_of(ROUNDS, load_bundle)
+    print "%d JSON files: %.2f ms" % (files, json_time)
+    print "database bundle: %.2f ms (%.1fx faster)" % (bundle_time, json_time / bundle_time)
+
+
+if __name__ == "__main__":
+    main()
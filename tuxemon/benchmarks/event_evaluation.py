@@ -0,0 +1,112 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# benchmarks.event_evaluation Compares interpreted and compiled event conditions.
+#
+"""Measures how many events per millisecond the event engine can check. Checking an event the
+way the engine used to, by looking up each condition method by name and comparing the operator
+string every time, is compared against the functions made by EventEngine.compile_event.
+
+Every event of each map is checked on every frame, with the player standing still where the
+game starts, so mostly the conditions are checked. The actions are left out of the events.
+Since the player doesn't move, compiled events only check their conditions on every frame
+if one of them has no declared inputs, like button_pressed.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/event_evaluation.py [map.tmx ...]
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# We don't need a visible window or sound to check events.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from core import prepare
+from core import tools
+from core.components import map
+from core.states import start, world, combat
+
+MAPS = ["map1.tmx", "bedroom_test.tmx", "test_pathfinding.tmx"]
+FRAMES = 5000
+
+
+def check_interpreted(engine, game, events):
+    """Checks events the way EventEngine.check_conditions did before events were compiled."""
+    for e in events:
+        should_run = True
+        for cond in e['conds']:
+            check_condition = engine.conditions[cond['type']]['method']
+            should_run = (check_condition(game, cond) == (cond['operator'] == 'is'))
+            if not should_run:
+                break
+
+        if should_run:
+            engine.start_script(e['acts'], game)
+
+
+def main(mapnames):
+    prepare.init()
+    game = tools.Control(prepare.ORIGINAL_CAPTION)
+    game.player1 = prepare.player1
+    game.setup_states({"START": start.StartScreen(game),
+                       "WORLD": world.World(game),
+                       "COMBAT": combat.Combat(game)}, "WORLD")
+    game.state.startup(0, {})
+    engine = game.event_engine
+
+    print "%-24s %8s %18s %18s" % ("map", "events", "interpreted (/ms)", "compiled (/ms)")
+    for mapname in mapnames:
+        current_map = map.Map(prepare.BASEDIR + "resources/maps/" + mapname)
+        events = [{'conds': [dict(cond, args=engine.parse_parameters(cond['parameters']))
+                             for cond in event['conds']],
+                   'acts': []} for event in current_map.events]
+        compiled = [engine.compile_event(event, mapname) for event in events]
+
+        started = time.time()
+        for frame in xrange(FRAMES):
+            check_interpreted(engine, game, events)
+        interpreted_time = (time.time() - started) * 1000.
+
+        started = time.time()
+        for frame in xrange(FRAMES):
+            engine.check_events(game, compiled)
+        compiled_time = (time.time() - started) * 1000.
+
+        checked = len(events) * FRAMES
+        print "%-24s %8d %18.1f %18.1f" % (mapname, len(events), checked / interpreted_time,
+                                            checked / compiled_time)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or MAPS)
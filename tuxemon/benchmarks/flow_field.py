@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# benchmarks.flow_field Compares a flow field against a path search per NPC.
+#
+"""Measures how long it takes to move many NPCs towards the same goal on route1.tmx, with one
+A* search for every NPC against one flow field shared by all of them. The goal moves every few
+frames, like a player walking around would.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/flow_field.py [npcs]
+
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Loading a map scales its tiles, which needs a display.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from core import prepare
+from core.components import map
+from core.components import pathfinding
+
+NPCS = 50
+FRAMES = 240
+
+# The number of frames the goal stays on a tile. A character walks one tile in about 15 frames.
+GOAL_FRAMES = 15
+
+
+def walkable_tiles(collision_grid):
+    """Returns every tile that can be walked onto."""
+    return [(x, y) for y in range(collision_grid.height) for x in range(collision_grid.width)
+            if not collision_grid.flags[y * collision_grid.width + x] & map.COLLISION_BLOCKED]
+
+
+def main(npcs):
+    pygame.init()
+    pygame.display.set_mode((1, 1), 0, 32)
+
+    current_map = map.Map(prepare.BASEDIR + "resources/maps/route1.tmx")
+    current_map.loadfile(prepare.TILE_SIZE)
+    grid = current_map.collision_grid
+
+    rng = random.Random(0)
+    tiles = walkable_tiles(grid)
+    starts = rng.sample(tiles, npcs)
+    goals = [rng.choice(tiles) for frame in range(0, FRAMES, GOAL_FRAMES)]
+
+    # Find every NPC's next step on every frame, the way NPCs that chase the player do.
+    started = time.time()
+    for frame in range(FRAMES):
+        goal = goals[frame // GOAL_FRAMES]
+        for start in starts:
+            pathfinding.find_path(grid, start, goal)
+    search_time = (time.time() - started) * 1000. / FRAMES
+
+    field = pathfinding.FlowField()
+    started = time.time()
+    for frame in range(FRAMES):
+        goal = goals[frame // GOAL_FRAMES]
+        for start in starts:
+            field.next_step(grid, goal, start)
+    field_time = (time.time() - started) * 1000. / FRAMES
+
+    print "%d NPCs on route1.tmx (%dx%d)" % (npcs, grid.width, grid.height)
+    print "%-32s %10.3f ms per frame" % ("A* search per NPC", search_time)
+    print "%-32s %10.3f ms per frame" % ("shared flow field", field_time)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NPCS)
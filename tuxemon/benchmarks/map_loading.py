@@ -0,0 +1,86 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# benchmarks.map_loading Compares parsing tmx maps against loading compiled maps.
+#
+"""Measures how long it takes to load a map by parsing its tmx file compared to
+loading it from the compiled map cache.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/map_loading.py [map.tmx ...]
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# We don't need a visible window to decode images.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from core import prepare
+from core.components import map
+
+MAPS = ["route1.tmx", "BuddhaMountain.tmx"]
+ROUNDS = 10
+
+
+def best_of(rounds, function):
+    """Runs a function several times and returns the fastest run in milliseconds."""
+    times = []
+    for i in range(rounds):
+        start = time.time()
+        function()
+        times.append((time.time() - start) * 1000.)
+    return min(times)
+
+
+def main(mapnames):
+    pygame.init()
+    # Use the same pixel depth as the game. Tiles decoded for any other display depth
+    # would be written to the map cache with the wrong colors.
+    pygame.display.set_mode((1, 1), 0, 32)
+
+    print "%-24s %12s %12s %8s" % ("map", "tmx (ms)", "cache (ms)", "speedup")
+    for mapname in mapnames:
+        filename = prepare.BASEDIR + "resources/maps/" + mapname
+
+        # Make sure a compiled map exists before we time loading from it.
+        current_map = map.Map(filename)
+
+        cold = best_of(ROUNDS, lambda: current_map.compile(filename))
+        cached = best_of(ROUNDS, lambda: map.Map(filename))
+
+        print "%-24s %12.2f %12.2f %7.1fx" % (mapname, cold, cached, cold / cached)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or MAPS)
@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# benchmarks.map_rendering Compares the map renderers.
+#
+"""Measures how long it takes to draw the ground layers of a map each frame while the camera
+pans across the map. Blitting every visible tile is compared against the chunk renderer and
+the scroll renderer.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/map_rendering.py [map.tmx ...]
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# We don't need a visible window to draw to an offscreen screen surface.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from core import prepare
+from core.components import map
+from core.components import renderer
+
+MAPS = ["route1.tmx", "BuddhaMountain.tmx"]
+FRAMES = 300
+GROUND_LAYERS = 3
+
+
+class CountingScreen(object):
+    """Wraps a surface and counts how many times something is blitted onto it."""
+    def __init__(self, surface):
+        self.surface = surface
+        self.blits = 0
+
+    def get_size(self):
+        return self.surface.get_size()
+
+    def blit(self, source, position):
+        self.blits += 1
+        return self.surface.blit(source, position)
+
+
+def draw_tiles(screen, tiles, global_x, global_y):
+    """Draws the visible ground tiles one at a time, like World.map_drawing does."""
+    tile_width, tile_height = tiles.tile_size
+    screen_width, screen_height = screen.get_size()
+    start_x = max(-global_x // tile_width, 0)
+    start_y = max(-global_y // tile_height, 0)
+    end_x = min((screen_width - global_x) // tile_width + 1, tiles.width)
+    end_y = min((screen_height - global_y) // tile_height + 1, tiles.height)
+
+    for layer in tiles.layers[:GROUND_LAYERS]:
+        for y in xrange(start_y, end_y):
+            row = y * tiles.width
+            for x in xrange(start_x, end_x):
+                gid = layer[row + x]
+                if gid:
+                    screen.blit(tiles.images[gid],
+                                (x * tile_width + global_x, y * tile_height + global_y))
+
+
+def pan(screen, tiles, draw):
+    """Pans the camera diagonally across the map and returns the average frame time in
+    milliseconds and the average number of blits to the screen per frame."""
+    span_x = max(tiles.width * tiles.tile_size[0] - screen.get_width(), 1)
+    span_y = max(tiles.height * tiles.tile_size[1] - screen.get_height(), 1)
+    positions = [(-(frame * 7 % span_x), -(frame * 5 % span_y)) for frame in range(FRAMES)]
+
+    start = time.time()
+    for global_x, global_y in positions:
+        screen.fill((0, 0, 0))
+        draw(screen, global_x, global_y)
+    frame_time = (time.time() - start) * 1000. / FRAMES
+
+    # Count the blits separately so counting doesn't slow down the timed frames.
+    counter = CountingScreen(screen)
+    for global_x, global_y in positions:
+        draw(counter, global_x, global_y)
+
+    return frame_time, float(counter.blits) / FRAMES
+
+
+def main(mapnames):
+    pygame.init()
+    pygame.display.set_mode((1, 1), 0, 32)
+    screen = pygame.Surface(prepare.SCREEN_SIZE).convert()
+
+    print "%-24s %20s %20s %20s" % ("map", "tiles (ms/blits)", "chunks (ms/blits)",
+                                    "scroll (ms/blits)")
+    for mapname in mapnames:
+        current_map = map.Map(prepare.BASEDIR + "resources/maps/" + mapname)
+        tiles = current_map.loadfile(prepare.TILE_SIZE)[0]
+        tiles.scale(prepare.TILE_SIZE)
+        chunks = renderer.ChunkRenderer(tiles, GROUND_LAYERS)
+        scroll = renderer.ScrollRenderer(tiles, GROUND_LAYERS)
+
+        results = [pan(screen, tiles, lambda screen, x, y: draw_tiles(screen, tiles, x, y)),
+                   pan(screen, tiles, chunks.draw),
+                   pan(screen, tiles, scroll.draw)]
+
+        print "%-24s %s" % (mapname, " ".join("%12.2f/%7.1f" % result for result in results))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or MAPS)
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+#
+# benchmarks.monster_creation Measures how long it takes to create monsters.
+#
+"""Measures how long it takes to create 10,000 monsters of random species at random levels,
+like wild encounters and trainer parties do. Creating them from the species templates and
+shared techniques is compared against building the template and loading the techniques again
+for every monster.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/monster_creation.py
+
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.components import monster
+
+MONSTERS = 10000
+
+
+def create(species, levels, uncached=False):
+    """Creates a monster of each species at each level and returns how long it took in
+    milliseconds."""
+    started = time.time()
+    for definition, level in zip(species, levels):
+        if uncached:
+            monster.templates.clear()
+            monster.techniques.clear()
+        current_monster = monster.Monster()
+        current_monster.load_definition(definition)
+        current_monster.set_level(level)
+    return (time.time() - started) * 1000.
+
+
+def main():
+    rng = random.Random(0)
+    definitions = monster.monsters.definitions["monster"].values()
+    species = [rng.choice(definitions) for i in range(MONSTERS)]
+    levels = [rng.randrange(1, 50) for i in range(MONSTERS)]
+
+    uncached_time = create(species, levels, uncached=True)
+    cached_time = create(species, levels)
+    print "%d monsters without templates: %8.1f ms (%.1f us each)" % (
+        MONSTERS, uncached_time, uncached_time * 1000. / MONSTERS)
+    print "%d monsters from templates:    %8.1f ms (%.1f us each)" % (
+        MONSTERS, cached_time, cached_time * 1000. / MONSTERS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# benchmarks.pathfinding Measures how long it takes to find paths.
+#
+"""Measures how long it takes to find paths with core.components.pathfinding. Paths are found
+from every walkable tile of test_pathfinding.tmx to the destination used by its pathfind event,
+and across synthetic 256x256 mazes and open fields with random obstacles.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/pathfinding.py
+
+"""
+
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Loading a map scales its tiles, which needs a display.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from core import prepare
+from core.components import map
+from core.components import pathfinding
+
+MAZE_SIZE = (256, 256)
+SEEDS = range(5)
+
+
+def make_maze(size, seed):
+    """Carves a maze with a randomized depth first search. Every other tile is a room and the
+    tiles between rooms are walls, unless the search carved a passage through them. There is
+    exactly one path between any two rooms, which makes it long and winding."""
+    width, height = size
+    rng = random.Random(seed)
+    flags = array('B', [map.COLLISION_BLOCKED]) * (width * height)
+
+    flags[width + 1] = 0
+    stack = [(1, 1)]
+    while stack:
+        x, y = stack[-1]
+        rooms = [(x + dx, y + dy, x + dx // 2, y + dy // 2)
+                 for dx, dy in ((0, -2), (0, 2), (-2, 0), (2, 0))
+                 if 0 < x + dx < width - 1 and 0 < y + dy < height - 1
+                 and flags[(y + dy) * width + x + dx]]
+        if not rooms:
+            stack.pop()
+            continue
+
+        room_x, room_y, wall_x, wall_y = rng.choice(rooms)
+        flags[wall_y * width + wall_x] = 0
+        flags[room_y * width + room_x] = 0
+        stack.append((room_x, room_y))
+
+    return map.CollisionGrid(size, flags)
+
+
+def make_field(size, seed, density=0.2):
+    """Scatters obstacles over an open field, with the corners left free."""
+    width, height = size
+    rng = random.Random(seed)
+    flags = array('B', [map.COLLISION_BLOCKED if rng.random() < density else 0
+                        for index in xrange(width * height)])
+    flags[width + 1] = 0
+    flags[(height - 3) * width + width - 3] = 0
+    return map.CollisionGrid(size, flags)
+
+
+def measure(collision_grid, start, dest, max_nodes=None):
+    """Returns the time it took to find a path in milliseconds and the path's length, or None
+    if no path was found."""
+    started = time.time()
+    path = pathfinding.find_path(collision_grid, start, dest, max_nodes)
+    elapsed = (time.time() - started) * 1000.
+    return elapsed, None if path is None else len(path)
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1), 0, 32)
+
+    current_map = map.Map(prepare.BASEDIR + "resources/maps/test_pathfinding.tmx")
+    current_map.loadfile(prepare.TILE_SIZE)
+    grid = current_map.collision_grid
+    dest = (3, 10)
+
+    times = []
+    for y in range(grid.height):
+        for x in range(grid.width):
+            if not grid.flags[y * grid.width + x] & map.COLLISION_BLOCKED:
+                times.append(measure(grid, (x, y), dest)[0])
+    print "%-24s %6d paths %9.3f ms average %9.3f ms worst" % (
+        "test_pathfinding.tmx", len(times), sum(times) / len(times), max(times))
+
+    # The rooms of a maze are on odd tiles, so the far corner is two tiles from the edge.
+    corners = ((1, 1), (MAZE_SIZE[0] - 3, MAZE_SIZE[1] - 3))
+    for name, make in (("maze", make_maze), ("field", make_field)):
+        for seed in SEEDS:
+            grid = make(MAZE_SIZE, seed)
+            elapsed, length = measure(grid, *corners)
+            budget_length = measure(grid, *corners, max_nodes=1000)[1]
+            print "%-24s %6s tiles %9.3f ms, %s within 1000 tiles" % (
+                "%dx%d %s %d" % (MAZE_SIZE[0], MAZE_SIZE[1], name, seed),
+                length if length is not None else "no", elapsed,
+                "found" if budget_length is not None else "not found")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+#
+# benchmarks.startup Compares importing event plugins against loading the plugin manifest.
+#
+"""Measures how long it takes to load the event conditions and actions when the game starts.
+Importing every plugin module and looking through its classes is compared against building
+the plugin manifest on the first run and loading it on the runs after that. Every
+measurement is done in a new Python process, so no plugin module has been imported yet.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/startup.py
+
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# We don't need a visible window or sound to load plugins.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from core import prepare
+from core.components import plugin
+
+FOLDERS = [prepare.BASEDIR + "core/components/event/conditions",
+           prepare.BASEDIR + "core/components/event/actions"]
+ROUNDS = 10
+
+
+def load(mode):
+    """Loads the methods of every plugin folder and returns how long it took in milliseconds."""
+    started = time.time()
+    for folder in FOLDERS:
+        if mode == "import":
+            plugin.get_available_methods(plugin.load_directory(folder))
+        else:
+            plugin.load_methods(folder)
+    return (time.time() - started) * 1000.
+
+
+def measure(mode):
+    """Loads the plugins in a new process and returns how long it took in milliseconds."""
+    if mode == "build":
+        for folder in FOLDERS:
+            if os.path.exists(plugin.get_manifest_path(folder)):
+                os.remove(plugin.get_manifest_path(folder))
+
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__), mode])
+    return float(output.split()[-1])
+
+
+def main():
+    print "%-24s %12s %12s" % ("plugins", "median (ms)", "best (ms)")
+    for mode, name in (("import", "import every plugin"),
+                       ("build", "build manifest"),
+                       ("manifest", "load manifest")):
+        times = sorted(measure(mode) for i in range(ROUNDS))
+        print "%-24s %12.2f %12.2f" % (name, times[len(times) // 2], times[0])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print load(sys.argv[1])
+    else:
+        main()
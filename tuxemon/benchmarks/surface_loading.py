@@ -0,0 +1,88 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# benchmarks.surface_loading Measures how long it takes to load images.
+#
+"""Measures how long it takes to create NPCs and technique animations, which load their images
+through core.components.assets.surfaces. Loading them from the shared surface cache is compared
+against an empty cache, which reads every image from disk like each loader used to.
+
+Run it from the "tuxemon" directory:
+
+    python benchmarks/surface_loading.py
+
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Converting images needs a display.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from core import prepare
+from core.components import assets
+from core.components import monster
+from core.components import player
+from core.components.ui import UserInterface
+
+TIMES = 50
+
+
+def measure(create, uncached=False):
+    """Calls create TIMES times and returns how long each call took on average in
+    milliseconds."""
+    started = time.time()
+    for i in range(TIMES):
+        if uncached:
+            assets.surfaces = assets.SurfaceCache(assets.surfaces.budget)
+        create()
+    return (time.time() - started) * 1000. / TIMES
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((1, 1), 0, 32)
+
+    technique = monster.get_technique(1)
+    cases = (("NPC", lambda: player.Npc("maple")),
+             ("technique animation", lambda: UserInterface(technique.images, (0, 0), screen)))
+
+    for name, create in cases:
+        uncached_time = measure(create, uncached=True)
+        cached_time = measure(create)
+        print "%-20s %8.2f ms from disk %8.2f ms from the cache" % (
+            name, uncached_time, cached_time)
+
+    print assets.surfaces.stats()
+
+
+if __name__ == "__main__":
+    main()
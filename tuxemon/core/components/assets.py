@@ -0,0 +1,446 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# core.components.assets Game asset handling module.
+#
+#
+
+import logging
+import os
+import re
+import sys
+import pygame
+from collections import OrderedDict
+
+from core import prepare
+
+# Import the android mixer if on the android platform
+try:
+    import pygame.mixer as mixer
+except ImportError:
+    import android.mixer as mixer
+
+# Create a logger for optional handling of debug messages.
+logger = logging.getLogger(__name__)
+logger.debug("components.assets successfully imported")
+
+# The frame number and extension at the end of an animation frame's file name, such as the
+# "01.png" of "spikes01.png" or the ".000.png" of "grass.000.png".
+FRAME_SUFFIX = re.compile(r"\.?[0-9]+\.[^.]+$")
+
+
+class AssetCatalogue(object):
+    """An index of the game's animations and sounds, so they can be found without looking
+    through the resource directories.
+
+    Every directory under "resources/animations/" is a category of animations, like
+    "technique" or "tileset". The frames of an animation are the images in its category's
+    directory that are named after the animation followed by a frame number, in the order of
+    their file names. Sounds are named by their path under "resources/sounds/".
+
+    The resource directories are only looked through once, the first time the catalogue is
+    used. The game shares a single catalogue, :py:data:`core.components.assets.catalogue`.
+
+    :param path: The path of the resources directory.
+
+    :type path: String
+
+    **Examples:**
+
+    >>> catalogue = AssetCatalogue(prepare.BASEDIR + "resources/")
+    >>> catalogue.animation("tileset", "grass")
+    ('/tuxemon/resources/animations/tileset/grass.000.png',
+     '/tuxemon/resources/animations/tileset/grass.001.png')
+    >>> catalogue.sound("technique/bite1.ogg")
+    '/tuxemon/resources/sounds/technique/bite1.ogg'
+
+    """
+    def __init__(self, path):
+        self.path = path
+        self.built = False
+
+        # The frame paths of every animation by category and name, and the path of every sound
+        # by name.
+        self.animations = {}
+        self.sounds = {}
+
+        # The frames found for animation names that are only the beginning of an animation's
+        # name. See animation.
+        self.prefixes = {}
+
+
+    def build(self):
+        """Looks through the resource directories and indexes every animation frame and sound.
+
+        :param None:
+
+        :rtype: None
+        :returns: None
+
+        """
+        self.animations = {}
+        self.sounds = {}
+        self.prefixes = {}
+
+        animation_dir = self.path + "animations/"
+        if os.path.isdir(animation_dir):
+            for category in sorted(os.listdir(animation_dir)):
+                category_dir = animation_dir + category + "/"
+                if not os.path.isdir(category_dir):
+                    continue
+
+                animations = self.animations[category] = {}
+                for filename in sorted(os.listdir(category_dir)):
+                    name = FRAME_SUFFIX.sub("", filename)
+                    if name != filename:
+                        animations.setdefault(name, []).append(category_dir + filename)
+
+                for name in animations:
+                    animations[name] = tuple(animations[name])
+
+        sound_dir = self.path + "sounds/"
+        for root, directories, filenames in os.walk(sound_dir):
+            directories.sort()
+            for filename in sorted(filenames):
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, sound_dir).replace(os.sep, "/")
+                self.sounds[name] = path
+
+        self.built = True
+        logger.debug("Indexed %d animations and %d sounds" % (
+            sum(len(animations) for animations in self.animations.values()), len(self.sounds)))
+
+
+    def animation(self, category, name):
+        """Looks up the frames of an animation.
+
+        If there is no animation with that name, the frames of every animation whose name
+        starts with it are used, which is how techniques have always been matched with their
+        animations.
+
+        :param category: The category of the animation, like "technique" or "tileset".
+        :param name: The name of the animation.
+
+        :type category: String
+        :type name: String
+
+        :rtype: Tuple
+        :returns: The paths of the animation's frames in order. Empty if there is no such
+            animation.
+
+        **Examples:**
+
+        >>> len(catalogue.animation("technique", "spike"))
+        7
+
+        """
+        if not self.built:
+            self.build()
+
+        if not name:
+            return ()
+
+        animations = self.animations.get(category, {})
+        if name in animations:
+            return animations[name]
+
+        key = (category, name)
+        if key not in self.prefixes:
+            frames = []
+            for animation in sorted(animations):
+                if animation.startswith(name):
+                    frames.extend(animations[animation])
+            self.prefixes[key] = tuple(sorted(frames))
+
+        return self.prefixes[key]
+
+
+    def sound(self, name):
+        """Looks up the path of a sound.
+
+        :param name: The path of the sound under "resources/sounds/", like
+            "interface/NenadSimic_Click.ogg".
+
+        :type name: String
+
+        :rtype: String
+        :returns: The path of the sound file, or None if there is no such sound.
+
+        **Examples:**
+
+        >>> catalogue.sound("monster/1/faint.ogg")
+        '/tuxemon/resources/sounds/monster/1/faint.ogg'
+
+        """
+        if not self.built:
+            self.build()
+
+        path = self.sounds.get(name)
+        if path is None:
+            logger.error("No sound named '%s' in %ssounds/" % (name, self.path))
+
+        return path
+
+
+class SurfaceCache(object):
+    """Loads images and keeps them around, so every loader shares the same surfaces instead of
+    loading its own copies from disk.
+
+    Surfaces are kept by (path, scale, convert mode). A scaled surface is made from the unscaled
+    one, which is cached too. Since surfaces are shared, they must not be drawn on or changed;
+    make a copy first.
+
+    A surface is in use while anything besides the cache refers to it, which is tracked with
+    Python's own reference count, so users don't have to give surfaces back. When the surfaces
+    take up more than the byte budget, the least recently loaded ones that aren't in use are
+    evicted. Evicting a surface that's in use wouldn't free any memory.
+
+    :param budget: The most bytes of surfaces to keep when they aren't in use.
+
+    :type budget: Integer
+
+    **Examples:**
+
+    >>> surfaces = SurfaceCache(64 * 1024 * 1024)
+    >>> icon = surfaces.load(prepare.BASEDIR + "resources/gfx/arrow.png", scale=prepare.SCALE)
+    >>> surfaces.load(prepare.BASEDIR + "resources/gfx/arrow.png", scale=prepare.SCALE) is icon
+    True
+    >>> surfaces.stats()
+    {'hits': 1, 'misses': 2, 'evictions': 0, 'surfaces': 2, 'resident_bytes': 5184}
+
+    """
+    # The method used to convert a surface for each convert mode. Surfaces that are loaded with
+    # a convert mode of None keep the pixel format of the image file.
+    convert_modes = {"alpha": pygame.Surface.convert_alpha,
+                     "opaque": pygame.Surface.convert,
+                     None: None}
+
+    def __init__(self, budget):
+        self.budget = budget
+
+        # The surfaces by (path, scale, convert mode), from least to most recently loaded.
+        self.surfaces = OrderedDict()
+        self.resident_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def load(self, path, scale=1, convert="alpha"):
+        """Loads an image, or gets it from the cache if it has been loaded before.
+
+        :param path: The path of the image file.
+        :param scale: How many times larger to make the image.
+        :param convert: How to convert the surface to the display's pixel format: "alpha" to
+            keep per pixel transparency, "opaque" for none, or None to not convert it.
+
+        :type path: String
+        :type scale: Integer
+        :type convert: String
+
+        :rtype: pygame.Surface
+        :returns: The shared surface of the image.
+
+        **Examples:**
+
+        >>> surfaces.load(prepare.BASEDIR + "resources/gfx/d-pad.png")
+        <Surface(117x117x32 SW)>
+
+        """
+        key = (path, scale, convert)
+        surface = self.surfaces.pop(key, None)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces[key] = surface
+            return surface
+
+        self.misses += 1
+        if scale == 1:
+            surface = pygame.image.load(path)
+            if self.convert_modes[convert]:
+                surface = self.convert_modes[convert](surface)
+        else:
+            surface = self.load(path, 1, convert)
+            surface = pygame.transform.scale(
+                surface, (surface.get_width() * scale, surface.get_height() * scale))
+
+        self.surfaces[key] = surface
+        self.resident_bytes += surface.get_pitch() * surface.get_height()
+        self.evict()
+
+        return surface
+
+
+    def in_use(self, key):
+        """Checks if anything besides the cache refers to a cached surface.
+
+        :param key: The (path, scale, convert mode) of the surface.
+
+        :type key: Tuple
+
+        :rtype: Boolean
+        :returns: True if the surface is in use.
+
+        """
+        # The cache itself and the argument of getrefcount are the two references we expect.
+        return sys.getrefcount(self.surfaces[key]) > 2
+
+
+    def evict(self):
+        """Evicts the least recently loaded surfaces that aren't in use until the surfaces fit
+        in the budget, or all the surfaces that are left are in use.
+
+        :param None:
+
+        :rtype: None
+        :returns: None
+
+        """
+        if self.resident_bytes <= self.budget:
+            return
+
+        for key in list(self.surfaces):
+            if not self.in_use(key):
+                surface = self.surfaces.pop(key)
+                self.resident_bytes -= surface.get_pitch() * surface.get_height()
+                self.evictions += 1
+                if self.resident_bytes <= self.budget:
+                    break
+
+
+    def stats(self):
+        """Gets the cache statistics.
+
+        :param None:
+
+        :rtype: Dictionary
+        :returns: The number of cache hits, misses and evictions, the number of cached
+            surfaces, and the bytes they take up.
+
+        """
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "surfaces": len(self.surfaces),
+                "resident_bytes": self.resident_bytes}
+
+
+class SoundBank(object):
+    """Decodes sound effects once and keeps them by name, so playing a sound again only costs a
+    call to play it. Sounds are named by their path under "resources/sounds/" and found in the
+    asset catalogue.
+
+    Sounds that a map or a battle will need can be decoded ahead of time with
+    :py:func:`preload`, instead of the first time they are played.
+
+    :param catalogue: The asset catalogue to find sounds in.
+    :param channels: The number of mixer channels to play sounds on.
+
+    :type catalogue: core.components.assets.AssetCatalogue
+    :type channels: Integer
+
+    **Examples:**
+
+    >>> sounds = SoundBank(catalogue)
+    >>> sounds.preload(["technique/bite1.ogg", "monster/1/faint.ogg"])
+    >>> sounds.play("technique/bite1.ogg")
+    <Channel object at 0x7f0c2e0d1e40>
+
+    """
+    def __init__(self, catalogue, channels=8):
+        self.catalogue = catalogue
+        self.channels = channels
+
+        # The decoded sounds by name. Sounds that couldn't be found are kept as None, so they're
+        # only looked up once.
+        self.sounds = {}
+
+
+    def load(self, name):
+        """Decodes a sound, or gets it from the bank if it has been decoded before.
+
+        :param name: The name of the sound, like "interface/NenadSimic_Click.ogg".
+
+        :type name: String
+
+        :rtype: pygame.mixer.Sound
+        :returns: The sound, or None if there is no such sound.
+
+        """
+        if name not in self.sounds:
+            # Sounds are decoded for the mixer's current settings, so the mixer has to be set
+            # up before the first sound is.
+            if not self.sounds and mixer.get_num_channels() < self.channels:
+                mixer.set_num_channels(self.channels)
+
+            path = self.catalogue.sound(name)
+            self.sounds[name] = mixer.Sound(path) if path else None
+
+        return self.sounds[name]
+
+
+    def preload(self, names):
+        """Decodes sounds ahead of time, so they don't have to be decoded when they're played.
+
+        :param names: The names of the sounds.
+
+        :type names: Iterable
+
+        :rtype: None
+        :returns: None
+
+        """
+        for name in names:
+            self.load(name)
+
+
+    def play(self, name):
+        """Plays a sound. If every mixer channel is busy, the sound that has been playing the
+        longest is stopped to make room for it.
+
+        :param name: The name of the sound, like "interface/NenadSimic_Click.ogg".
+
+        :type name: String
+
+        :rtype: pygame.mixer.Channel
+        :returns: The channel the sound is playing on, or None if there is no such sound.
+
+        """
+        sound = self.load(name)
+        if sound is None:
+            return None
+
+        channel = mixer.find_channel(True)
+        channel.play(sound)
+        return channel
+
+
+# The asset catalogue, surface cache and sound bank shared by the whole game.
+catalogue = AssetCatalogue(prepare.BASEDIR + "resources/")
+surfaces = SurfaceCache(prepare.CONFIG.surface_cache * 1024 * 1024)
+sounds = SoundBank(catalogue)
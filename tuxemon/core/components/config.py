@@ -49,6 +49,8 @@ class Config(object):
         self.scaling = self.config.get("display", "scaling")
         self.fps = int(self.config.get("display", "fps"))
         self.collision_map = self.config.get("display", "collision_map")
+        self.renderer = self.config.get("display", "renderer")
+        self.surface_cache = int(self.config.get("display", "surface_cache"))
 
         self.controller_overlay = self.config.get("display", "controller_overlay")
         self.controller_transparency = int(self.config.get("display", "controller_transparency"))
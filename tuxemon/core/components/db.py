@@ -35,6 +35,10 @@ import pygame
 import os
 import random
 import sys
+import cPickle as pickle
+import hashlib
+from collections import namedtuple
+from cStringIO import StringIO
 
 from . import player
 from core import prepare
@@ -42,12 +46,232 @@ from core import prepare
 logger = logging.getLogger(__name__)
 logger.debug("core.db successfully imported")
 
+# The version of the database bundle format. Increase this whenever the format changes so that
+# old bundles are rebuilt instead of loaded.
+DB_BUNDLE_VERSION = 3
+
+
+def definition_property(field, doc):
+    """Makes a read only property that gets a field from an object's definition record.
+
+    :param field: The name of the field of the definition.
+    :param doc: The docstring of the property.
+
+    :type field: String
+    :type doc: String
+
+    :rtype: Property
+    :returns: The property.
+
+    """
+    return property(lambda self: getattr(self.definition, field), doc=doc)
+
+
+class MonsterDefinition(namedtuple("MonsterDefinition",
+                                   "id name hp attack defense speed special_attack "
+                                   "special_defense hp_modifier attack_modifier "
+                                   "defense_modifier speed_modifier special_attack_modifier "
+                                   "special_defense_modifier experience_give_modifier "
+                                   "experience_required_modifier types weight moveset "
+                                   "sprites")):
+    """The definition of a monster from the monster table. Every
+    :py:class:`core.components.monster.Monster` of a kind shares the same
+    definition. The stats are the monster's base stats, the moveset is a tuple
+    of (level learned, technique id) pairs and the sprites are the (front,
+    back, menu) image paths relative to the game's base directory.
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, item, database):
+        return cls(id=item["id"],
+                   name=item["name"],
+                   hp=item["hp_base"],
+                   attack=item["attack_base"],
+                   defense=item["defense_base"],
+                   speed=item["speed_base"],
+                   special_attack=item["special_attack_base"],
+                   special_defense=item["special_defense_base"],
+                   hp_modifier=tuple(item["hp_mod"]),
+                   attack_modifier=tuple(item["attack_mod"]),
+                   defense_modifier=tuple(item["defense_mod"]),
+                   speed_modifier=tuple(item["speed_mod"]),
+                   special_attack_modifier=tuple(item["special_attack_mod"]),
+                   special_defense_modifier=tuple(item["special_defense_mod"]),
+                   experience_give_modifier=item["exp_give_mod"],
+                   experience_required_modifier=item["exp_req_mod"],
+                   types=tuple(item["types"]),
+                   weight=item["weight"],
+                   moveset=tuple((move["level_learned"], move["technique_id"])
+                                 for move in item["moveset"]),
+                   sprites=(item["sprites"]["battle1"], item["sprites"]["battle2"],
+                            item["sprites"]["menu1"]))
+
+
+class TechniqueDefinition(namedtuple("TechniqueDefinition",
+                                     "id name category types power effects animation sfx")):
+    """The definition of a technique from the technique table, shared by every
+    :py:class:`core.components.monster.Technique` of a kind.
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, item, database):
+        return cls(id=item["id"],
+                   name=item["name"],
+                   category=item["category"],
+                   types=tuple(item["types"]),
+                   power=item["power"],
+                   effects=tuple(item["effects"]),
+                   animation=item["animation"],
+                   sfx=item["sfx"])
+
+
+class ItemDefinition(namedtuple("ItemDefinition",
+                                "id name description type power sprite target usable_in "
+                                "effects")):
+    """The definition of an item from the item table, shared by every
+    :py:class:`core.components.item.Item` of a kind. The sprite is the image
+    path relative to the game's base directory.
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, item, database):
+        return cls(id=item["id"],
+                   name=item["name"],
+                   description=item["description"],
+                   type=item["type"],
+                   power=item["power"],
+                   sprite=item["sprite"],
+                   target=item["target"],
+                   usable_in=tuple(item["usable_in"]),
+                   effects=tuple(item["effects"]))
+
+
+class EncounterSlot(namedtuple("EncounterSlot", "monster level_range rate")):
+    """A monster that can be encountered, with its definition already looked
+    up, the range of levels it is encountered at and the chance of
+    encountering it out of 100.
+
+    """
+    __slots__ = ()
+
+
+class EncounterDefinition(namedtuple("EncounterDefinition",
+                                     "id slots probabilities aliases")):
+    """An encounter table, compiled into an alias table so that rolling for an
+    encounter takes a single random number, no matter how many monsters the
+    table has. Each monster is encountered with its encounter rate out of 100,
+    and nothing is encountered the rest of the time. If the rates add up to
+    more than 100, something is always encountered and the rates are relative
+    to each other.
+
+    The slots are the :py:class:`EncounterSlot` outcomes, plus None for not
+    encountering anything. Rolling picks a slot at random and keeps it with
+    its probability, or takes its alias otherwise.
+
+    **Examples:**
+
+    >>> encounters = database.definitions["encounter"][1]
+    >>> encounters.roll()
+    EncounterSlot(monster=MonsterDefinition(id=3, name=u'Bolt', ...), level_range=(1, 6), rate=1)
+    >>> encounters.roll()
+    None
+
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, item, database):
+        # The monsters are looked up now, so starting an encounter doesn't
+        # have to. The monster table is read rather than loaded, so that
+        # indexing an encounter never starts loading the bundle.
+        database.read_json("monster")
+        slots = [EncounterSlot(monster=database.definitions["monster"][monster["monster_id"]],
+                               level_range=tuple(monster["level_range"]),
+                               rate=monster["encounter_rate"])
+                 for monster in item["monsters"]]
+        weights = [float(slot.rate) for slot in slots]
+        if sum(weights) < 100:
+            slots.append(None)
+            weights.append(100. - sum(weights))
+
+        # Build the alias table with Vose's method.
+        count = len(weights)
+        total = sum(weights)
+        scaled = [weight * count / total for weight in weights]
+        probabilities = [1.0] * count
+        aliases = range(count)
+        small = [index for index in range(count) if scaled[index] < 1.0]
+        large = [index for index in range(count) if scaled[index] >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] += scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        return cls(id=item["id"],
+                   slots=tuple(slots),
+                   probabilities=tuple(probabilities),
+                   aliases=tuple(aliases))
+
+    def roll(self, rng=random):
+        """Rolls for an encounter.
+
+        :param rng: The random number generator to use.
+
+        :type rng: random.Random
+
+        :rtype: EncounterSlot
+        :returns: The monster that was encountered, or None.
+
+        """
+        # The whole part of the number picks the slot and the fraction decides
+        # between the slot and its alias.
+        number = rng.random() * len(self.slots)
+        index = int(number)
+        if number - index < self.probabilities[index]:
+            return self.slots[index]
+        return self.slots[self.aliases[index]]
+
 
 class JSONDatabase(object):
     """Handles connecting to the game database for resources such as monsters,
     stats, etc.
 
+    Each table is only read from disk the first time it is loaded. Besides the
+    items by id in :py:attr:`database`, every table is indexed by name, and the
+    fields in :py:attr:`secondary_indexes` are indexed so that all the items
+    with a certain value can be looked up with :py:func:`lookup_by`.
+
+    All the tables are packed into a bundle file under the cache directory,
+    which is loaded with a single read instead of parsing every JSON file. See
+    :py:func:`load_bundle`.
+
+    The game shares a single database, :py:data:`core.components.db.database`.
+
     """
+    # The fields of each table that are indexed. Items with a list of values,
+    # like the types of a monster, are indexed under each value.
+    secondary_indexes = {"item": ("type",),
+                         "monster": ("types",),
+                         "technique": ("types", "category")}
+
+    # The record each item of a table is turned into when it is loaded. See
+    # :py:func:`lookup_definition`.
+    definition_types = {"encounter": EncounterDefinition,
+                        "item": ItemDefinition,
+                        "monster": MonsterDefinition,
+                        "technique": TechniqueDefinition}
 
     def __init__(self):
         self.path = prepare.BASEDIR + "resources/db/"
@@ -57,9 +281,20 @@ class JSONDatabase(object):
                          "technique": {},
                          "encounter": {}}
 
+        # The tables that have been loaded, the items of each table by name and
+        # the secondary indexes by table and field.
+        self.loaded = set()
+        self.bundle_path = prepare.CACHE_DIR + "database.bundle"
+        self.bundle_checked = False
+        self.names = dict((table, {}) for table in self.database)
+        self.indexes = dict((table, dict((field, {}) for field in fields))
+                            for table, fields in self.secondary_indexes.items())
+        self.definitions = dict((table, {}) for table in self.definition_types)
+
 
     def load(self, directory="all"):
-        """Loads all data from JSON files located under our data path.
+        """Loads all data from JSON files located under our data path. Tables
+        that have already been loaded are not loaded again.
 
         :param directory: The directory under resources/db/ to load. Defaults
             to "all".
@@ -80,7 +315,34 @@ class JSONDatabase(object):
 
 
     def load_json(self, directory):
-        """Loads all JSON items under a specified path.
+        """Loads all JSON items under a specified path, unless they have been
+        loaded already. The first time a table is loaded, every table is loaded
+        from the database bundle, or from the JSON files if the bundle is out of
+        date, in which case the bundle is rebuilt.
+
+        :param directory: The directory under resources/db/ to look in.
+        :type directory: String
+
+        :returns: None
+
+        """
+
+        if directory in self.loaded:
+            return
+
+        if not self.bundle_checked:
+            self.bundle_checked = True
+            if not self.load_bundle():
+                self.save_bundle()
+            if directory in self.loaded:
+                return
+
+        self.read_json(directory)
+
+
+    def read_json(self, directory):
+        """Reads and indexes all the JSON items under a specified path, unless
+        they have been read already.
 
         :param directory: The directory under resources/db/ to look in.
         :type directory: String
@@ -89,6 +351,11 @@ class JSONDatabase(object):
 
         """
 
+        if directory in self.loaded:
+            return
+
+        self.loaded.add(directory)
+
         for json_item in os.listdir(self.path + directory):
 
             # Only load .json files.
@@ -105,6 +372,146 @@ class JSONDatabase(object):
                 raise Exception("Error: Item with this id was already loaded.")
             file.close()
 
+            self.index(directory, item)
+
+
+    def index(self, table, item):
+        """Adds an item to the name index and the secondary indexes of a table.
+
+        :param table: The table the item is in.
+        :param item: The item to index.
+        :type table: String
+        :type item: Dictionary
+
+        :returns: None
+
+        """
+
+        if 'name' in item:
+            self.names[table].setdefault(item['name'], item)
+
+        if table in self.definition_types:
+            self.definitions[table][item['id']] = self.definition_types[table].from_json(item, self)
+
+        for field, index in self.indexes.get(table, {}).items():
+            values = item.get(field)
+            if not isinstance(values, list):
+                values = [values]
+            for value in values:
+                index.setdefault(value, []).append(item)
+
+
+    def get_sources(self):
+        """Gets the name, modification time and size of the JSON files of
+        every table. The database bundle is out of date when these change.
+
+        :rtype: Dictionary
+        :returns: A sorted list of (file name, modification time, size) for
+            each table.
+
+        """
+
+        sources = {}
+        for table in self.database:
+            files = []
+            for json_item in os.listdir(self.path + table):
+                if json_item.endswith(".json"):
+                    stat = os.stat(self.path + table + "/" + json_item)
+                    files.append((json_item, stat.st_mtime, stat.st_size))
+            sources[table] = sorted(files)
+
+        return sources
+
+
+    def load_bundle(self):
+        """Loads every table that hasn't been loaded yet from the database
+        bundle. The bundle is read at once, and only used if it was built with
+        the current bundle version from the same JSON files and its contents
+        match their hash.
+
+        :rtype: Boolean
+        :returns: True if the bundle was loaded, False if it is missing or out
+            of date.
+
+        """
+
+        if not os.path.exists(self.bundle_path):
+            return False
+
+        try:
+            with open(self.bundle_path, "rb") as bundle_file:
+                data = bundle_file.read()
+
+            # The header is stored separately, so we can throw away stale
+            # bundles without unpickling the tables.
+            stream = StringIO(data)
+            header = pickle.load(stream)
+            if (header["version"] != DB_BUNDLE_VERSION
+                or header["sources"] != self.get_sources()):
+                logger.debug("Database bundle is out of date: " + self.bundle_path)
+                return False
+
+            body = data[stream.tell():]
+            if hashlib.md5(body).hexdigest() != header["hash"]:
+                logger.warning("Database bundle is corrupt: " + self.bundle_path)
+                return False
+
+            database, names, indexes, definitions = pickle.loads(body)
+        except Exception, message:
+            logger.warning("Unable to read database bundle %s: %s" % (self.bundle_path, message))
+            return False
+
+        for table in database:
+            if table in self.loaded:
+                continue
+            self.loaded.add(table)
+            self.database[table] = database[table]
+            self.names[table] = names[table]
+            if table in indexes:
+                self.indexes[table] = indexes[table]
+            if table in definitions:
+                self.definitions[table] = definitions[table]
+
+        return True
+
+
+    def save_bundle(self):
+        """Loads every table from its JSON files and packs them into the
+        database bundle. Failing to write the bundle is not fatal; the JSON
+        files are just read again the next time the game starts.
+
+        :returns: None
+
+        """
+
+        for table in self.database:
+            if table not in self.loaded:
+                self.read_json(table)
+
+        # The indexes are packed with the tables, so they don't have to be
+        # built again and refer to the same items.
+        sources = self.get_sources()
+        body = pickle.dumps((self.database, self.names, self.indexes, self.definitions),
+                            pickle.HIGHEST_PROTOCOL)
+        header = {"version": DB_BUNDLE_VERSION,
+                  "sources": sources,
+                  "hash": hashlib.md5(body).hexdigest()}
+
+        try:
+            if not os.path.isdir(os.path.dirname(self.bundle_path)):
+                os.makedirs(os.path.dirname(self.bundle_path))
+
+            # Write to a temporary file first so a crash never leaves a half
+            # written bundle.
+            with open(self.bundle_path + ".tmp", "wb") as bundle_file:
+                pickle.dump(header, bundle_file, pickle.HIGHEST_PROTOCOL)
+                bundle_file.write(body)
+            if os.path.exists(self.bundle_path):
+                os.remove(self.bundle_path)
+            os.rename(self.bundle_path + ".tmp", self.bundle_path)
+        except (IOError, OSError), message:
+            logger.warning("Unable to write database bundle %s: %s" % (self.bundle_path, message))
+
 
     def lookup(self, name, table="monster"):
         """Looks up a monster, technique, item, or npc based on name or id.
@@ -123,9 +530,57 @@ class JSONDatabase(object):
         if name in self.database[table]:
             return self.database[table][name]
 
-        for id, item in self.database[table].items():
-            if item['name'] == name:
-                return item
+        return self.names[table].get(name)
+
+
+    def lookup_definition(self, name, table="monster"):
+        """Looks up the definition record of a monster, technique or item
+        based on name or id. Unlike :py:func:`lookup`, which returns the
+        item's dictionary, the record is immutable and shared.
+
+        :param name: The name or id of the monster, technique or item.
+        :param table: Which table to look in. Can be: "monster", "technique"
+            or "item".
+        :type name: String
+        :type table: String
+
+        :rtype: MonsterDefinition, TechniqueDefinition or ItemDefinition
+        :returns: The definition, or None if there is none.
+
+        **Examples:**
+
+        >>> database.lookup_definition("Potion", table="item").power
+        50
+
+        """
+
+        item = self.lookup(name, table)
+        if item:
+            return self.definitions[table][item['id']]
+
+
+    def lookup_by(self, field, value, table="monster"):
+        """Looks up all the items of a table with a certain value in one of
+        the table's :py:attr:`secondary_indexes`.
+
+        :param field: The indexed field, like "types".
+        :param value: The value to look for, like "metal".
+        :param table: Which table to look in.
+        :type field: String
+        :type value: String
+        :type table: String
+
+        :rtype: List
+        :returns: A list of the items with that value.
+
+        **Examples:**
+
+        >>> [monster['name'] for monster in database.lookup_by("types", "metal")]
+        [u'Bolt', u'Nut']
+
+        """
+
+        return self.indexes[table][field].get(value, [])
 
 
     def lookup_by_id(self, id, table="monster"):
@@ -140,7 +595,7 @@ class JSONDatabase(object):
 
         """
         logger.warning("lookup_by_id is deprecated. Use JSONDatabase.database")
-        self.lookup(id, table)
+        return self.lookup(id, table)
 
 
     def lookup_sprite(self, monster_id, table="sprite"):
@@ -164,6 +619,10 @@ class JSONDatabase(object):
         return results
 
 
+# The database shared by the whole game. Modules load the tables they need
+# from it, which only reads them from disk once.
+database = JSONDatabase()
+
 
 if __name__ == "__main__":
 
@@ -29,6 +29,8 @@
 #
 #
 
+import heapq
+import itertools
 import logging
 import os
 import pygame
@@ -52,37 +54,77 @@ logger = logging.getLogger(__name__)
 logger.debug("components.event successfully imported")
 
 
+class Script(object):
+    """The actions of an event running as a coroutine. Actions that have to wait, like
+    "wait_for_secs", suspend the script and the event engine resumes it once the wait is over,
+    so any number of scripts can wait at the same time. See
+    :py:func:`EventEngine.start_script`.
+
+    :param steps: A generator that runs the actions and yields each wait.
+
+    :type steps: Generator
+
+    """
+    def __init__(self, steps):
+        self.steps = steps
+
+        # Whether the script still has actions left to run.
+        self.running = True
+
+
 class EventEngine(object):
     """A class for the event engine. The event engine checks to see if a group of conditions have
     been met and then executes a set of actions.
 
+    The actions of an event run as a :py:class:`Script`. An action can make its script wait by
+    returning a wait tuple: ("secs", seconds) resumes the script after that many seconds and
+    ("input", key_name) resumes it when that key is released. Other scripts and events keep
+    running in the meantime.
+
     """
     def __init__(self):
 
-        # Load all the available conditions and actions as plugins.
-        condition_plugins = plugin.load_directory(prepare.BASEDIR + "core/components/event/conditions")
-        self.conditions = plugin.get_available_methods(condition_plugins)
-        action_plugins = plugin.load_directory(prepare.BASEDIR + "core/components/event/actions")
-        self.actions = plugin.get_available_methods(action_plugins)
+        # Load all the available conditions and actions as plugins. The plugins are only
+        # imported when their methods are first used.
+        self.conditions = plugin.load_methods(prepare.BASEDIR + "core/components/event/conditions")
+        self.actions = plugin.load_methods(prepare.BASEDIR + "core/components/event/actions")
 
         self.name = "Event"
         self.current_map = None
-        self.state = "running"
-        self.timer = 0.0
-        self.wait = 0.0
-        self.button = None
+
+        # The compiled events of the current map that can run on each tile, and the ones that
+        # can run anywhere. See compile_event.
+        self.event_index = {}
+        self.global_events = []
+
+        # The inputs of conditions that changed since the events were last checked, and the
+        # ones that changed while they are being checked. See compile_event.
+        self.dirty = set()
+        self.changes = set()
+
+        # The last value of each input the engine watches itself.
+        self.watched = {}
+
+        # The number of seconds the engine has been running, which timed waits are measured
+        # against.
+        self.time = 0.0
+
+        # The scripts waiting for a timer in a heap of (wake up time, order, script), so only
+        # the ones whose time is up have to be looked at, and the scripts waiting for each key.
+        self.sleeping = []
+        self.waiting_for_input = {}
+        self.order = itertools.count()
 
 
     def check_conditions(self, game, dt):
-        """Checks a list of conditions to see if any of them have been met.
+        """Checks the conditions of the events of the current map that can run on the
+        player's tile to see if any of them have been met. See
+        :py:func:`core.components.map.Map.compile_event_index`.
 
         :param game: The main game object that contains all the game's variables.
-        :param game.event_conditions: The multi-dimensional list of conditions to check for. See
-            :py:func:`core.components.map.Map.loadevents` to see the format of the list.
         :param dt: Amount of time passed in seconds since last frame.
 
         :type game: core.tools.Control
-        :type game.event_conditions: List
         :type dt: Float
 
         :rtype: None
@@ -90,82 +132,353 @@ class EventEngine(object):
 
         """
 
-        if self.state == "running":
-            for e in game.events:
-                should_run = True
+        self.time += dt
+        self.resume_scripts(game)
 
-                # If any conditions fail, the event should not be run
-                for cond in e['conds']:
-                    # Conditions have so-called "operators".  If a condition's operator == "is" then
-                    # the condition should be processed as usual.
-                    # However, if the condition != "is", the result should be inverted.
-                    # The following line implements this.
-                    # I am not satisfied with the clarity of this line, so if anyone can express this better,
-                    # please change it.
-                    if not self.state == "running":
-                        return
-                    check_condition = self.conditions[cond['type']]['method']
-                    should_run = (check_condition(game, cond) == (cond['operator'] == 'is'))
-                    if not should_run:
-                        break
+        tile = (int(round(game.player1.tile_pos[0])), int(round(game.player1.tile_pos[1])))
+        self.watch(game, tile)
 
-                if should_run:
-                    self.execute_action(e['acts'], game)
+        # Changes published from now on are picked up by the events checked after them, and
+        # by every event on the next frame.
+        self.dirty = self.changes
+        self.changes = set()
 
-        elif self.state == "waiting":
-            if self.timer >= self.wait:
-                self.state = "running"
-                self.timer = 0.0
-            else:
-                self.timer += dt
-                logger.debug("Waiting %s seconds to resume event engine..." % str(self.wait - self.timer))
+        # Only check the events that can run on the player's tile.
+        events = self.event_index.get(tile, self.global_events)
+        self.check_events(game, events)
 
-        elif self.state == "waiting for input":
-            if not self.button:
-                self.state = "running"
-                return
+        # The "player_moved" condition compares the player's move destination with the one
+        # from the previous frame.
+        game.event_persist['move_destination'] = game.player1.move_destination
 
-            # Get the keys pressed from the game.
-            events = game.key_events
 
-            # Loop through each event
-            for event in events:
-                # NOTE: getattr on pygame is a little dangerous. We should sanitize input.
-                if self.button and event.type == pygame.KEYUP and event.key == getattr(pygame, self.button):
-                    self.state = "running"
-                    self.button = None
+    def check_events(self, game, events):
+        """Runs the actions of every event in a list whose conditions are all met.
+
+        :param game: The main game object that contains all the game's variables.
+        :param events: The compiled events to check. See :py:func:`compile_event`.
+
+        :type game: core.tools.Control
+        :type events: List
 
+        :rtype: None
+        :returns: None
 
-    def execute_action(self, action_list, game):
-        """Executes a particular action in a list of actions.
+        """
+        for event in events:
+            event(game)
+
+
+    def notify(self, *inputs):
+        """Publishes that inputs of conditions have changed, so the events that depend on them
+        are checked again. See :py:func:`compile_event`.
+
+        :param inputs: The names of the inputs that changed.
+
+        :type inputs: String
+
+        :rtype: None
+        :returns: None
+
+        **Examples:**
+
+        >>> game.event_engine.notify("game_variables")
+
+        """
+        self.changes.update(inputs)
+        self.dirty.update(inputs)
+
+
+    def watch(self, game, tile):
+        """Publishes the inputs that change during the game without an action changing them,
+        like the player's tile while walking around. NPCs are only added and removed by actions
+        and map changes, which publish the "npcs" input themselves.
 
-        :param action_list: A list of actions fetched from the database.
         :param game: The main game object that contains all the game's variables.
+        :param tile: The player's (x, y) tile position.
 
-        :type action_list: List
         :type game: core.tools.Control
+        :type tile: Tuple
 
-        Here is an example of what an action list might look like:
+        :rtype: None
+        :returns: None
 
-        >>> action_list
-        [(u'teleport', u'example.map,1,1', 1, 1), (u'teleport', u'test.map,4,3', 2, 2)]
+        """
+        player = game.player1
+        values = (("player_tile", tile),
+                  ("player_facing", player.facing),
+                  ("party", len(player.monsters)))
+
+        for name, value in values:
+            if self.watched.get(name) != value:
+                self.watched[name] = value
+                self.notify(name)
+
+
+    def set_map(self, current_map):
+        """Makes a map the current map and compiles its events, unless it already is the
+        current map.
+
+        :param current_map: The map to get the events from.
+
+        :type current_map: core.components.map.Map
 
         :rtype: None
         :returns: None
 
         """
+        if current_map is self.current_map:
+            return
 
-        logger.debug("Executing Action")
+        self.current_map = current_map
+
+        # Compile each event once, and share it between the tiles it can run on.
+        compiled = {}
+        for event in current_map.events:
+            compiled[id(event)] = self.compile_event(event, current_map.filename)
+
+        self.global_events = [compiled[id(event)] for event in current_map.global_events]
+        self.event_index = {}
+        for tile, events in current_map.event_index.items():
+            self.event_index[tile] = [compiled[id(event)] for event in events]
+
+
+    def compile_event(self, event, map_name):
+        """Turns an event into a function that checks its conditions and runs its actions when
+        they are met. The condition and action methods are looked up and the condition
+        parameters are parsed once, so checking the event is just a few function calls.
+
+        A condition method can declare the inputs it depends on with an "inputs" attribute,
+        like ``player_at.inputs = ("player_tile",)``. The conditions are then only checked again
+        after one of their inputs was published with :py:func:`notify`, and the result from the
+        last check is used otherwise. Conditions without an "inputs" attribute are checked on
+        every frame.
+
+        :param event: The event to compile. See :py:func:`core.components.map.Map.compile_event`.
+        :param map_name: The name of the map the event is on, for error messages.
+
+        :type event: Dictionary
+        :type map_name: String
+
+        The actions run as a :py:class:`Script`. While the script of an event is waiting, the
+        event isn't started again.
+
+        :rtype: Function
+        :returns: A function that takes the game object and checks the event.
+
+        **Examples:**
+
+        >>> check_event = engine.compile_event(
+        ...     {'conds': [{'type': 'true', 'operator': 'is', 'parameters': '', ...}],
+        ...      'acts': [['play_music', '479403_its-a-unix-system.ogg']]},
+        ...     "map1.tmx")
+        >>> check_event(game)
+
+        """
+        conditions = []
+        for cond in event['conds']:
+            if cond['type'] not in self.conditions:
+                raise ValueError('Unknown event condition "%s" on %s' % (cond['type'], map_name))
+
+            # Conditions read the parsed parameters from "args".
+            cond = dict(cond, args=self.parse_parameters(cond['parameters']))
+
+            # Conditions have so-called "operators". If a condition's operator == "is" then
+            # the condition should be processed as usual. However, if the condition != "is",
+            # the result should be inverted.
+            conditions.append((self.conditions[cond['type']]['method'], cond,
+                               cond['operator'] == 'is'))
+
+        actions = []
+        for action in event['acts']:
+            if action[0] not in self.actions:
+                raise ValueError('Unknown event action "%s" on %s' % (action[0], map_name))
+            actions.append((self.actions[action[0]]['method'], action))
+
+        # The inputs of all the conditions, or None if one of them has to be checked on every
+        # frame. Conditions without an "inputs" attribute are checked on every frame.
+        inputs = frozenset()
+        for check_condition, cond, expected in conditions:
+            condition_inputs = getattr(check_condition, "inputs", None)
+            if condition_inputs is None:
+                inputs = None
+                break
+            inputs |= frozenset(condition_inputs)
+
+        # Whether the conditions were met when they were last checked, or None if they
+        # haven't been checked yet.
+        met = [None]
+
+        # The script that was started the last time the conditions were met.
+        script = [None]
+
+        def check_event(game):
+            if inputs is None or met[0] is None or inputs & self.dirty:
+                # If any conditions fail, the event should not be run
+                met[0] = True
+                for check_condition, cond, expected in conditions:
+                    if check_condition(game, cond) != expected:
+                        met[0] = False
+                        break
 
-        # Loop through the list of actions and execute them
-        for action in action_list:
+            # Events keep running on every frame while their conditions are met, unless their
+            # script is still waiting.
+            if met[0] and not (script[0] and script[0].running):
+                script[0] = self.start_script(actions, game)
 
-            # Call the method listed and return the modified event data
+        return check_event
+
+
+    def parse_parameters(self, parameters):
+        """Parses the parameters of a condition. Parameters are separated by commas. Whole
+        numbers are converted to integers and "key:value" pairs are split into tuples.
+
+        :param parameters: The parameter string of the condition.
+
+        :type parameters: String
+
+        :rtype: Tuple
+        :returns: The parsed parameters.
+
+        **Examples:**
+
+        >>> engine.parse_parameters("less_than,2")
+        ('less_than', 2)
+        >>> engine.parse_parameters("battle_won:yes")
+        (('battle_won', 'yes'),)
+
+        """
+        args = []
+        for value in parameters.split(","):
+            if ":" in value:
+                args.append(tuple(value.split(":", 1)))
+            elif value.lstrip("-").isdigit():
+                args.append(int(value))
+            else:
+                args.append(value)
+
+        return tuple(args)
+
+
+    def run_actions(self, actions, game):
+        """Runs a list of compiled actions, yielding the wait of every action that returns one.
+        See :py:class:`EventEngine` for the waits.
+
+        :param actions: A list of (method, action) pairs, see :py:func:`compile_event`.
+        :param game: The main game object that contains all the game's variables.
+
+        :type actions: List
+        :type game: core.tools.Control
+
+        :rtype: Generator
+        :returns: A generator that runs the actions up to the next wait each time it is
+            advanced.
+
+        """
+        logger.debug("Executing Action")
+
+        for method, action in actions:
             try:
-                self.actions[action[0]]["method"](game, action)
-                #getattr( self.action, str(action[0]))(game, action)
+                wait = method(game, action)
             except Exception, message:
-                error = 'Error: Action method "%s" not implemented' % str(action[0])
+                error = 'Error: Action method "%s" failed' % str(action[0])
                 logger.error(error)
                 logger.error(message)
                 traceback.print_exc()
+                continue
+
+            # Other return values of actions are ignored.
+            if isinstance(wait, tuple):
+                yield wait
+
+
+    def start_script(self, actions, game):
+        """Starts running a list of compiled actions as a script. The actions run right away up
+        to the first one that waits, and the rest run when the script is resumed.
+
+        :param actions: A list of (method, action) pairs, see :py:func:`compile_event`.
+        :param game: The main game object that contains all the game's variables.
+
+        :type actions: List
+        :type game: core.tools.Control
+
+        :rtype: core.components.event.Script
+        :returns: The script.
+
+        **Examples:**
+
+        >>> script = engine.start_script([(engine.actions["wait_for_secs"]["method"],
+        ...                                ("wait_for_secs", "2.0"))], game)
+        >>> script.running
+        True
+
+        """
+        script = Script(self.run_actions(actions, game))
+        self.resume(script)
+        return script
+
+
+    def resume(self, script):
+        """Runs the actions of a script up to the next one that waits, and schedules the script
+        to be resumed when the wait is over.
+
+        :param script: The script to resume.
+
+        :type script: core.components.event.Script
+
+        :rtype: None
+        :returns: None
+
+        """
+        try:
+            wait = next(script.steps)
+        except StopIteration:
+            script.running = False
+            return
+
+        kind, value = wait
+        if kind == "input" and not value:
+            # Without a key to wait for, the script just waits for the next frame.
+            kind, value = "secs", 0.0
+
+        if kind == "secs":
+            heapq.heappush(self.sleeping, (self.time + value, next(self.order), script))
+        elif kind == "input":
+            self.waiting_for_input.setdefault(value, []).append(script)
+        else:
+            logger.error('Unknown wait "%s", stopping the script' % str(kind))
+            script.running = False
+
+
+    def resume_scripts(self, game):
+        """Resumes the scripts whose timer is up or whose key was released.
+
+        :param game: The main game object that contains all the game's variables.
+
+        :type game: core.tools.Control
+
+        :rtype: None
+        :returns: None
+
+        """
+        # Take the scripts off the heap before resuming them, so a script that goes back to
+        # sleep for no time at all waits for the next frame.
+        awake = []
+        while self.sleeping and self.sleeping[0][0] <= self.time:
+            awake.append(heapq.heappop(self.sleeping)[2])
+
+        for script in awake:
+            self.resume(script)
+
+        if not self.waiting_for_input:
+            return
+
+        for event in game.key_events:
+            if event.type != pygame.KEYUP:
+                continue
+
+            for button in self.waiting_for_input.keys():
+                # NOTE: getattr on pygame is a little dangerous. We should sanitize input.
+                if event.key == getattr(pygame, button, None):
+                    for script in self.waiting_for_input.pop(button):
+                        self.resume(script)
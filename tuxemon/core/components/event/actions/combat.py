@@ -79,9 +79,8 @@ class Combat(object):
         npc = player.Npc()
 
         # Look up the NPC's details from our NPC database
-        npcs = db.JSONDatabase()
-        npcs.load("npc")
-        npc_details = npcs.database['npc'][npc_id]
+        db.database.load("npc")
+        npc_details = db.database.database['npc'][npc_id]
 
         # Set the NPC object with the details fetched from the database.
         npc.name = npc_details['name']
@@ -93,12 +92,11 @@ class Combat(object):
         npc_party = npc_details['monsters']
 
         # Look up the monster's details
-        monsters = db.JSONDatabase()
-        monsters.load("monster")
+        db.database.load("monster")
 
         # Look up each monster in the NPC's party
         for npc_monster_details in npc_party:
-            results = monsters.database['monster'][npc_monster_details['monster_id']]
+            results = db.database.database['monster'][npc_monster_details['monster_id']]
 
             # Create a monster object for each monster the NPC has in their party.
             current_monster = monster.Monster()
@@ -148,7 +146,8 @@ class Combat(object):
         """Randomly starts a battle with a monster defined in the "encounter" table in the
         "monster.db" database. The chance that this will start a battle depends on the
         "encounter_rate" specified in the database. The "encounter_rate" number is the chance
-        walking in to this tile will trigger a battle out of 100.
+        walking in to this tile will trigger a battle with that monster out of 100. See
+        :py:class:`core.components.db.EncounterDefinition`.
 
         :param game: The main game object that contains all the game's variables.
         :param action: The action (tuple) retrieved from the database that contains the action's
@@ -185,24 +184,12 @@ class Combat(object):
         # Get the parameters to determine what encounter group we'll look up in the database.
         encounter_id = int(action[1])
 
-        # Look up the encounter details
-        monsters = db.JSONDatabase()
-        monsters.load("encounter")
-        monsters.load("monster")
+        # Look up the encounter details. The tables are only read from disk
+        # the first time.
+        db.database.load("encounter")
 
-        # Keep an encounter variable that will let us know if we're going to start a battle.
-        encounter = None
-
-        # Get all the monsters associated with this encounter.
-        encounters = monsters.database['encounter'][encounter_id]['monsters']
-
-        for item in encounters:
-            # Perform a roll to see if this monster is going to start a battle.
-            roll = random.randrange(1,100)
-            rate = range(1, int(item['encounter_rate']) + 1)
-            if roll in rate:
-                # Set our encounter details
-                encounter = item
+        # Perform a roll to see if a monster is going to start a battle.
+        encounter = db.database.definitions['encounter'][encounter_id].roll()
 
         # If a random encounter was successfully rolled, look up the monster and start the
         # battle.
@@ -211,13 +198,13 @@ class Combat(object):
 
             # Create a monster object
             current_monster = monster.Monster()
-            current_monster.load_from_db(encounter['monster_id'])
+            current_monster.load_definition(encounter.monster)
 
             # Set the monster's level based on the specified level range
-            if len(encounter['level_range']) > 1:
-                level = random.randrange(encounter['level_range'][0], encounter['level_range'][1])
+            if len(encounter.level_range) > 1:
+                level = random.randrange(encounter.level_range[0], encounter.level_range[1])
             else:
-                level = encounter['level_range'][0]
+                level = encounter.level_range[0]
 
             # Set the monster's level
             current_monster.level = level
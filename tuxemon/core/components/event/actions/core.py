@@ -64,6 +64,7 @@ class Core(object):
 
         # Append the game_variables dictionary with the key: value pair
         player.game_variables[varkey] = varvalue
+        game.event_engine.notify("game_variables")
 
 
     def dialog(self, game, action):
@@ -143,7 +144,8 @@ class Core(object):
 
 
     def wait_for_secs(self, game, action):
-        """Pauses the event engine for n number of seconds.
+        """Pauses the event's script for n number of seconds. The rest of its actions run after
+        that, while other events keep running.
 
         :param game: The main game object that contains all the game's variables.
         :param action: The action (tuple) retrieved from the database that contains the action's
@@ -152,12 +154,12 @@ class Core(object):
         :type game: core.tools.Control
         :type action: Tuple
 
-        :rtype: None
-        :returns: None
+        :rtype: Tuple
+        :returns: A wait for the event engine. See :py:class:`core.components.event.EventEngine`.
 
         Valid Parameters: duration
 
-        * duration (float): time in seconds for the event engine to wait for
+        * duration (float): time in seconds for the script to wait for
 
         **Examples:**
 
@@ -166,12 +168,11 @@ class Core(object):
 
         """
         secs = float(action[1])
-        game.event_engine.state = "waiting"
-        game.event_engine.wait = secs
+        return ("secs", secs)
 
 
     def wait_for_input(self, game, action):
-        """Pauses the event engine until specified button is pressed
+        """Pauses the event's script until specified button is pressed
 
         :param game: The main game object that contains all the game's variables.
         :param action: The action (tuple) retrieved from the database that contains the action's
@@ -180,8 +181,8 @@ class Core(object):
         :type game: core.tools.Control
         :type action: Tuple
 
-        :rtype: None
-        :returns: None
+        :rtype: Tuple
+        :returns: A wait for the event engine. See :py:class:`core.components.event.EventEngine`.
 
         Valid Parameters: button
 
@@ -194,6 +195,4 @@ class Core(object):
 
         """
         button = str(action[1])
-        game.event_engine.state = "waiting for input"
-        game.event_engine.wait = 2
-        game.event_engine.button = button
+        return ("input", button)
@@ -25,9 +25,7 @@
 #
 
 import logging
-import os
 import pygame
-import re
 
 # Create a logger for optional handling of debug messages.
 logger = logging.getLogger(__name__)
@@ -126,12 +124,11 @@ class Map(object):
 
         # ('play_animation', 'grass,1.5,noloop,player', '1', 6)
         # "position" can be either a (x, y) tile coordinate or "player"
-        prepare = game.imports["prepare"]
+        assets = game.imports["assets"]
 
         parameters = action[1].split(",")
         animation_name = parameters[0]
         duration = float(parameters[1])
-        directory = prepare.BASEDIR + "resources/animations/tileset"
 
         if parameters[2] == "loop":
             loop = True
@@ -153,15 +150,12 @@ class Map(object):
             game.animations[animation_name]["conductor"].play()
             return True
 
-        # Loop through our animation resources and find the animation files based on name.
+        # Look up the animation's frames in the asset catalogue.
         scale = game.state_dict["WORLD"].scale
         images_and_durations = []
-        for animation_frame in os.listdir(directory):
-            pattern = animation_name + "\.[0-9].*"
-            if re.findall(pattern, animation_frame):
-                frame = pygame.image.load(directory + "/" + animation_frame).convert_alpha()
-                frame = pygame.transform.scale(frame, (frame.get_width() * scale, frame.get_height() * scale))
-                images_and_durations.append((frame, duration))
+        for animation_frame in assets.catalogue.animation("tileset", animation_name):
+            frame = assets.surfaces.load(animation_frame, scale)
+            images_and_durations.append((frame, duration))
 
         # Scale the animations based on our game's scale: game.state_dict["WORLD"].scale
 
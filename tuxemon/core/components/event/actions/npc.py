@@ -41,6 +41,8 @@ class Npc(object):
 
         Valid Parameters: name,tile_pos_x,tile_pos_y,animations,behavior
 
+        NPCs with the "chase" behavior walk towards the player.
+
         **Examples:**
 
         >>> action
@@ -79,6 +81,7 @@ class Npc(object):
 
         # Add the NPC to the game's NPC list
         world.npcs.append(npc)
+        game.event_engine.notify("npcs")
 
     def pathfind(self, game, action):
         '''
@@ -100,5 +103,6 @@ class Npc(object):
                 curr_npc = n
                 print "found npc: " +npc_name
 
-        curr_npc.pathfind((int(dest_x),int(dest_y)), game)
+        # Search for the path in the background, so a long search doesn't hold up the game.
+        curr_npc.pathfind((int(dest_x),int(dest_y)), game, wait=False)
 
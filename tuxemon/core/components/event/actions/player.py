@@ -55,10 +55,6 @@ class Player(object):
 
         """
         prepare = game.imports["prepare"]
-        item = game.imports["item"]
-        monster = game.imports["monster"]
-        Map = game.imports["map"].Map
-
 
         # Get the player object from the game.
         player = game.player1
@@ -88,38 +84,9 @@ class Player(object):
             world.global_x = player.position[0] - (position_x * player.tile_size[0])
             world.global_y = player.position[1] - (position_y * player.tile_size[1]) + player.tile_size[1]
 
-            ### THIS NEEDS TO BE MOVED IN ITS OWN FUNCTION AND IS DUPLICATED IN THE WORLD STATE ###
+            # Load the new map if we're teleporting to a different one.
             if prepare.BASEDIR + "resources/maps/" + mapname != world.current_map.filename:
-                world.current_map = Map(
-                    prepare.BASEDIR + "resources/maps/" + mapname)
-                world.event_engine.current_map = Map(
-                    prepare.BASEDIR + "resources/maps/" + mapname)
-                world.tiles, world.collision_map, world.collision_lines_map, world.map_size = world.current_map.loadfile(
-                    world.tile_size)
-                world.game.events = world.current_map.events
-
-                # Clear out any existing NPCs
-                world.npcs = []
-
-                # Scale the loaded tiles if enabled
-                if world.scale > 1:
-                    x_pos = 0        # Here we need to keep track of the x index of the list
-                    # Loop through each row in the map. Each row is a list of
-                    # Tile objects in that row.
-                    for row in world.tiles:
-                        y_pos = 0       # Here we need to keep track of the y index of the list within the row
-                        # Now loop through each tile in the row and scale it
-                        # accordingly.
-                        for column in row:
-                            if column:
-                                layer_pos = 0
-                                for tile in column:
-                                    tile["surface"] = pygame.transform.scale(
-                                        tile["surface"], (world.tile_size[0], world.tile_size[1]))
-                                    world.tiles[x_pos][y_pos][layer_pos] = tile
-                                    layer_pos += 1
-                            y_pos += 1
-                        x_pos += 1
+                world.load_map(mapname)
 
         # Stop the player's movement so they don't continue their move after they teleported.
         player.moving = False
@@ -190,30 +157,8 @@ class Player(object):
         >>> monster = core.components.monster.Monster()
         >>> monster.load_from_db(action[1])
         ...
-        >>> pprint.pprint(monster.__dict__)
-        ... {'attack': 50,
-        ...  'attack_modifier': [u'1', u'1.1', u'1.2'],
-        ...  'back_battle_sprite': u'resources/gfx/sprites/battle/bulbatux-back.png',
-        ...  'body': <core.components.fusion.Body instance at 0x2d0b3f8>,
-        ...  'defense': 7,
-        ...  'defense_modifier': [u'1', u'1.1', u'1.2'],
-        ...  'front_battle_sprite': u'resources/gfx/sprites/battle/bulbatux-front.png',
-        ...  'hp': 30,
-        ...  'hp_modifier': [u'0.9', u'1', u'1.1'],
-        ...  'level': 0,
-        ...  'menu_sprite': u'resources/gfx/sprites/battle/bulbatux-menu01.png',
-        ...  'monster_id': 1,
-        ...  'moves': [],
-        ...  'name': u'Bulbatux',
-        ...  'special_attack': 9,
-        ...  'special_attack_modifier': [u'1', u'1.1', u'1.2'],
-        ...  'special_defense': 8,
-        ...  'special_defense_modifier': [u'1', u'1.1', u'1.2'],
-        ...  'speed': 7,
-        ...  'speed_modifier': [u'1', u'1.1', u'1.2'],
-        ...  'status': 'Normal',
-        ...  'type1': u'grass',
-        ...  'type2': u'poison'}
+        >>> monster.name, monster.level, monster.hp, monster.type1, monster.type2
+        ... (u'Bulbatux', 0, 30, u'grass', u'poison')
         ...
         >>> game.player1.add_monster(monster)
         >>> game.player1.monsters
@@ -231,6 +176,7 @@ class Player(object):
         current_monster.set_level(int(monster_level))
 
         game.player1.add_monster(current_monster)
+        game.event_engine.notify("party")
 
 
     def add_item(self, game, action):
@@ -296,4 +242,5 @@ class Player(object):
             game.state_dict["WORLD"].delayed_facing = parameters
         else:
             game.player1.facing = parameters
+            game.event_engine.notify("player_facing")
 
@@ -60,10 +60,9 @@ class Sound(object):
 
         """
 
-        prepare = game.imports["prepare"]
+        assets = game.imports["assets"]
         filename = str(action[1])
-        sound = mixer.Sound(prepare.BASEDIR + "resources/sounds/" + filename)
-        sound.play()
+        assets.sounds.play(filename)
 
 
     def play_music(self, game, action):
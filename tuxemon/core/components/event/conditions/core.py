@@ -45,6 +45,8 @@ class Core(object):
 
         return True
 
+    true.inputs = ()
+
 
     def button_pressed(self, game, condition):
         """Checks to see if a particular key was pressed
@@ -111,6 +113,7 @@ class Core(object):
          'id': 2,
          'operator': 'is',
          'parameters': 'battle_won:yes',
+         'args': (('battle_won', 'yes'),),
          'type': 'variable_set',
          'x': 0,
          'y': 0}
@@ -120,17 +123,13 @@ class Core(object):
         # Get the player object from the game.
         player = game.player1
 
-        # Loop through the player's game variables to see if they have a value that is set.
-        for key, value in player.game_variables.items():
-
-            # Split the string by ":" into a list
-            varlist = condition["parameters"].split(":")
-            varkey = varlist[0]
-            varvalue = varlist[1]
+        # The "variable_name:value" parameter is parsed into a tuple by the event engine.
+        varkey, varvalue = condition["args"][0]
 
-            # If the variable is set in the game variables, then we've met the condition.
-            if (varkey == key) and (varvalue == value):
-                return True
+        # If the variable is set in the game variables, then we've met the condition.
+        if varkey in player.game_variables and player.game_variables[varkey] == varvalue:
+            return True
 
         return False
 
+    variable_set.inputs = ("game_variables",)
@@ -67,6 +67,8 @@ class Npc(object):
 
         return False
 
+    npc_exists.inputs = ("npcs",)
+
 
     def facing_npc(self, game, condition):
         """Checks to see the player is next to and facing a particular NPC
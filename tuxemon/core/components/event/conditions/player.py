@@ -63,22 +63,22 @@ class Player(object):
         # Get the player object from the game.
         player = game.player1
 
-        # Get the condition's coordinates in tuple format
-        coordinates = (condition['x'], condition['y'])
-
-        # Get the condition's rectangle area. If we're on a tile in that area, then this condition
-        # should return True.
-        area_x = range(condition['x'], condition['x'] + condition['width'])
-        area_y = range(condition['y'], condition['y'] + condition['height'])
+        # Get the player's tile. If it is inside the condition's rectangle area, then this
+        # condition should return True.
+        x = round(player.tile_pos[0])
+        y = round(player.tile_pos[1])
 
         # If the player is at the coordinates and the operator is set to true then return true
-        if round(player.tile_pos[0]) in area_x and round(player.tile_pos[1]) in area_y:
+        if (condition['x'] <= x < condition['x'] + condition['width']
+            and condition['y'] <= y < condition['y'] + condition['height']):
             return True
 
         # If the player is at the coordinates and the operator is set to false then return false
         else:
             return False
 
+    player_at.inputs = ("player_tile",)
+
 
     def player_facing(self, game, condition):
         """Checks to see where the player is facing
@@ -117,6 +117,8 @@ class Player(object):
         else:
             return False
 
+    player_facing.inputs = ("player_facing",)
+
 
     def player_moved(self, game, condition):
         """Checks to see the player has just moved into this tile. Using this condition will
@@ -147,26 +149,11 @@ class Player(object):
 
         """
 
-        # Create a dictionary that will hold our move destinations.
-        if 'move_destination' not in game.event_persist:
-            game.event_persist['move_destination'] = {}
-
-        if str(condition) not in game.event_persist['move_destination']:
-            game.event_persist['move_destination'][str(condition)] = game.player1.move_destination
-
-        # Check to see if the player's "move destination" has changed since the last
-        # frame. If it has, WE'RE MOVING!
-        moved = False
-        if game.player1.move_destination == game.event_persist['move_destination'][str(condition)]:
-            moved = False
-        else:
-            moved = True
-
-        # Update the current player's last move destination.
-        game.event_persist['move_destination'][str(condition)] = game.player1.move_destination
-
-        # Check for "is" or "is_not" in the condition.
-        if moved:
+        # The event engine remembers the player's "move destination" from the last frame. If it
+        # has changed since then, WE'RE MOVING!
+        last_move_destination = game.event_persist.get('move_destination',
+                                                       game.player1.move_destination)
+        if game.player1.move_destination != last_move_destination:
             return True
         else:
             return False
@@ -198,14 +185,13 @@ class Player(object):
          'type': 'party_size',
          'operator': 'is',
          'parameters': 'less_than,2',
+         'args': ('less_than', 2),
          'x': 0,
          'y': 0}
 
         """
 
-        parameters = condition['parameters'].split(',')
-        check = str(parameters[0])
-        number = int(parameters[1])
+        check, number = condition['args']
         party_size = len(game.player1.monsters)
 
         # Check to see if the player's party size equals this number.
@@ -235,3 +221,4 @@ class Player(object):
 
         return False
 
+    party_size.inputs = ("party",)
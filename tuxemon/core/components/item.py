@@ -38,47 +38,44 @@ import random
 
 from core import prepare
 from . import pyganim
+from . import assets
 from . import db
 from . import fusion
-from . import monster
 
 # Create a logger for optional handling of debug messages.
 logger = logging.getLogger(__name__)
 logger.debug("core.item successfully imported")
 
 # Load the monster database
-items = db.JSONDatabase()
+items = db.database
 items.load("item")
 
+# The definition of items that haven't been loaded from the database.
+blank_item = db.ItemDefinition(id=0, name="Blank", description="None", type=None, power=0,
+                               sprite="", target=None, usable_in=(), effects=())
+
 
 class Item(object):
     """An item object is an item that can be used either in or out of combat.
 
     **Example:**
 
+    Apart from its surface, an item's attributes are read from its shared
+    :py:class:`core.components.db.ItemDefinition`.
+
     >>> potion_item = Item("Potion")
-    >>> pprint.pprint(potion_item.__dict__)
-    {'description': u'Heals a monster by 50 HP.',
-     'effect': [u'heal'],
-     'id': 1,
-     'name': u'Potion',
-     'power': 50,
-     'sprite': u'resources/gfx/items/potion.png',
-     'surface': <Surface(66x90x32 SW)>,
-     'surface_size_original': (66, 90),
-     'type': u'Consumable'}
+    >>> potion_item.name, potion_item.type, potion_item.power, potion_item.effect
+    (u'Potion', u'Consumable', 50, (u'heal',))
+    >>> potion_item.surface
+    <Surface(66x90x32 SW)>
 
     """
+    __slots__ = ("definition", "surface", "surface_size_original")
 
     def __init__(self, name=None, id=None):
 
-        self.id = 0
-        self.name = "Blank"
-        self.description = "None"
-        self.effect = []
-        self.type = None
-        self.power = 0
-        self.sprite = ""                    # The path to the sprite to load.
+        # The shared definition of this item from the database.
+        self.definition = blank_item
         self.surface = None                 # The pygame.Surface object of the item.
         self.surface_size_original = (0,0)  # The original size of the image before scaling.
 
@@ -86,6 +83,25 @@ class Item(object):
         if name or id:
             self.load(name, id)
 
+    id = db.definition_property("id", "The id of the item.")
+    name = db.definition_property("name", "The name of the item.")
+    description = db.definition_property("description", "The description of the item.")
+    type = db.definition_property("type", "The type of the item, like \"Consumable\".")
+    power = db.definition_property("power", "The power of the item's effects.")
+    sprite = db.definition_property("sprite", "The path to the sprite to load.")
+    target = db.definition_property("target", "Who the item can be used on.")
+    usable_in = db.definition_property("usable_in", "The states the item can be used in.")
+    effect = db.definition_property("effects", "The names of the item's effect methods.")
+
+
+    def __getstate__(self):
+        # Items are pickled in save files by id, since surfaces can't be pickled.
+        return self.id
+
+
+    def __setstate__(self, id):
+        self.__init__(id=id)
+
 
     def load(self, name, id):
         """Loads and sets this items's attributes from the item.db database. The item is looked up
@@ -105,34 +121,15 @@ class Item(object):
         >>> potion_item = Item()
         >>> potion_item.load("Potion", None)    # Load an item by name.
         >>> potion_item.load(None, 1)           # Load an item by id.
-        >>> pprint.pprint(potion_item.__dict__)
-        {'description': u'Heals a monster by 50 HP.',
-         'effect': [u'heal'],
-         'id': 1,
-         'name': u'Potion',
-         'power': 50,
-         'type': u'Consumable'}
+        >>> potion_item.name, potion_item.description
+        (u'Potion', u'Heals a monster by 50 HP.')
 
         """
 
-        if name:
-            results = items.lookup(name, table="item")
-        elif id:
-            results = items.lookup_by_id(id, table="item")
-
-        self.name = results["name"]
-        self.description = results["description"]
-        self.id = results["id"]
-        self.type = results["type"]
-        self.power = results["power"]
-        self.sprite = results["sprite"]
-        self.target = results["target"]
-        self.usable_in = results["usable_in"]
-        self.surface = pygame.image.load(prepare.BASEDIR + self.sprite).convert_alpha()
+        self.definition = items.lookup_definition(name or id, table="item")
+        self.surface = assets.surfaces.load(prepare.BASEDIR + self.sprite)
         self.surface_size_original = self.surface.get_size()
 
-        self.effect = results["effects"]
-
 
     def use(self, target, game):
         """Applies this items's effects as defined in the "effect" column of the item database.
@@ -220,4 +217,4 @@ if __name__ == "__main__":
     screen = pygame.display.set_mode((800,600), 1, 32)
 
     potion_item = Item("Potion")
-    pprint.pprint(potion_item.__dict__)
+    pprint.pprint(potion_item.definition._asdict())
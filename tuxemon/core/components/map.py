@@ -33,6 +33,11 @@ import logging
 import pygame
 import os
 import sys
+import cPickle as pickle
+import hashlib
+from array import array
+
+from core import prepare
 
 # PyTMX LOVES to change their API without notice. Here we try and handle that.
 try:
@@ -44,46 +49,83 @@ except ImportError:
 logger = logging.getLogger(__name__)
 logger.debug("components.map successfully imported")
 
+# The version of the compiled map format. Bump this whenever the layout of the compiled map
+# changes so that old cache files are recompiled instead of loaded.
+MAP_CACHE_VERSION = 4
+
+# The bits of each tile's flags in a CollisionGrid. A blocked tile can't be walked onto. A wall
+# bit means that the tile can't be left in that direction.
+COLLISION_BLOCKED = 1
+WALL_UP = 2
+WALL_DOWN = 4
+WALL_LEFT = 8
+WALL_RIGHT = 16
+
+# Scaled tile surfaces shared by every map, keyed by (tileset, tile id, tile size). Tiles that
+# are used by several maps only get scaled once, and revisiting a map scales nothing.
+scaled_tiles = {}
+
 
 class Map(object):
     """Maps are loaded from standard tmx files created from a map editor like Tiled. Events and
     collision regions are loaded and put in the appropriate data structures for the game to
     understand.
 
+    The first time a map is loaded, the tmx file is parsed and compiled into a cache file under
+    :py:data:`core.prepare.CACHE_DIR`. Later loads of the same (unmodified) map read the
+    compiled file in a single pass instead of parsing the tmx file again.
+
     **Tiled:** http://www.mapeditor.org/
 
     """
     def __init__(self, filename):
         self.filename = None
-        self.data = None
 
         # Get the tile size from a tileset in our map. This is used to calculate the number of tiles
         # in a collision region.
+        self.size = (0, 0)
         self.tile_size = (0, 0)
 
-        # Collision tiles in tmx object format
-        self.collisions = []
+        # A list of tile layers. Each layer is an array of tile gids in row-major order where
+        # a gid of 0 means there is no tile at that position.
+        self.layers = []
+
+        # The pygame surface of each unique tile in the map keyed by its gid.
+        self.images = {}
+
+        # The tileset tile that each gid came from, keyed by gid. These identify the same tile
+        # across different maps.
+        self.tile_keys = {}
+
+        # A set of (x, y) tile coordinates that the player cannot walk through.
+        self.collision_map = set()
 
         # Collision lines (player can walk in tiles, but cannot cross
-        # from one to another) Items in this list should be in the
-        # form of pairs, signifying that it is NOT possible to travel
-        # from the first tile to the second (but reverse may be
-        # possible, i.e. jumping) All pairs of tiles must be adjacent
-        # (not diagonal)
-        self.collision_lines = []
+        # from one to another) Items in this set should be in the
+        # form of (tile, direction) pairs, signifying that it is NOT
+        # possible to travel from the tile in that direction (but
+        # reverse may be possible, i.e. jumping) e.g. ((5, 4), "up")
+        self.collision_lines_map = set()
+
+        # The collision map and collision lines combined into one grid of flags, so checking
+        # for collisions is a single lookup.
+        self.collision_grid = None
 
         self.events = []
 
+        # The events that can run while the player is on a tile keyed by (x, y) tile position,
+        # and the events that can run anywhere. Both are in the same order as self.events.
+        self.event_index = {}
+        self.global_events = []
+
         # Initialize the map
         self.load(filename)
 
 
     def load(self, filename):
-        """Load map data from a tmx map file and get all the map's events and collision areas.
-        Loading the map data is done using the pytmx library.
-
-        Specifications for the TMX map format can be found here:
-        https://github.com/bjorn/tiled/wiki/TMX-Map-Format
+        """Load map data from a compiled map file if an up to date one exists. Otherwise the
+        tmx map file is compiled with :py:func:`core.components.map.Map.compile` and the result
+        is saved for the next time the map is loaded.
 
         :param filename: The path to the tmx map file to load.
 
@@ -92,6 +134,47 @@ class Map(object):
         :rtype: None
         :returns: None
 
+        """
+        self.filename = filename
+
+        compiled = self.load_compiled(filename)
+        if not compiled:
+            compiled = self.compile(filename)
+            self.save_compiled(compiled)
+
+        self.size = compiled["size"]
+        self.tile_size = compiled["tile_size"]
+        self.layers = [array('H', layer) for layer in compiled["layers"]]
+        self.collision_map = compiled["collision_map"]
+        self.collision_lines_map = compiled["collision_lines_map"]
+        self.collision_grid = CollisionGrid(self.size, array('B', compiled["collision_grid"]))
+        self.events = compiled["events"]
+        self.global_events = [self.events[i] for i in compiled["global_events"]]
+        self.event_index = {}
+        for tile, indexes in compiled["event_index"].items():
+            self.event_index[tile] = [self.events[i] for i in indexes]
+        self.tile_keys = compiled["tile_keys"]
+
+        # Decode each unique tile image exactly once. Every tile placement refers to these.
+        self.images = {}
+        for gid, (size, pixels) in compiled["images"].items():
+            self.images[gid] = pygame.image.fromstring(pixels, size, "RGBA").convert_alpha()
+
+
+    def compile(self, filename):
+        """Parses a tmx map file and compiles it into a dictionary of plain python data that can
+        be written to the map cache. Loading the map data is done using the pytmx library.
+
+        Specifications for the TMX map format can be found here:
+        https://github.com/bjorn/tiled/wiki/TMX-Map-Format
+
+        :param filename: The path to the tmx map file to compile.
+
+        :type filename: String
+
+        :rtype: Dictionary
+        :returns: The compiled map data.
+
         **Examples:**
 
         In each map, there are three types of objects: **collisions**, **conditions**, and
@@ -146,144 +229,318 @@ class Map(object):
          'x': 0,
          'y': 0}
 
+        The compiled map looks like this:
+
+        >>> compiled = map.compile("pallet_town-room.tmx")
+        >>> compiled
+        {'version': 1,
+         'source': '/home/user/tuxemon/resources/maps/pallet_town-room.tmx',
+         'mtime': 1420070400.0,
+         'size': (11, 11),
+         'tile_size': (16, 16),
+         'layers': ['\\x01\\x00\\x02\\x00...', ...],
+         'images': {1: ((16, 16), '\\xff\\xff\\xff\\xff...'), ...},
+         'tile_keys': {1: ('resources/gfx/tilesets/floorsandwalls.png', 12,
+                           (False, False, False)), ...},
+         'collision_map': set([(0, 2), (0, 3)]),
+         'collision_lines_map': set([((5, 4), 'up')]),
+         'collision_grid': '\\x00\\x00\\x01\\x01...',
+         'events': [{'conds': [...], 'acts': [...]}],
+         'event_index': {(1, 11): [0, 2], ...},
+         'global_events': [2]}
+
         """
 
         # Load the tmx map data using the pytmx library.
-        self.filename = filename
-        #self.data = pytmx.TiledMap(filename)
-        self.data = load_pygame(filename, pixelalpha=True)
-
-        # Get the map dimensions
-        self.size = (self.data.width, self.data.height)
+        data = load_pygame(filename, pixelalpha=True)
 
         # Get the tile size of the map
-        self.tile_size = (self.data.tilesets[0].tilewidth, self.data.tilesets[0].tileheight)
+        self.tile_size = (data.tilesets[0].tilewidth, data.tilesets[0].tileheight)
+
+        # Get the number of tile layers.
+        num_of_layers = 0
+
+        # PyTMX recently changed some of their attribute names.
+        # This ensures we get the number of layers regardless of
+        # the version of PyTMX.
+        try:
+            for layer in data.layers:
+                if hasattr(layer, 'data'):
+                    num_of_layers += 1
+        except AttributeError:
+            for layer in data.tilelayers:
+                num_of_layers += 1
+
+        # Find the tileset tile behind each of PyTMX's gids, so the same tile can be recognized
+        # in other maps. PyTMX gives flipped tiles their own gid, so the flags are kept as well.
+        tiled_gids = {}
+        for tiled_gid, registered in data.gidmap.items():
+            for gid, flags in registered:
+                tiled_gids[gid] = (tiled_gid, tuple(flags))
+        tmx_dir = os.path.dirname(os.path.abspath(filename))
+
+        # Give every unique tile surface its own gid. PyTMX hands back the same surface object
+        # for every placement of a tile, so we only need to store each image once.
+        gids = {}
+        images = {}
+        tile_keys = {}
+        layers = []
+        for layer in range(0, num_of_layers):
+            layer_gids = array('H', [0]) * (data.width * data.height)
+
+            for y in range(0, data.height):
+                for x in range(0, data.width):
+
+                    # PyTMX recently changed their method names. This
+                    # ensures the map will load regardless of the PyTMX
+                    # version.
+                    try:
+                        surface = data.getTileImage(x, y, layer)
+                    except AttributeError:
+                        surface = data.get_tile_image(x, y, layer)
+
+                    if not surface:
+                        continue
+
+                    gid = gids.get(id(surface))
+                    if gid is None:
+                        gid = len(gids) + 1
+                        gids[id(surface)] = gid
+                        images[gid] = (surface.get_size(),
+                                       pygame.image.tostring(surface, "RGBA"))
+                        tile_keys[gid] = self.compile_tile_key(
+                            data, data.get_tile_gid(x, y, layer), tiled_gids, tmx_dir)
+
+                    layer_gids[y * data.width + x] = gid
+
+            layers.append(layer_gids.tostring())
 
         # Load all objects from the map file and sort them by their type.
-        for obj in self.data.objects:
+        collisions = []
+        collision_lines = []
+        events = []
+        for obj in data.objects:
             if obj.type == 'collision':
-                self.collisions.append(obj)
+                collisions.append(obj)
 
             elif obj.type == 'collision-line':
-                self.collision_lines.append(obj)
+                collision_lines.append(obj)
 
             elif obj.type == 'event':
-                conds = []
-                acts = []
+                events.append(self.compile_event(obj))
+
+        collision_map = self.compile_collisions(collisions)
+        collision_lines_map = self.compile_collision_lines(collision_lines)
+        collision_grid = self.compile_collision_grid((data.width, data.height),
+                                                     collision_map, collision_lines_map)
+        event_index, global_events = self.compile_event_index((data.width, data.height), events)
+
+        return {"version": MAP_CACHE_VERSION,
+                "source": os.path.abspath(filename),
+                "mtime": os.path.getmtime(filename),
+                "size": (data.width, data.height),
+                "tile_size": self.tile_size,
+                "layers": layers,
+                "images": images,
+                "tile_keys": tile_keys,
+                "collision_map": collision_map,
+                "collision_lines_map": collision_lines_map,
+                "collision_grid": collision_grid.tostring(),
+                "events": events,
+                "event_index": event_index,
+                "global_events": global_events}
+
+
+    def compile_tile_key(self, data, gid, tiled_gids, tmx_dir):
+        """Returns a key that identifies a tile by the tileset image it comes from rather than
+        by its gid, which is only meaningful inside a single map.
+
+        :param data: The PyTMX map data.
+        :param gid: The PyTMX gid of the tile.
+        :param tiled_gids: A dictionary of (tiled gid, flags) pairs keyed by PyTMX gid.
+        :param tmx_dir: The directory of the tmx file being compiled.
+
+        :type data: pytmx.TiledMap
+        :type gid: Integer
+        :type tiled_gids: Dictionary
+        :type tmx_dir: String
+
+        :rtype: Tuple
+        :returns: A (tileset, tile id, flags) tuple.
+
+        **Examples:**
+
+        >>> map.compile_tile_key(data, 5, tiled_gids, tmx_dir)
+        ('resources/gfx/tilesets/floorsandwalls.png', 12, (False, False, False))
+
+        """
+        tiled_gid, flags = tiled_gids[gid]
+        tileset = data.get_tileset_from_gid(gid)
+
+        # Tilesets are referenced relative to each map, so normalize the path of the image.
+        source = os.path.normpath(os.path.join(tmx_dir, tileset.source))
+        source = os.path.relpath(source, prepare.BASEDIR)
+
+        return source, tiled_gid - tileset.firstgid, flags
+
+
+    def compile_event(self, obj):
+        """Splits the condition and action properties of a tmx event object into the event
+        format used by the event engine.
+
+        :param obj: The tmx event object.
+
+        :type obj: pytmx.TiledObject
+
+        :rtype: Dictionary
+        :returns: A dictionary with a list of conditions and a list of actions.
+
+        """
+        conds = []
+        acts = []
+
+        # Conditions & actions are stored as Tiled properties.
+        # We need to sort them by name, so that "act1" comes before "act2" and so on..
+        keys = sorted(obj.properties.keys())
 
-                # Conditions & actions are stored as Tiled properties.
-                # We need to sort them by name, so that "act1" comes before "act2" and so on..
-                keys = sorted(obj.properties.keys())
+        for k in keys:
+            if k.startswith('cond'):
+                words = obj.properties[k].split(' ', 2)
 
-                for k in keys:
-                    if k.startswith('cond'):
-                        words = obj.properties[k].split(' ', 2)
+                # Conditions have the form 'operator type parameters'.
+                operator, type = words[0:2]
 
-                        # Conditions have the form 'operator type parameters'.
-                        operator, type = words[0:2]
+                args = ''
+                if len(words) > 2:
+                    args = words[2]
 
-                        args = ''
-                        if len(words) > 2:
-                            args = words[2]
+                conds.append({
+                    'type': type,
+                    'parameters': args,
+                    'x': int(obj.x / self.tile_size[0]),
+                    'y': int(obj.y / self.tile_size[1]),
+                    'width': int(obj.width / self.tile_size[0]),
+                    'height': int(obj.height / self.tile_size[1]),
+                    'operator': operator
+                })
+            elif k.startswith('act'):
+                acts.append(obj.properties[k].split(' ', 1))
 
-                        conds.append({
-                            'type': type,
-                            'parameters': args,
-                            'x': int(obj.x / self.tile_size[0]),
-                            'y': int(obj.y / self.tile_size[1]),
-                            'width': int(obj.width / self.tile_size[0]),
-                            'height': int(obj.height / self.tile_size[1]),
-                            'operator': operator
-                        })
-                    elif k.startswith('act'):
-                        acts.append(obj.properties[k].split(' ', 1))
+        return {'conds': conds, 'acts': acts}
 
-                self.events.append({'conds':conds, 'acts':acts})
+
+    def get_cache_path(self, filename):
+        """Returns the path of the compiled map file for a given tmx map file.
+
+        :param filename: The path to the tmx map file.
+
+        :type filename: String
+
+        :rtype: String
+        :returns: The path to the compiled map file.
+
+        """
+        source = os.path.abspath(filename)
+        name = os.path.splitext(os.path.basename(source))[0]
+        digest = hashlib.md5(source.encode("utf-8")).hexdigest()[:8]
+        return os.path.join(prepare.CACHE_DIR, "maps", "%s-%s.map" % (name, digest))
+
+
+    def load_compiled(self, filename):
+        """Loads a compiled map file for the given tmx map. The compiled map is only used if it
+        was compiled with the current cache version from the same tmx file, and the tmx file
+        hasn't been modified since.
+
+        :param filename: The path to the tmx map file.
+
+        :type filename: String
+
+        :rtype: Dictionary
+        :returns: The compiled map data or None if no up to date compiled map exists.
+
+        """
+        cache_path = self.get_cache_path(filename)
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            with open(cache_path, "rb") as cache_file:
+                # The header is stored separately, so we can throw away stale caches without
+                # reading the rest of the file.
+                header = pickle.load(cache_file)
+                if (header["version"] != MAP_CACHE_VERSION
+                    or header["source"] != os.path.abspath(filename)
+                    or header["mtime"] != os.path.getmtime(filename)):
+                    logger.debug("Compiled map is out of date: " + cache_path)
+                    return None
+
+                compiled = pickle.load(cache_file)
+        except Exception, message:
+            logger.warning("Unable to read compiled map %s: %s" % (cache_path, message))
+            return None
+
+        compiled.update(header)
+        return compiled
+
+
+    def save_compiled(self, compiled):
+        """Writes compiled map data to the map cache. Failing to write the cache is not fatal;
+        the map will just be compiled again the next time it is loaded.
+
+        :param compiled: The compiled map data from :py:func:`core.components.map.Map.compile`.
+
+        :type compiled: Dictionary
+
+        :rtype: None
+        :returns: None
+
+        """
+        header_keys = ("version", "source", "mtime")
+        header = dict((key, compiled[key]) for key in header_keys)
+        body = dict((key, value) for key, value in compiled.items() if key not in header_keys)
+
+        cache_path = self.get_cache_path(compiled["source"])
+        try:
+            if not os.path.isdir(os.path.dirname(cache_path)):
+                os.makedirs(os.path.dirname(cache_path))
+
+            # Write to a temporary file first so a crash never leaves a half written cache.
+            with open(cache_path + ".tmp", "wb") as cache_file:
+                pickle.dump(header, cache_file, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(body, cache_file, pickle.HIGHEST_PROTOCOL)
+            if os.path.exists(cache_path):
+                os.remove(cache_path)
+            os.rename(cache_path + ".tmp", cache_path)
+        except (IOError, OSError), message:
+            logger.warning("Unable to write compiled map %s: %s" % (cache_path, message))
 
 
     def loadfile(self, tile_size):
-        """Loads the tile and collision data from the map file and returns a list of tiles with
-        their position and pygame surface, a set of collision tile coordinates, and the size of
-        the map itself. The list of tile surfaces is used to draw the map in the main game. The
-        list of collision tile coordinates is used for collision detection.
+        """Loads the tile and collision data from the map file and returns a grid of tiles, a
+        set of collision tile coordinates, and the size of the map itself. The tile grid is used
+        to draw the map in the main game. The list of collision tile coordinates is used for
+        collision detection.
 
         :param tile_size: An [x, y] size of each tile in pixels AFTER scaling. This is used for
             scaling and positioning.
 
         :type tile_size: List
 
-        :rtype: List
-        :returns: A multi-dimensional list of tiles in dictionary format; a set of collision
-            coordinates; the map size.
+        :rtype: Tuple
+        :returns: A :py:class:`core.components.map.TileGrid` of the map's tiles; a set of
+            collision coordinates; a set of collision lines; the map size.
 
         **Examples:**
 
-        The list of tiles is structured in a way where you can access an individual tile by
-        index number. For example, to get a tile located at (2, 1), you can access the tile's
-        details using:
+        The tile grid stores one array of gids per layer. To get the surface of a tile located
+        at (2, 1) on the first layer, you can use:
 
+        >>> tiles, collisions, collision_lines, mapsize = map.loadfile([80, 80])
         >>> x = 2
         >>> y = 1
         >>> layer = 0
-        >>> tiles[x][y][layer]
-
-        Here is an example of what the the tiles list data structure actually looks like:
-
-        >>> tiles, collisions, mapsize =  map.loadfile([24, 24])
-        >>> tiles
-            [
-              [
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                [],
-                []
-              ],
-              [ [],
-                [{'layer': 1,
-                'name': '6,0',
-                'position': (80, 80),
-                'surface': <Surface(16x16x32 SW)>,
-                'tile_pos': [1, 1],
-                'tileset': 'resources/gfx/tileset.png'}],
-                [{'layer': 1,
-                'name': '7,0',
-                'position': (80, 160),
-                'surface': <Surface(16x16x32 SW)>,
-                'tile_pos': [1, 2],
-                'tileset': 'resources/gfx/tileset.png'}],
-                [{'layer': 1,
-                'name': '8,0',
-                'position': (80, 240),
-                'surface': <Surface(16x16x32 SW)>,
-                'tile_pos': [1, 3],
-                'tileset': 'resources/gfx/tileset.png'}],
-                [{'layer': 1,
-                'name': '9,0',
-                'position': (80, 320),
-                'surface': <Surface(16x16x32 SW)>,
-                'tile_pos': [1, 4],
-                'tileset': 'resources/gfx/tileset.png'}],
-                [{'layer': 1,
-                'name': '9,0',
-                'position': (80, 400),
-                'surface': <Surface(16x16x32 SW)>,
-                'tile_pos': [1, 5],
-                'tileset': 'resources/gfx/tileset.png'},
-                {'layer': 3,
-                'name': '10,0',
-                'position': (80, 400),
-                'surface': <Surface(16x16x32 SW)>,
-                'tile_pos': [1, 5],
-                'tileset': 'resources/gfx/tileset.png'}],
-        ...
-
+        >>> tiles.images[tiles.layers[layer][y * tiles.width + x]]
+        <Surface(16x16x32 SW)>
 
         The collision map is a set of (x,y) coordinates that the player cannot walk
         through. This set is generated based on collision regions defined in the
@@ -291,7 +548,6 @@ class Map(object):
 
         Here is an example of what the collision set looks like:
 
-        >>> tiles, collisions, mapsize =  map.loadfile([24, 24])
         >>> collisions
         set([(0, 2),
              (0, 3),
@@ -301,74 +557,41 @@ class Map(object):
 
         """
 
-        # Create a list of all of the tiles in the map
-        tiles = []
-
-        # Loop through all tiles in our map file and get the pygame surface associated with it.
-        for x in range(0, self.data.width):
+        tiles = TileGrid(self.size, tile_size, self.layers, self.images, self.tile_keys)
 
-            # Create a list of tile for the y-axis
-            y_list = []
+        return tiles, self.collision_map, self.collision_lines_map, self.size
 
-            for y in range(0, self.data.height):
 
-                layer_list = []
+    def compile_collisions(self, collisions):
+        """Converts the collision regions of a tmx map into a set of tile coordinates that
+        the player cannot walk through.
 
-                # Get the number of tile layers.
-                num_of_layers = 0
+        :param collisions: A list of tmx collision objects.
 
-                # PyTMX recently changed some of their attribute names.
-                # This ensures we get the number of layers regardless of
-                # the version of PyTMX.
-                try:
-                    for layer in self.data.layers:
-                        if hasattr(layer, 'data'):
-                            num_of_layers += 1
-                except AttributeError:
-                    for layer in self.data.tilelayers:
-                        num_of_layers += 1
+        :type collisions: List
 
-                # Get all the map tiles for each layer
-                for layer in range(0, num_of_layers):
+        :rtype: Set
+        :returns: A set of (x, y) collision coordinates.
 
-                    # PyTMX recently changed their method names. This
-                    # ensures the map will load regardless of the PyTMX
-                    # version.
-                    try:
-                        surface = self.data.getTileImage(x, y, layer)
-                    except AttributeError:
-                        surface = self.data.get_tile_image(x, y, layer)
-
-                    # Create a tile based on the image
-                    if surface:
-                        tile = {'tile_pos': (x, y),
-                                'position': (x * tile_size[0], y * tile_size[1]),
-                                'layer': layer + 1,
-                                'name': str(x) + "," + str(y),
-                                'surface': surface
-                                }
-
-                        layer_list.append(tile)
-
-                y_list.append(layer_list)
+        **Examples:**
 
-            tiles.append(y_list)
+        >>> map.compile_collisions(collisions)
+        set([(0, 2),
+             (0, 3),
+             (0, 4),
+             (0, 5),
+             (0, 6)])
 
-        # Get the dimensions of the map
-        mapsize = self.size
+        """
 
         # Create a list of all tile positions that we cannot walk through
         collision_map = set()
 
-        # Create a list of all pairs of adjacent tiles that are impassable (aka walls)
-        # example: ((5,4),(5,3), both)
-        collision_lines_map = set()
-
         # Right now our collisions are defined in our tmx file as large regions that the player
         # can't pass through. We need to convert these areas into individual tile coordinates
         # that the player can't pass through.
         # Loop through all of the collision objects in our tmx file.
-        for collision_region in self.collisions:
+        for collision_region in collisions:
 
             # >>> collision_region.__dict__
             #{'gid': 0,
@@ -397,10 +620,36 @@ class Map(object):
                     collision_tile = (a + x, b + y)
                     collision_map.add(collision_tile)
 
+        return collision_map
+
+
+    def compile_collision_lines(self, collision_lines):
+        """Converts the collision lines of a tmx map into a set of (tile, direction) pairs. Each
+        pair means that it is not possible to leave that tile in that direction.
+
+        :param collision_lines: A list of tmx collision-line objects.
+
+        :type collision_lines: List
+
+        :rtype: Set
+        :returns: A set of ((x, y), direction) pairs.
+
+        **Examples:**
+
+        >>> map.compile_collision_lines(collision_lines)
+        set([((5, 4), 'up'),
+             ((5, 3), 'down')])
+
+        """
+
+        # Create a list of all pairs of adjacent tiles that are impassable (aka walls)
+        # example: ((5,4),(5,3), both)
+        collision_lines_map = set()
+
         # Similar to collisions, except we need to identify the tiles
         # on either side of the poly-line and prevent moving between
         # them
-        for collision_line in self.collision_lines:
+        for collision_line in collision_lines:
 
             # >>> collision_wall.__dict__
             # {'name': None,
@@ -495,7 +744,90 @@ class Map(object):
                     collision_lines_map.add((top_side_tile, "down"))
                     collision_lines_map.add((bottom_side_tile, "up"))
 
-        return tiles, collision_map, collision_lines_map, mapsize
+        return collision_lines_map
+
+    def compile_collision_grid(self, size, collision_map, collision_lines_map):
+        """Combines the collision tiles and collision lines of a map into one array of flags
+        with a byte for every tile. See :py:class:`core.components.map.CollisionGrid`.
+
+        Collision tiles and lines outside of the map are left out.
+
+        :param size: The (width, height) of the map in tiles.
+        :param collision_map: A set of (x, y) collision coordinates.
+        :param collision_lines_map: A set of ((x, y), direction) pairs.
+
+        :type size: Tuple
+        :type collision_map: Set
+        :type collision_lines_map: Set
+
+        :rtype: array.array
+        :returns: The collision flags of every tile in row-major order.
+
+        **Examples:**
+
+        >>> map.compile_collision_grid((3, 1), set([(0, 0)]), set([((1, 0), 'right')]))
+        array('B', [1, 16, 0])
+
+        """
+        width, height = size
+        flags = array('B', [0]) * (width * height)
+
+        for x, y in collision_map:
+            if 0 <= x < width and 0 <= y < height:
+                flags[y * width + x] |= COLLISION_BLOCKED
+
+        for (x, y), direction in collision_lines_map:
+            if 0 <= x < width and 0 <= y < height:
+                flags[y * width + x] |= CollisionGrid.directions[direction][2]
+
+        return flags
+
+
+    def compile_event_index(self, size, events):
+        """Sorts the events of a map by the tiles the player has to be on for them to run, so
+        the event engine only has to check the events that can run on the player's tile.
+
+        An event with an "is player_at" condition can only run while the player is inside the
+        area of that condition. Every other event can run anywhere, so it is a global event and
+        it is added to the events of every tile too.
+
+        :param size: The (width, height) of the map in tiles.
+        :param events: The compiled events of the map.
+
+        :type size: Tuple
+        :type events: List
+
+        :rtype: Tuple
+        :returns: A dictionary of event indexes keyed by (x, y) tile position and a list of the
+            indexes of the global events. The indexes are in ascending order, so events are
+            checked in the same order as they are in the map.
+
+        **Examples:**
+
+        >>> map.compile_event_index((3, 1), events)
+        ({(0, 0): [0, 2], (1, 0): [0, 1, 2]}, [2])
+
+        """
+        width, height = size
+        tiles = {}
+        global_events = []
+
+        for i, event in enumerate(events):
+            for cond in event['conds']:
+                if cond['type'] == 'player_at' and cond['operator'] == 'is':
+                    for y in range(max(cond['y'], 0), min(cond['y'] + cond['height'], height)):
+                        for x in range(max(cond['x'], 0), min(cond['x'] + cond['width'], width)):
+                            tiles.setdefault((x, y), []).append(i)
+                    break
+            else:
+                global_events.append(i)
+
+        event_index = {}
+        for tile, indexes in tiles.items():
+            event_index[tile] = sorted(indexes + global_events)
+
+        return event_index, global_events
+
 
     def round_to_divisible(self, x, base=16):
         """Rounds a number to a divisible base. This is used to round collision areas that aren't
@@ -522,6 +854,195 @@ class Map(object):
         return int(base * round(float(x)/base))
 
 
+class TileGrid(object):
+    """A compact grid of all the tiles in a map. Instead of storing an object for every tile
+    placement, the grid stores one array of tile gids per layer and a single lookup table from
+    gid to pygame surface. Memory used by surfaces only grows with the number of unique tiles in
+    a map, not with its area.
+
+    :param size: The (width, height) of the map in tiles.
+    :param tile_size: The [width, height] of a tile in pixels on the screen.
+    :param layers: A list of arrays of tile gids, one per layer, in row-major order. A gid of
+        0 means there is no tile on that layer.
+    :param images: A dictionary of pygame surfaces keyed by gid.
+    :param tile_keys: A dictionary of (tileset, tile id, flags) tuples keyed by gid. These are
+        used to share scaled tiles between maps.
+
+    :type size: Tuple
+    :type tile_size: List
+    :type layers: List
+    :type images: Dictionary
+    :type tile_keys: Dictionary
+
+    **Examples:**
+
+    >>> grid = TileGrid((2, 1), [16, 16], [array('H', [1, 2])], {1: grass, 2: sand}, keys)
+    >>> grid.images[grid.layers[0][0 * grid.width + 1]]
+    <Surface(16x16x32 SW)>
+
+    """
+    def __init__(self, size, tile_size, layers, images, tile_keys):
+        self.width, self.height = size
+        self.tile_size = tile_size
+        self.layers = layers
+        self.tile_keys = tile_keys
+
+        # Index the surfaces by gid in a list so looking up a tile is a single list access.
+        self.images = [None] * (max(images.keys() or [0]) + 1)
+        for gid, surface in images.items():
+            self.images[gid] = surface
+
+
+    def scale(self, tile_size):
+        """Scales every unique tile image in the grid to the given tile size. Scaled tiles are
+        kept in :py:data:`core.components.map.scaled_tiles`, so a tile is only ever scaled once
+        no matter how many maps use it or how often they are loaded.
+
+        :param tile_size: The [width, height] to scale each tile image to.
+
+        :type tile_size: List
+
+        :rtype: None
+        :returns: None
+
+        """
+        self.tile_size = tile_size
+        size = (tile_size[0], tile_size[1])
+
+        hits = 0
+        misses = 0
+        for gid, surface in enumerate(self.images):
+            if not surface:
+                continue
+
+            key = self.tile_keys[gid] + (size,)
+            scaled = scaled_tiles.get(key)
+            if scaled:
+                hits += 1
+            else:
+                misses += 1
+                scaled = pygame.transform.scale(surface, size)
+                scaled_tiles[key] = scaled
+            self.images[gid] = scaled
+
+        logger.debug("Tile scale cache: %d hits, %d misses, %d tiles cached"
+                     % (hits, misses, len(scaled_tiles)))
+
+
+class CollisionGrid(object):
+    """A grid of collision flags with one byte for every tile of a map. Each byte has a
+    :py:data:`COLLISION_BLOCKED` bit if the tile can't be walked onto, and a wall bit
+    (:py:data:`WALL_UP`, :py:data:`WALL_DOWN`, :py:data:`WALL_LEFT`, :py:data:`WALL_RIGHT`)
+    for every direction the tile can't be left in. Since walls are stored separately on both
+    sides, a wall can also be made passable in one direction only.
+
+    On top of these static flags, the grid keeps count of the characters standing on (or moving
+    onto) each tile. Characters mark tiles with :py:func:`occupy` and unmark them with
+    :py:func:`vacate` as they move, so checking for other characters doesn't need to look at
+    every NPC.
+
+    Tiles outside of the map never collide.
+
+    :param size: The (width, height) of the map in tiles.
+    :param flags: The collision flags of every tile in row-major order.
+
+    :type size: Tuple
+    :type flags: array.array
+
+    **Examples:**
+
+    >>> grid = CollisionGrid((3, 1), array('B', [1, 16, 0]))
+    >>> grid.is_blocked((1, 0), "left")
+    True
+    >>> grid.is_blocked((1, 0), "right")
+    True
+    >>> grid.is_blocked((2, 0), "left")
+    False
+    >>> grid.occupy((0, 0))
+    >>> grid.is_blocked((1, 0), "left", occupied=True)
+    True
+
+    """
+    # The (x, y) offset of the neighbouring tile and the wall bit for each direction.
+    directions = {"up": (0, -1, WALL_UP),
+                  "down": (0, 1, WALL_DOWN),
+                  "left": (-1, 0, WALL_LEFT),
+                  "right": (1, 0, WALL_RIGHT)}
+
+    def __init__(self, size, flags):
+        self.width, self.height = size
+        self.flags = flags
+
+        # The number of characters on each tile.
+        self.occupied = array('B', [0]) * len(flags)
+
+
+    def is_blocked(self, tile_pos, direction, occupied=False):
+        """Checks if moving one tile from a tile position in a direction is blocked, either by a
+        wall or because the tile in that direction can't be walked onto.
+
+        :param tile_pos: The (x, y) tile position to move from. Must be integers.
+        :param direction: The direction to move in: "up", "down", "left" or "right".
+        :param occupied: Whether a tile with a character on it blocks the move too.
+
+        :type tile_pos: Tuple
+        :type direction: String
+        :type occupied: Boolean
+
+        :rtype: Boolean
+        :returns: True if the move is blocked.
+
+        """
+        x, y = tile_pos
+        dx, dy, wall = self.directions[direction]
+        width = self.width
+        height = self.height
+
+        if 0 <= x < width and 0 <= y < height and self.flags[y * width + x] & wall:
+            return True
+
+        x += dx
+        y += dy
+        if 0 <= x < width and 0 <= y < height:
+            index = y * width + x
+            return bool(self.flags[index] & COLLISION_BLOCKED
+                        or (occupied and self.occupied[index]))
+
+        return False
+
+
+    def occupy(self, tile_pos):
+        """Marks a tile as having a character on it.
+
+        :param tile_pos: The (x, y) tile position. Must be integers.
+
+        :type tile_pos: Tuple
+
+        :rtype: None
+        :returns: None
+
+        """
+        x, y = tile_pos
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.occupied[y * self.width + x] += 1
+
+
+    def vacate(self, tile_pos):
+        """Unmarks a tile that was marked with :py:func:`occupy`.
+
+        :param tile_pos: The (x, y) tile position. Must be integers.
+
+        :type tile_pos: Tuple
+
+        :rtype: None
+        :returns: None
+
+        """
+        x, y = tile_pos
+        if 0 <= x < self.width and 0 <= y < self.height and self.occupied[y * self.width + x]:
+            self.occupied[y * self.width + x] -= 1
+
+
 class Tile(object):
     """A class to create tile objects. Tile objects are used to keep track of tile properties such
     as the layer it's on, its position, surface, and other properties.
@@ -145,12 +145,17 @@ class Menu(UserInterface):
         self.native_resolution = [240, 160]
 
 
-        # Font shit for drawing text
+        # Font shit for drawing text. The minimum font size and the line spacing are sizes on the
+        # display, so they are divided by the display scale when rendering at native resolution.
         self.font_size = 4
-        self.min_font_size = 7
-        self.font = pygame.font.Font(prepare.BASEDIR + "resources/font/PressStart2P.ttf", self.font_size)
+        self.min_font_size = max(int(round(7. / prepare.DISPLAY_SCALE)), 1)
+        self.font_path = prepare.BASEDIR + "resources/font/PressStart2P.ttf"
+        self.font = pygame.font.Font(self.font_path, self.font_size)
         self.font_color = (10, 10, 10)
-        self.line_spacing = 10
+        self.line_spacing = int(round(10. / prepare.DISPLAY_SCALE))
+
+        # Fonts used to draw text at the display's resolution, keyed by path and size.
+        self.display_fonts = {}
 
         self.border = {
            'left':pygame.image.load(prepare.BASEDIR + "resources/gfx/menu-left.png").convert_alpha(),
@@ -351,6 +356,12 @@ class Menu(UserInterface):
 
         """
 
+        # Erase any text drawn under the window at the display's resolution.
+        if prepare.TEXT_LAYER is not None and self.screen is prepare.SCREEN:
+            scale = prepare.DISPLAY_SCALE
+            prepare.TEXT_LAYER.fill((0, 0, 0, 0), (self.pos_x * scale, self.pos_y * scale,
+                                                   self.size_x * scale, self.size_y * scale))
+
         # Draw the background box
         if fill_background:
             # If a background image was specified, draw that. Otherwise, fill it in with the menu
@@ -439,13 +450,17 @@ class Menu(UserInterface):
 
         # Set up our font that we're going to use, including size, color, etc.
         font = self.font
+        font_path = self.font_path
 
         # If font_size was specified, we need to create a new font object
         if font_size:
             font_size *= self.scale    # Scale the font if graphic scaling is enabled
             if font_size < self.min_font_size:
                 font_size = self.min_font_size
-            font = pygame.font.Font(prepare.BASEDIR + "resources/font/PressStart2P.ttf", font_size)
+            font_path = prepare.BASEDIR + "resources/font/PressStart2P.ttf"
+            font = pygame.font.Font(font_path, font_size)
+        else:
+            font_size = self.font_size
 
         # If a font color wasn't specified, use the menu's font color
         if not font_color:
@@ -535,7 +550,8 @@ class Menu(UserInterface):
         for item in lines:
             line = font.render(item, 1, self.font_color)
 
-            self.screen.blit(line, (pos_x, pos_y + spacing))
+            self.blit_text(line, item, font_path, font_size, self.font_color,
+                           (pos_x, pos_y + spacing))
             spacing += line.get_height() + self.line_spacing
 
 
@@ -713,6 +729,41 @@ class Menu(UserInterface):
                 self.background, (self.size_x, self.size_y))
 
 
+    def blit_text(self, line, text, font_path, font_size, color, position):
+        """Blits a rendered line of text to the screen. When the game is rendered at native
+        resolution the text is rendered again at the display's resolution and drawn to the text
+        layer instead, so that small font sizes stay readable.
+
+        :param line: The text rendered at the screen's resolution.
+        :param text: The text that was rendered.
+        :param font_path: Path to the typeface file (.ttf) the text was rendered with.
+        :param font_size: The font size in pixels the text was rendered with.
+        :param color: A tuple of the RGB color values the text was rendered with.
+        :param position: The (x, y) position on the screen to draw the text at.
+
+        :type line: pygame.Surface
+        :type text: String
+        :type font_path: String
+        :type font_size: Integer
+        :type color: Tuple
+        :type position: Tuple
+
+        :rtype: None
+        :returns: None
+
+        """
+        if prepare.TEXT_LAYER is None or self.screen is not prepare.SCREEN:
+            self.screen.blit(line, position)
+            return
+
+        scale = prepare.DISPLAY_SCALE
+        key = (font_path, font_size)
+        if key not in self.display_fonts:
+            self.display_fonts[key] = pygame.font.Font(font_path, font_size * scale)
+        line = self.display_fonts[key].render(text, 1, color)
+        prepare.TEXT_LAYER.blit(line, (int(position[0] * scale), int(position[1] * scale)))
+
+
     def set_font(self, size=14, font="resources/font/PressStart2P.ttf", color=(10, 10, 10), spacing=10):
         """Set the font properties that the menu uses including font color, size, typeface,
         and line spacing.
@@ -746,6 +797,7 @@ class Menu(UserInterface):
         if size < self.min_font_size:
             size = self.min_font_size
         self.font_size = size
+        self.font_path = font
         self.font = pygame.font.Font(font, self.font_size)
         self.font_color = color
         self.line_spacing = spacing
@@ -832,6 +884,10 @@ class Menu(UserInterface):
 
         current_surface_list = []
 
+        # Keep track of the text of each surface so it can be drawn again at the display's
+        # resolution.
+        surface_texts = {}
+
         # Now we loop through each row
         for list in text_lists:
 
@@ -839,7 +895,9 @@ class Menu(UserInterface):
             for item in list:
                 # Create a surface from the supplied word so we can draw it to the screen and
                 # append it to the surface list.
-                current_surface_list.append(self.font.render(item, 1, self.font_color))
+                surface = self.font.render(item, 1, self.font_color)
+                surface_texts[surface] = item
+                current_surface_list.append(surface)
 
             text_surfaceList.append(current_surface_list)
             current_surface_list = []
@@ -951,7 +1009,8 @@ class Menu(UserInterface):
                     icon_width = self.menu_icons[item_num].get_width()
                     icon_height = self.menu_icons[item_num].get_height()
 
-                self.screen.blit(item,
+                self.blit_text(item, surface_texts[item], self.font_path, self.font_size,
+                    self.font_color,
                     ((self.pos_x + pos_x + (self.menudis_x) + (icon_width / 2)),
                      (self.pos_y + pos_y + self.menudis_y)))
 
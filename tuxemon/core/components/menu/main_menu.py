@@ -1,5 +1,6 @@
 import pygame
 from core import prepare
+from core.components import assets
 from core.components.menu import Menu
 
 # Import the android mixer if on the android platform
@@ -34,8 +35,8 @@ class MainMenu(Menu):
         #    icon_surface = pygame.transform.scale(icon_surface, (icon_surface.get_width() * prepare.SCALE, icon_surface.get_height() * prepare.SCALE))
         #    self.menu_icons.append(icon_surface)
 
-        self.menu_select_sound = mixer.Sound(
-            prepare.BASEDIR + "resources/sounds/interface/50561__broumbroum__sf3-sfx-menu-select.ogg")
+        self.menu_select_sound = assets.sounds.load(
+            "interface/50561__broumbroum__sf3-sfx-menu-select.ogg")
 
 
     def get_event(self, event, game=None):
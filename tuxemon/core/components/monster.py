@@ -31,12 +31,12 @@
 
 import logging
 import pygame
-import os
 import sys
 import pprint
 import random
 from core import prepare
 from . import pyganim
+from . import assets
 from . import db
 from . import fusion
 
@@ -45,10 +45,27 @@ logger = logging.getLogger(__name__)
 logger.debug("components.monster successfully imported")
 
 # Load the monster database
-monsters = db.JSONDatabase()
+monsters = db.database
 monsters.load("monster")
 monsters.load("technique")
 
+# The definitions of monsters and techniques that haven't been loaded from the database.
+blank_monster = db.MonsterDefinition(
+    id=0, name="", hp=0, attack=0, defense=0, speed=0, special_attack=0, special_defense=0,
+    hp_modifier=(0, 0, 0), attack_modifier=(0, 0, 0), defense_modifier=(0, 0, 0),
+    speed_modifier=(0, 0, 0), special_attack_modifier=(0, 0, 0),
+    special_defense_modifier=(0, 0, 0), experience_give_modifier=0,
+    experience_required_modifier=0, types=("Normal",), weight=0, moveset=(), sprites=None)
+blank_technique = db.TechniqueDefinition(
+    id=0, name="Pound", category="attack", types=("Normal",), power=1, effects=(),
+    animation=None, sfx=None)
+
+# The techniques that monsters learn, shared between all the monsters that know them, and the
+# templates new monsters of each species are created from, both by id. See get_technique and
+# get_template.
+techniques = {}
+templates = {}
+
 
 # class definition for first active tuxemon to use in combat:
 class Monster(object):
@@ -59,36 +76,34 @@ class Monster(object):
 
     **Example:**
 
+    The stats that change during the game are kept by each monster, while the
+    modifiers, moveset, weight and sprites are read from the monster's shared
+    :py:class:`core.components.db.MonsterDefinition`. Monsters use __slots__ so
+    that large parties and rosters stay small in memory.
+
     >>> bulbatux = Monster()
     >>> bulbatux.load_from_db("Bulbatux")
-    >>> pprint.pprint(bulbatux.__dict__)
-        {'attack': 10,
-         'attack_modifier': [u'1', u'1.1', u'1.2'],
-         'body': <core.components.fusion.Body instance at 0x1607638>,
-         'defense': u'1,1.1,1.2',
-         'defense_modifier': [u'1', u'1.1', u'1.2'],
-         'hp': 30,
-         'hp_modifier': [u'0.9', u'1', u'1.1'],
-         'level': 0,
-         'monster_id': 1,
-         'moves': [<__main__.Technique instance at 0x160b4d0>],
-         'name': u'Bulbatux',
-         'special_attack': 9,
-         'special_attack_modifier': [u'1', u'1.1', u'1.2'],
-         'special_defense': 8,
-         'special_defense_modifier': [u'1', u'1.1', u'1.2'],
-         'speed': 7,
-         'speed_modifier': [u'1', u'1.1', u'1.2'],
-         'status': 'Normal',
-         'type1': u'grass',
-         'type2': u'poison',
-         'experience_give_modifier': 3,
-         'experience_required_modifier': 55}
+    >>> bulbatux.name, bulbatux.hp, bulbatux.type1, bulbatux.type2
+    (u'Bulbatux', 30, u'grass', u'poison')
+    >>> bulbatux.hp_modifier
+    (0.9, 1.0, 1.1)
+    >>> other_bulbatux = Monster()
+    >>> other_bulbatux.load_from_db("Bulbatux")
+    >>> other_bulbatux.definition is bulbatux.definition
+    True
 
     """
+    __slots__ = ("definition", "name", "monster_id", "level", "hp", "current_hp", "attack",
+                 "defense", "speed", "special_attack", "special_defense", "moves",
+                 "experience_give_modifier", "experience_required_modifier",
+                 "total_experience", "type1", "type2", "status", "status_damage",
+                 "status_turn", "state", "sprites", "_body")
 
     def __init__(self):
 
+        # The shared definition of this kind of monster from the database.
+        self.definition = blank_monster
+
         self.name = ""          # The display name of the Tuxemon
         self.monster_id = 0
         self.level = 0
@@ -100,14 +115,7 @@ class Monster(object):
         self.special_attack = 0
         self.special_defense = 0
         self.moves = []         # A list of technique objects. Used in combat.
-        self.moveset = []       # A list of possible technique objects.
-
-        self.hp_modifier = [0,0,0]
-        self.attack_modifier = [0,0,0]
-        self.defense_modifier = [0,0,0]
-        self.speed_modifier = [0,0,0]
-        self.special_attack_modifier = [0,0,0]
-        self.special_defense_modifier = [0,0,0]
+
         self.experience_give_modifier = 0
         self.experience_required_modifier = 0
         self.total_experience = 0
@@ -119,22 +127,53 @@ class Monster(object):
         self.status_damage = 0
         self.status_turn = 0
 
-        self.weight = 0
-
         # The tuxemon's state is used for various animations, etc. For example
         # a tuxemon's state might be "attacking" or "fainting" so we know when
         # to play the animations for those states.
         self.state = ""
 
         # A fusion body object that contains the monster's face and body
-        # sprites, as well as color scheme.
-        self.body = fusion.Body()
+        # sprites, as well as color scheme. It is only created when it is used.
+        self._body = None
 
         # Set up our sprites.
         self.sprites = {}
-        self.front_battle_sprite = ""
-        self.back_battle_sprite  = ""
-        self.menu_sprite = ""
+
+    hp_modifier = db.definition_property("hp_modifier", "The HP gained per level.")
+    attack_modifier = db.definition_property("attack_modifier", "The attack gained per level.")
+    defense_modifier = db.definition_property("defense_modifier", "The defense gained per level.")
+    speed_modifier = db.definition_property("speed_modifier", "The speed gained per level.")
+    special_attack_modifier = db.definition_property("special_attack_modifier",
+                                                     "The special attack gained per level.")
+    special_defense_modifier = db.definition_property("special_defense_modifier",
+                                                      "The special defense gained per level.")
+    moveset = db.definition_property("moveset", "The (level learned, technique id) pairs of the "
+                                                "techniques the monster can learn.")
+    weight = db.definition_property("weight", "The weight of the monster.")
+
+    @property
+    def body(self):
+        if self._body is None:
+            self._body = fusion.Body()
+        return self._body
+
+    @property
+    def front_battle_sprite(self):
+        if self.definition.sprites:
+            return prepare.BASEDIR + self.definition.sprites[0]
+        return ""
+
+    @property
+    def back_battle_sprite(self):
+        if self.definition.sprites:
+            return prepare.BASEDIR + self.definition.sprites[1]
+        return ""
+
+    @property
+    def menu_sprite(self):
+        if self.definition.sprites:
+            return prepare.BASEDIR + self.definition.sprites[2]
+        return ""
 
 
     def load_from_db(self, name):
@@ -157,46 +196,41 @@ class Monster(object):
         """
 
         # Look up the monster by name and set the attributes in this instance
-        results = monsters.lookup(name)
-
-        self.name               = results["name"]
-        self.monster_id         = results["id"]
-        self.hp                 = results["hp_base"]
-        self.current_hp         = results["hp_base"]
-        self.attack             = results["attack_base"]
-        self.defense            = results["defense_base"]
-        self.speed              = results["speed_base"]
-        self.special_attack     = results["special_attack_base"]
-        self.special_defense    = results["special_defense_base"]
-
-        self.hp_modifier        = results["hp_mod"]
-        self.attack_modifier    = results["attack_mod"]
-        self.defense_modifier   = results["defense_mod"]
-        self.speed_modifier     = results["speed_mod"]
-        self.special_attack_modifier = results["special_attack_mod"]
-        self.special_defense_modifier = results["special_defense_mod"]
-        self.experience_give_modifier = results["exp_give_mod"]
-        self.experience_required_modifier = results["exp_req_mod"]
-
-        self.type1              = results["types"][0]
-        if len(results["types"]) > 1:
-            self.type2          = results["types"][1]
-        else:
-            self.type2          = None
-
-        self.weight             = results['weight']
-
-        # Look up the moves that this monster can learn AND LEARN THEM.
-        for move in results["moveset"]:
-            self.moveset.append(move)
-            if move['level_learned'] >= self.level:
-                technique = Technique(id=move['technique_id'])
-                self.learn(technique)
-
-        # Look up the monster's sprite image paths
-        self.front_battle_sprite = prepare.BASEDIR + results['sprites']['battle1']
-        self.back_battle_sprite = prepare.BASEDIR + results['sprites']['battle2']
-        self.menu_sprite = prepare.BASEDIR + results['sprites']['menu1']
+        self.load_definition(monsters.lookup_definition(name))
+
+
+    def load_definition(self, definition):
+        """Sets this monster's attributes from a monster definition that was already looked up
+        in the database.
+
+        :param definition: The definition of the monster.
+
+        :type definition: core.components.db.MonsterDefinition
+
+        :rtype: None
+        :returns: None
+
+        **Examples:**
+
+        >>> bulbatux = Monster()
+        >>> bulbatux.load_definition(monsters.lookup_definition("Bulbatux"))
+
+        """
+
+        template = get_template(definition)
+
+        (self.definition, self.name, self.monster_id, self.hp, self.current_hp, self.attack,
+         self.defense, self.speed, self.special_attack, self.special_defense,
+         self.experience_give_modifier, self.experience_required_modifier,
+         self.type1, self.type2, moves) = template
+
+        # Look up the moves that this monster can learn AND LEARN THEM. The template has the
+        # moves of a monster that hasn't got a level yet.
+        if self.level:
+            moves = [get_technique(technique_id)
+                     for level_learned, technique_id in definition.moveset
+                     if level_learned >= self.level]
+        self.moves.extend(moves)
 
 
     def load_sprite_from_db(self):
@@ -210,12 +244,8 @@ class Monster(object):
 
         """
 
-        # Look up the monster's sprite image paths
-        results = monsters.lookup_sprite(self.monster_id)
-
-        self.front_battle_sprite = results["sprite_battle1"]
-        self.back_battle_sprite = results["sprite_battle2"]
-        self.menu_sprite = results["sprite_menu1"]
+        # The sprite image paths come from the monster's definition.
+        self.definition = monsters.lookup_definition(self.monster_id)
 
 
     def learn(self, technique):
@@ -278,11 +308,10 @@ class Monster(object):
         self.special_defense += random.choice(self.special_defense_modifier)
 
         #Learn New Moves
-        for move in self.moveset:
-            if move['level_learned'] >= self.level:
-                logger.info("%s learned technique id %i!" % (self.name, move['technique_id']))
-                technique = Technique(id=move['technique_id'])
-                self.learn(technique)
+        for level_learned, technique_id in self.moveset:
+            if level_learned >= self.level:
+                logger.info("%s learned technique id %i!" % (self.name, technique_id))
+                self.learn(get_technique(technique_id))
 
     def set_level(self, level=5):
         """Sets the Monster's level to the specified arbitrary level,
@@ -320,13 +349,9 @@ class Monster(object):
         if len(self.sprites):
             return True
 
-        self.sprites["front"] = pygame.image.load(self.front_battle_sprite).convert_alpha()
-        self.sprites["back"] = pygame.image.load(self.back_battle_sprite).convert_alpha()
-        self.sprites["menu"] = pygame.image.load(self.menu_sprite).convert_alpha()
-
-        for key, value in self.sprites.items():
-            self.sprites[key] = pygame.transform.scale(value, (value.get_width() * scale,
-                                                               value.get_height() * scale))
+        self.sprites["front"] = assets.surfaces.load(self.front_battle_sprite, scale)
+        self.sprites["back"] = assets.surfaces.load(self.back_battle_sprite, scale)
+        self.sprites["menu"] = assets.surfaces.load(self.menu_sprite, scale)
 
         return False
 
@@ -337,32 +362,45 @@ class Technique(object):
 
     **Example:**
 
+    Apart from its animation images and sound effect, which are found in the
+    asset catalogue when it is loaded, a technique's attributes are read from its shared
+    :py:class:`core.components.db.TechniqueDefinition`. Techniques don't
+    change once they are loaded, so monsters share them; see
+    :py:func:`get_technique`.
+
     >>> poison_tech = Technique("Poison Sting")
-    >>> pprint.pprint(poison_tech.__dict__)
-        {'category': u'special',
-         'effect': [u'poison', u'damage'],
-         'name': u'Poison Sting',
-         'power': 40,
-         'tech_id': 2,
-         'type1': u'Poison',
-         'type2': None}
+    >>> poison_tech.name, poison_tech.category, poison_tech.power, poison_tech.effect
+    (u'Poison Sting', u'special', 40, (u'poison', u'damage'))
 
     """
+    __slots__ = ("definition", "images", "sfx")
 
     def __init__(self, name=None, id=None):
 
-        self.name = "Pound"
-        self.tech_id = 0
-        self.category = "attack"
-        self.type1 = "Normal"
-        self.type2 = None
-        self.power = 1
-        self.effect = []
+        # The shared definition of this technique from the database.
+        self.definition = blank_technique
+        self.images = ()        # The paths of the technique's animation images.
+        self.sfx = None         # The name of the technique's sound effect.
 
         # If a name of the technique was provided, autoload it.
         if name or id:
             self.load(name, id)
 
+    name = db.definition_property("name", "The name of the technique.")
+    tech_id = db.definition_property("id", "The id of the technique.")
+    category = db.definition_property("category", "Whether the technique is physical or special.")
+    power = db.definition_property("power", "The power of the technique.")
+    effect = db.definition_property("effects", "The names of the technique's effect methods.")
+    animation = db.definition_property("animation", "The name of the technique's animation.")
+
+    @property
+    def type1(self):
+        return self.definition.types[0]
+
+    @property
+    def type2(self):
+        if len(self.definition.types) > 1:
+            return self.definition.types[1]
 
     def load(self, name, id):
         """Loads and sets this technique's attributes from the technique
@@ -385,35 +423,15 @@ class Technique(object):
         """
 
         if name:
-            results = monsters.lookup(name, table="technique")
+            self.definition = monsters.lookup_definition(name, table="technique")
         elif id:
-            results = monsters.database['technique'][id]
-
-        self.name = results["name"]
-        self.tech_id = results["id"]
-        self.category = results["category"]
-
-        self.type1 = results["types"][0]
-        if len(results['types']) > 1:
-            self.type2 = results["types"][1]
-        else:
-            self.type2 = None
-
-        self.power = results["power"]
-        self.effect = results["effects"]
+            self.definition = monsters.definitions['technique'][id]
 
-        # Load the animation sprites that will be used for this technique
-        self.animation = results["animation"]
-        self.images = []
-        animation_dir = prepare.BASEDIR + "resources/animations/technique/"
-        directory = sorted(os.listdir(animation_dir))
-        for image in directory:
-            if self.animation and image.startswith(self.animation):
-                self.images.append(animation_dir + image)
-
-        # Load the sound effect for this technique
-        sfx_directory = prepare.BASEDIR + "resources/sounds/technique/"
-        self.sfx = sfx_directory + results["sfx"]
+        # Find the animation sprites of this technique in the asset catalogue. The sound effect
+        # is played from core.components.assets.sounds by name.
+        self.images = assets.catalogue.animation("technique", self.definition.animation)
+        if self.definition.sfx:
+            self.sfx = "technique/" + self.definition.sfx
 
 
     def use(self, user, target):
@@ -507,18 +525,71 @@ class Technique(object):
                 target.status_turn = 0
             target.status_damage = self.power
 
+def get_technique(id):
+    """Gets the shared technique with an id, loading it the first time.
+
+    :param id: The id of the technique.
+
+    :type id: Integer
+
+    :rtype: core.components.monster.Technique
+    :returns: The technique.
+
+    **Examples:**
+
+    >>> get_technique(1) is get_technique(1)
+    True
+
+    """
+    technique = techniques.get(id)
+    if technique is None:
+        technique = techniques[id] = Technique(id=id)
+
+    return technique
+
+
+def get_template(definition):
+    """Gets the template that new monsters of a species are created from, making it the first
+    time. The template holds the attributes :py:func:`Monster.load_definition` sets, in the
+    order it sets them, ending with the techniques the monster knows before it has a level.
+
+    :param definition: The definition of the species.
+
+    :type definition: core.components.db.MonsterDefinition
+
+    :rtype: Tuple
+    :returns: The template.
+
+    """
+    template = templates.get(definition.id)
+    if template is None or template[0] is not definition:
+        types = definition.types
+        moves = tuple(get_technique(technique_id)
+                      for level_learned, technique_id in definition.moveset
+                      if level_learned >= 0)
+        template = (definition, definition.name, definition.id, definition.hp, definition.hp,
+                    definition.attack, definition.defense, definition.speed,
+                    definition.special_attack, definition.special_defense,
+                    definition.experience_give_modifier,
+                    definition.experience_required_modifier,
+                    types[0], types[1] if len(types) > 1 else None, moves)
+        templates[definition.id] = template
+
+    return template
+
+
 if __name__ == "__main__":
     mytuxemon = Monster()
-    mytuxemon.load_from_db("Bulbatux")
+    mytuxemon.load_from_db("Bolt")
     mytuxemon.level = 5
     othertux = Monster()
-    othertux.load_from_db("Bulbatux")
+    othertux.load_from_db("Bolt")
     othertux.level = 5
 
     pound_tech = Technique("Pound")
     poison_tech = Technique("Poison Sting")
 
-    pprint.pprint(poison_tech.__dict__)
+    pprint.pprint(poison_tech.definition._asdict())
 
     #pound_tech.load("Pound")
 
@@ -531,7 +602,7 @@ if __name__ == "__main__":
 
     print ""
     print "MyTux"
-    pprint.pprint(mytuxemon.__dict__)
+    pprint.pprint(dict((slot, getattr(mytuxemon, slot, None)) for slot in Monster.__slots__))
     print ""
     print "OtherTux"
-    pprint.pprint(othertux.__dict__)
+    pprint.pprint(dict((slot, getattr(othertux, slot, None)) for slot in Monster.__slots__))
@@ -0,0 +1,672 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# core.components.pathfinding Finds paths between tiles on a map.
+#
+#
+
+import heapq
+import logging
+import threading
+import Queue
+from array import array
+from collections import OrderedDict, deque
+
+from core.components.map import COLLISION_BLOCKED, WALL_UP, WALL_DOWN, WALL_LEFT, WALL_RIGHT
+from core.components.map import CollisionGrid
+
+# Create a logger for optional handling of debug messages.
+logger = logging.getLogger(__name__)
+logger.debug("components.pathfinding successfully imported")
+
+
+def find_path(collision_grid, start, dest, max_nodes=None, occupied=False):
+    """Finds the shortest path between two tiles with an A* search. Moves are one tile up,
+    down, left or right, and a move is possible if the collision grid doesn't block it. The
+    search stays inside the map. Characters standing in the way are only avoided if occupied is
+    True, since they will usually have moved by the time the path gets there.
+
+    :param collision_grid: The collision grid of the map to search.
+    :param start: The (x, y) tile position to start from. Must be integers.
+    :param dest: The (x, y) tile position to go to. Must be integers.
+    :param max_nodes: The maximum number of tiles to expand before giving up, or None to
+        search until the whole reachable part of the map has been searched.
+    :param occupied: Whether tiles with a character on them are avoided.
+
+    :type collision_grid: core.components.map.CollisionGrid
+    :type start: Tuple
+    :type dest: Tuple
+    :type max_nodes: Integer
+    :type occupied: Boolean
+
+    :rtype: List or None
+    :returns: The tiles to walk along in reverse order, ending with the tile next to the start
+        tile, so the next step can be taken with path.pop(). The path is empty if the start is
+        the destination. None if there is no path, or if none was found within max_nodes.
+
+    **Examples:**
+
+    >>> find_path(world.collision_grid, (1, 1), (3, 2))
+    [(3, 2), (3, 1), (2, 1)]
+
+    """
+    width = collision_grid.width
+    height = collision_grid.height
+    flags = collision_grid.flags
+    characters = collision_grid.occupied
+
+    start_x, start_y = start
+    dest_x, dest_y = dest
+    if not (0 <= start_x < width and 0 <= start_y < height
+            and 0 <= dest_x < width and 0 <= dest_y < height):
+        logger.debug("Path from %s to %s leaves the map" % (str(start), str(dest)))
+        return None
+
+    start_index = start_y * width + start_x
+    dest_index = dest_y * width + dest_x
+
+    # The tile each tile seen so far was reached from, and the number of moves it took to get
+    # there. Tiles are stored by their index in the grid.
+    came_from = {start_index: None}
+    cost = {start_index: 0}
+
+    # The open tiles ordered by their estimated total cost. The distance left to the
+    # destination breaks ties, so tiles closer to the destination are tried first.
+    distance = abs(dest_x - start_x) + abs(dest_y - start_y)
+    queue = [(distance, distance, start_index)]
+    closed = set()
+
+    expanded = 0
+    while queue:
+        estimate, remaining, index = heapq.heappop(queue)
+        if index in closed:
+            continue
+
+        if index == dest_index:
+            path = []
+            while index != start_index:
+                path.append((index % width, index // width))
+                index = came_from[index]
+            logger.debug("Found a path from %s to %s after expanding %d tiles"
+                         % (str(start), str(dest), expanded))
+            return path
+
+        expanded += 1
+        if max_nodes is not None and expanded > max_nodes:
+            logger.debug("Gave up looking for a path from %s to %s after expanding %d tiles"
+                         % (str(start), str(dest), max_nodes))
+            return None
+
+        closed.add(index)
+        tile_flags = flags[index]
+        next_cost = cost[index] + 1
+        x = index % width
+        y = index // width
+
+        # The neighbouring tile, its position and whether the move stays on the map and
+        # doesn't cross a wall, for each direction.
+        for neighbour, neighbour_x, neighbour_y, possible in (
+                (index - width, x, y - 1, y > 0 and not tile_flags & WALL_UP),
+                (index + width, x, y + 1, y < height - 1 and not tile_flags & WALL_DOWN),
+                (index - 1, x - 1, y, x > 0 and not tile_flags & WALL_LEFT),
+                (index + 1, x + 1, y, x < width - 1 and not tile_flags & WALL_RIGHT)):
+
+            if (not possible or flags[neighbour] & COLLISION_BLOCKED
+                or (occupied and characters[neighbour]) or neighbour in closed):
+                continue
+
+            if next_cost < cost.get(neighbour, next_cost + 1):
+                cost[neighbour] = next_cost
+                came_from[neighbour] = index
+                remaining = abs(dest_x - neighbour_x) + abs(dest_y - neighbour_y)
+                heapq.heappush(queue, (next_cost + remaining, remaining, neighbour))
+
+    logger.debug("No path from %s to %s after expanding %d tiles"
+                 % (str(start), str(dest), expanded))
+    return None
+
+
+def is_occupied(collision_grid, path):
+    """Checks if a character is standing on any tile of a path.
+
+    :param collision_grid: The collision grid of the map the path is on.
+    :param path: The (x, y) tile positions of the path.
+
+    :type collision_grid: core.components.map.CollisionGrid
+    :type path: List
+
+    :rtype: Boolean
+    :returns: True if a tile of the path is occupied.
+
+    """
+    width = collision_grid.width
+    characters = collision_grid.occupied
+    for x, y in path:
+        if characters[y * width + x]:
+            return True
+
+    return False
+
+
+def avoid_characters(collision_grid, path, start, dest, max_nodes=None):
+    """Checks a path that was found without characters in mind, like a cached path, and finds
+    a way around any character standing on it.
+
+    :param collision_grid: The collision grid of the map the path is on.
+    :param path: The path, in the format returned by :py:func:`find_path`.
+    :param start: The (x, y) tile position the path starts from. Must be integers.
+    :param dest: The (x, y) tile position the path goes to. Must be integers.
+    :param max_nodes: The maximum number of tiles to search for a detour before giving up, or
+        None to search the whole map if needed.
+
+    :type collision_grid: core.components.map.CollisionGrid
+    :type path: List
+    :type start: Tuple
+    :type dest: Tuple
+    :type max_nodes: Integer
+
+    :rtype: List
+    :returns: A new list with the detour, or with the path itself if nobody is in the way or
+        there is no way around them.
+
+    """
+    if is_occupied(collision_grid, path):
+        detour = find_path(collision_grid, start, dest, max_nodes, occupied=True)
+        if detour is not None:
+            logger.debug("Walking around a character on the path from %s to %s"
+                         % (str(start), str(dest)))
+            return detour
+
+    return list(path)
+
+
+class PathCache(object):
+    """Remembers the paths found on each map, so characters that walk the same route over and
+    over, like NPCs moved by map events, only need to search for it once. The least recently
+    used paths are forgotten once the cache is full.
+
+    Paths are stored with the collision grid they were found on. Loading a map creates a new
+    collision grid, so paths found before the map was (re)loaded are searched for again.
+
+    Cached paths ignore characters, like :py:func:`find_path` does by default. If a character
+    is standing on a cached path when it is used, a way around it is searched for instead. That
+    detour isn't cached, since the character will move away at some point.
+
+    :param size: The maximum number of paths to remember.
+
+    :type size: Integer
+
+    **Examples:**
+
+    >>> cache = PathCache()
+    >>> cache.find_path("route1.tmx", world.collision_grid, (1, 1), (3, 2))
+    [(3, 2), (3, 1), (2, 1)]
+
+    """
+    def __init__(self, size=256):
+        self.size = size
+
+        # The (collision grid, path) of each (map, start, destination), oldest first.
+        self.paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def find_path(self, map_name, collision_grid, start, dest, max_nodes=None):
+        """Looks up the path between two tiles on a map, and finds it with :py:func:`find_path`
+        if it isn't cached.
+
+        :param map_name: The name of the map the path is on.
+        :param collision_grid: The collision grid of the map.
+        :param start: The (x, y) tile position to start from. Must be integers.
+        :param dest: The (x, y) tile position to go to. Must be integers.
+        :param max_nodes: The maximum number of tiles to search before giving up, or None to
+            search the whole map if needed.
+
+        :type map_name: String
+        :type collision_grid: core.components.map.CollisionGrid
+        :type start: Tuple
+        :type dest: Tuple
+        :type max_nodes: Integer
+
+        :rtype: List or None
+        :returns: A new list with the path, in the same format as :py:func:`find_path`. None
+            if no path was found.
+
+        """
+        path = self.lookup(map_name, collision_grid, start, dest)
+        if path is None:
+            path = find_path(collision_grid, start, dest, max_nodes)
+            if path is None:
+                return None
+            self.store(map_name, collision_grid, start, dest, path)
+
+        return avoid_characters(collision_grid, path, start, dest, max_nodes)
+
+
+    def lookup(self, map_name, collision_grid, start, dest):
+        """Returns the cached path between two tiles, without checking for characters in the
+        way.
+
+        :param map_name: The name of the map the path is on.
+        :param collision_grid: The collision grid of the map.
+        :param start: The (x, y) tile position to start from.
+        :param dest: The (x, y) tile position to go to.
+
+        :type map_name: String
+        :type collision_grid: core.components.map.CollisionGrid
+        :type start: Tuple
+        :type dest: Tuple
+
+        :rtype: List or None
+        :returns: A new list with the path, or None if it isn't cached.
+
+        """
+        key = (map_name, start, dest)
+        entry = self.paths.pop(key, None)
+        if not entry or entry[0] is not collision_grid:
+            self.misses += 1
+            return None
+
+        # Move the path to the end, so it is the last one to be forgotten.
+        self.hits += 1
+        self.paths[key] = entry
+        return list(entry[1])
+
+
+    def store(self, map_name, collision_grid, start, dest, path):
+        """Adds a path to the cache, forgetting the least recently used path if the cache is
+        full.
+
+        :param map_name: The name of the map the path is on.
+        :param collision_grid: The collision grid the path was found on.
+        :param start: The (x, y) tile position the path starts from.
+        :param dest: The (x, y) tile position the path goes to.
+        :param path: The path, in the format returned by :py:func:`find_path`.
+
+        :type map_name: String
+        :type collision_grid: core.components.map.CollisionGrid
+        :type start: Tuple
+        :type dest: Tuple
+        :type path: List
+
+        :rtype: None
+        :returns: None
+
+        """
+        key = (map_name, start, dest)
+        self.paths.pop(key, None)
+        self.paths[key] = (collision_grid, tuple(path))
+        if len(self.paths) > self.size:
+            self.paths.popitem(last=False)
+
+
+    def clear(self):
+        """Forgets all paths.
+
+        :rtype: None
+        :returns: None
+
+        """
+        self.paths.clear()
+
+
+
+class FlowField(object):
+    """A map of the distance from every tile to a goal tile, for moving any number of characters
+    towards the same goal. The distances are found with one breadth first search from the goal,
+    after which the next step of each character is a lookup of its neighbouring tiles.
+
+    The distances are only searched for again when the goal or the collision grid changes.
+    Like :py:func:`find_path`, the search ignores characters, but the next step avoids tiles
+    with a character on them.
+
+    **Examples:**
+
+    >>> field = FlowField()
+    >>> field.next_step(world.collision_grid, (5, 5), (5, 8))
+    'up'
+
+    """
+    # The (x, y) offset of each neighbour of a tile, and the wall bit that stops the neighbour
+    # from moving onto the tile.
+    neighbours = ((0, -1, WALL_DOWN), (0, 1, WALL_UP), (-1, 0, WALL_RIGHT), (1, 0, WALL_LEFT))
+
+    def __init__(self):
+        self.collision_grid = None
+        self.goal = None
+
+        # The number of moves from every tile to the goal in row-major order, or -1 if the goal
+        # can't be reached from the tile.
+        self.distances = None
+
+
+    def update(self, collision_grid, goal):
+        """Searches for the distances to a goal, unless they were already found for that goal
+        on that collision grid.
+
+        :param collision_grid: The collision grid of the map.
+        :param goal: The (x, y) tile position to move towards. Must be integers.
+
+        :type collision_grid: core.components.map.CollisionGrid
+        :type goal: Tuple
+
+        :rtype: None
+        :returns: None
+
+        """
+        if collision_grid is self.collision_grid and goal == self.goal:
+            return
+
+        self.collision_grid = collision_grid
+        self.goal = goal
+
+        width = collision_grid.width
+        height = collision_grid.height
+        flags = collision_grid.flags
+        distances = array('i', [-1]) * (width * height)
+        self.distances = distances
+
+        goal_x, goal_y = goal
+        if not (0 <= goal_x < width and 0 <= goal_y < height):
+            return
+
+        distances[goal_y * width + goal_x] = 0
+        queue = deque([(goal_x, goal_y)])
+        while queue:
+            x, y = queue.popleft()
+            index = y * width + x
+            distance = distances[index] + 1
+
+            # Nothing can move onto a blocked tile, unless it is the goal.
+            if distance > 1 and flags[index] & COLLISION_BLOCKED:
+                continue
+
+            # Find the neighbours that can move onto this tile.
+            for dx, dy, wall in self.neighbours:
+                neighbour_x = x + dx
+                neighbour_y = y + dy
+                if not (0 <= neighbour_x < width and 0 <= neighbour_y < height):
+                    continue
+
+                neighbour = neighbour_y * width + neighbour_x
+                if distances[neighbour] == -1 and not flags[neighbour] & wall:
+                    distances[neighbour] = distance
+                    queue.append((neighbour_x, neighbour_y))
+
+        logger.debug("Found the distances to %s" % str(goal))
+
+
+    def distance(self, tile):
+        """Returns the number of moves from a tile to the goal, or -1 if the goal can't be
+        reached from it. :py:func:`update` has to be called first.
+
+        :param tile: The (x, y) tile position. Must be integers.
+
+        :type tile: Tuple
+
+        :rtype: Integer
+        :returns: The distance to the goal.
+
+        """
+        x, y = tile
+        grid = self.collision_grid
+        if 0 <= x < grid.width and 0 <= y < grid.height:
+            return self.distances[y * grid.width + x]
+
+        return -1
+
+
+    def next_step(self, collision_grid, goal, tile):
+        """Finds the direction to move in from a tile to get closer to a goal.
+
+        :param collision_grid: The collision grid of the map.
+        :param goal: The (x, y) tile position to move towards. Must be integers.
+        :param tile: The (x, y) tile position to move from. Must be integers.
+
+        :type collision_grid: core.components.map.CollisionGrid
+        :type goal: Tuple
+        :type tile: Tuple
+
+        :rtype: String or None
+        :returns: "up", "down", "left" or "right", or None if the tile is the goal, the goal
+            can't be reached or characters are in the way.
+
+        """
+        self.update(collision_grid, goal)
+
+        best = None
+        best_distance = self.distance(tile)
+        for direction, (dx, dy, wall) in CollisionGrid.directions.items():
+            if collision_grid.is_blocked(tile, direction, occupied=True):
+                continue
+
+            distance = self.distance((tile[0] + dx, tile[1] + dy))
+            if 0 <= distance < best_distance:
+                best = direction
+                best_distance = distance
+
+        return best
+
+
+
+class PathRequest(object):
+    """A handle for a path that is being searched for by a :py:class:`PathfindingWorker`.
+
+    :param map_name: The name of the map to search.
+    :param collision_grid: The collision grid of the map.
+    :param start: The (x, y) tile position to start from.
+    :param dest: The (x, y) tile position to go to.
+    :param max_nodes: The maximum number of tiles to search, or None.
+    :param generation: The generation of the worker the request was submitted in.
+
+    :type map_name: String
+    :type collision_grid: core.components.map.CollisionGrid
+    :type start: Tuple
+    :type dest: Tuple
+    :type max_nodes: Integer
+    :type generation: Integer
+
+    """
+    def __init__(self, map_name, collision_grid, start, dest, max_nodes, generation):
+        self.map_name = map_name
+        self.collision_grid = collision_grid
+        self.start = start
+        self.dest = dest
+        self.max_nodes = max_nodes
+        self.generation = generation
+
+        self.path = None
+        self.cancelled = False
+        self.finished = threading.Event()
+
+        # Whether the path came from the path cache rather than a search. A detour around
+        # characters on a cached path must not be cached in its place.
+        self.cached = False
+
+
+    def done(self):
+        """Checks if the search has finished or was cancelled.
+
+        :rtype: Boolean
+        :returns: True if the result is ready.
+
+        """
+        return self.finished.is_set()
+
+
+    def result(self, timeout=None):
+        """Waits for the search to finish and returns the path.
+
+        :param timeout: The maximum number of seconds to wait, or None to wait until the search
+            has finished.
+
+        :type timeout: Float
+
+        :rtype: List or None
+        :returns: The path, in the format returned by :py:func:`find_path`. None if no path was
+            found, the search was cancelled or it didn't finish in time.
+
+        """
+        self.finished.wait(timeout)
+        return self.path
+
+
+    def cancel(self):
+        """Discards the result of the search. A search that hasn't started yet is skipped.
+
+        :rtype: None
+        :returns: None
+
+        """
+        self.cancelled = True
+        self.path = None
+        self.finished.set()
+
+
+class PathfindingWorker(object):
+    """Searches for paths on a background thread, so a long search doesn't hold up a frame.
+    Requests are searched for one at a time in the order they were submitted.
+
+    The worker only reads the collision flags of a map, which never change after the map is
+    loaded, so the thread can search them while the game keeps running. Loading a map should
+    call :py:func:`cancel_all`, so searches on the previous map are dropped.
+
+    **Examples:**
+
+    >>> request = worker.submit("route1.tmx", world.collision_grid, (1, 1), (3, 2))
+    >>> request.result()
+    [(3, 2), (3, 1), (2, 1)]
+
+    """
+    def __init__(self):
+        self.requests = Queue.Queue()
+        self.thread = None
+
+        # Requests submitted before the last call to cancel_all have an older generation.
+        self.generation = 0
+
+
+    def submit(self, map_name, collision_grid, start, dest, max_nodes=None):
+        """Queues a path to be searched for. Cached paths are returned right away, with a
+        detour around any character standing on them.
+
+        :param map_name: The name of the map to search.
+        :param collision_grid: The collision grid of the map.
+        :param start: The (x, y) tile position to start from. Must be integers.
+        :param dest: The (x, y) tile position to go to. Must be integers.
+        :param max_nodes: The maximum number of tiles to search before giving up, or None to
+            search the whole map if needed.
+
+        :type map_name: String
+        :type collision_grid: core.components.map.CollisionGrid
+        :type start: Tuple
+        :type dest: Tuple
+        :type max_nodes: Integer
+
+        :rtype: core.components.pathfinding.PathRequest
+        :returns: The request to wait for.
+
+        """
+        request = PathRequest(map_name, collision_grid, start, dest, max_nodes, self.generation)
+
+        path = path_cache.lookup(map_name, collision_grid, start, dest)
+        if path is not None:
+            request.path = avoid_characters(collision_grid, path, start, dest, max_nodes)
+            request.cached = True
+            request.finished.set()
+            return request
+
+        if not self.thread:
+            self.thread = threading.Thread(target=self.run, name="pathfinding")
+            self.thread.daemon = True
+            self.thread.start()
+
+        self.requests.put(request)
+        return request
+
+
+    def cancel_all(self):
+        """Cancels every request that has been submitted so far.
+
+        :rtype: None
+        :returns: None
+
+        """
+        self.generation += 1
+
+
+    def collect(self, request, collision_grid):
+        """Returns the path of a finished request if it is still valid, and caches it. Paths
+        found on a different collision grid than the current one, or by a request that was
+        cancelled, are discarded. Characters may have moved onto the path while it was being
+        searched for, so a detour around them is returned in that case.
+
+        :param request: The finished request.
+        :param collision_grid: The collision grid of the current map.
+
+        :type request: core.components.pathfinding.PathRequest
+        :type collision_grid: core.components.map.CollisionGrid
+
+        :rtype: List or None
+        :returns: The path, or None if there is no valid path.
+
+        """
+        if (request.cancelled or request.generation != self.generation
+            or request.collision_grid is not collision_grid):
+            logger.debug("Discarded the path from %s to %s"
+                         % (str(request.start), str(request.dest)))
+            return None
+
+        if request.path is None:
+            return None
+
+        if not request.cached:
+            path_cache.store(request.map_name, collision_grid, request.start, request.dest,
+                             request.path)
+        return avoid_characters(collision_grid, request.path, request.start, request.dest,
+                                request.max_nodes)
+
+
+    def run(self):
+        """Searches for the queued paths until the game exits."""
+        while True:
+            request = self.requests.get()
+            if request.cancelled or request.generation != self.generation:
+                request.cancel()
+                continue
+
+            request.path = find_path(request.collision_grid, request.start, request.dest,
+                                     request.max_nodes)
+            request.finished.set()
+
+
+# The paths found on every map.
+path_cache = PathCache()
+
+# Searches for paths in the background.
+worker = PathfindingWorker()
@@ -35,6 +35,8 @@ import pprint
 import time
 from core import prepare
 from . import pyganim
+from . import assets
+from . import pathfinding
 from . import ai
 from . import config
 
@@ -71,7 +73,9 @@ class Player(object):
         self.standing = {}
         standing_types = ["front", "back", "left", "right"]
         for standing_type in standing_types:
-            surface = pygame.image.load(prepare.BASEDIR + 'resources/sprites/%s_%s.png' % (sprite_name, standing_type)).convert_alpha()
+            filename = prepare.BASEDIR + 'resources/sprites/%s_%s.png' % (
+                sprite_name, standing_type)
+            surface = assets.surfaces.load(filename)
             surface_top = surface.subsurface((0, 0,
                                               surface.get_width(), int(surface.get_height() / 2)))
             surface_bottom = surface.subsurface((0, int(surface.get_height() / 2),
@@ -103,19 +107,23 @@ class Player(object):
         self.game_variables = {}		# Game variables for use with events
 
         self.path = None
+        self.path_request = None     # The path being searched for in the background
 
         # Load all of the player's sprite animations
         anim_types = ['front_walk', 'back_walk', 'left_walk', 'right_walk']
         for anim_type in anim_types:
-            images_and_durations = [(prepare.BASEDIR + 'resources/sprites/%s_%s.%s.png' % (sprite_name, anim_type, str(num).rjust(3, '0')),
-                                    prepare.CONFIG.player_animation_speed) for num in range(4)]
+            images_and_durations = []
+            for num in range(4):
+                filename = prepare.BASEDIR + 'resources/sprites/%s_%s.%s.png' % (
+                    sprite_name, anim_type, str(num).rjust(3, '0'))
+                images_and_durations.append((assets.surfaces.load(filename),
+                                             prepare.CONFIG.player_animation_speed))
 
             # Loop through all of our animations and get the top and bottom subsurfaces.
             top_frames = []
             bottom_frames = []
             for frame in images_and_durations:
-                # Load the frame image
-                surface = pygame.image.load(frame[0]).convert_alpha()
+                surface = frame[0]
                 top_surface = surface.subsurface((0, 0,
                                                   surface.get_width(), surface.get_height() / 2))
                 bottom_surface = surface.subsurface((0, surface.get_height() / 2,
@@ -161,19 +169,6 @@ class Player(object):
 
         """
 
-        # Create a temporary set of tile coordinates for NPCs. We'll use this to check for
-        # collisions.
-        npc_positions = set()
-
-        # Get all the NPC's tile positions so we can check for collisions.
-        for npc in game.npcs:
-            npc_pos_x = int(round(npc.tile_pos[0]))
-            npc_pos_y = int(round(npc.tile_pos[1]))
-            npc_positions.add( (npc_pos_x, npc_pos_y) )
-
-        # Combine our map collision tiles with our npc collision positions
-        collision_set = game.collision_map.union(npc_positions)
-
         # Round the player's tile position to an integer value. We test for collisions based on
         # an integer value.
         player_pos = ( int(round(self.tile_pos[0])), int(round(self.tile_pos[1])) )
@@ -199,7 +194,7 @@ class Player(object):
                 if global_y >= self.move_destination[1] and self.direction["up"]:
 
                     # If the destination tile won't collide with anything, then proceed with moving.
-                    if not "up" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
+                    if not self.collision_check(player_pos, "up", game.collision_grid):
                         self.moving = True
                         self.move_direction = "up"
 
@@ -224,7 +219,7 @@ class Player(object):
 
                 if global_y <= self.move_destination[1] and self.direction["down"]:
 
-                    if not "down" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
+                    if not self.collision_check(player_pos, "down", game.collision_grid):
                         self.moving = True
                         self.move_direction = "down"
 
@@ -245,7 +240,7 @@ class Player(object):
 
                 if global_x >= self.move_destination[0] and self.direction["left"]:
 
-                    if not "left" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
+                    if not self.collision_check(player_pos, "left", game.collision_grid):
                          self.moving = True
                          self.move_direction = "left"
 
@@ -266,7 +261,7 @@ class Player(object):
 
                 if global_x <= self.move_destination[0] and self.direction["right"]:
 
-                    if not "right" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
+                    if not self.collision_check(player_pos, "right", game.collision_grid):
                         self.moving = True
                         self.move_direction = "right"
 
@@ -292,7 +287,7 @@ class Player(object):
                     self.move_destination = [int(global_x), int(global_y + tile_size[1])]
 
                     # If the destination tile won't collide with anything, then proceed with moving.
-                    if not "up" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
+                    if not self.collision_check(player_pos, "up", game.collision_grid):
                         self.moving = True
                         self.move_direction = "up"
 
@@ -301,7 +296,7 @@ class Player(object):
                     # Set the destination position we'd wish to reach if we just started walking.
                     self.move_destination = [int(global_x), int(global_y - tile_size[1])]
 
-                    if not "down" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
+                    if not self.collision_check(player_pos, "down", game.collision_grid):
                         self.moving = True
                         self.move_direction = "down"
 
@@ -310,7 +305,7 @@ class Player(object):
                     # Set the destination position we'd wish to reach if we just started walking.
                     self.move_destination = [int(global_x + tile_size[1]), int(global_y)]
 
-                    if not "left" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
+                    if not self.collision_check(player_pos, "left", game.collision_grid):
                         self.moving = True
                         self.move_direction = "left"
 
@@ -319,7 +314,7 @@ class Player(object):
                     # Set the destination position we'd wish to reach if we just started walking.
                     self.move_destination = [int(global_x - tile_size[1]), int(global_y)]
 
-                    if not "right" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
+                    if not self.collision_check(player_pos, "right", game.collision_grid):
                         self.moving = True
                         self.move_direction = "right"
 
@@ -335,11 +330,25 @@ class Player(object):
     def move_one_tile(self, direction):
         self.direction[direction] = True
 
-    def move_by_path(self):
+    def move_by_path(self, game):
         '''
         This method will ensure movement will happen until the player
         reaches its destination
         '''
+        # Stand still until a path that is searched for in the background has been found.
+        if self.path_request:
+            if not self.path_request.done():
+                return
+
+            self.path = pathfinding.worker.collect(self.path_request, game.collision_grid)
+            if self.path is None:
+                logger.error("Pathfinding failed to find a path from " +
+                             str(self.path_request.start) + " to " +
+                             str(self.path_request.dest) + ".")
+            self.path_request = None
+            if not self.path:
+                return
+
         print "move_by_path()"
         # TODO maybe this function could be organized better
         if self.path and not self.moving:
@@ -371,6 +380,34 @@ class Player(object):
         else:
             print "self.path=" + str(len(self.path)) + ", self.moving="+str(self.moving)
 
+    def move_by_flow_field(self, flow_field, goal, game):
+        """Takes a step towards a goal tile using a flow field that can be shared with other
+        characters moving to the same goal. The player stops next to the goal.
+
+        :param flow_field: The flow field to find the next step with.
+        :param goal: The (x, y) tile position to move towards. Must be integers.
+        :param game: The world state, which contains the collision grid of the map.
+
+        :type flow_field: core.components.pathfinding.FlowField
+        :type goal: Tuple
+        :type game: core.states.world.World
+
+        :rtype: None
+        :returns: None
+
+        **Examples:**
+
+        >>> npc.move_by_flow_field(world.player_flow_field, (5, 5), world)
+
+        """
+        if self.moving:
+            return
+
+        my_tile_pos = (int(round(self.tile_pos[0])), int(round(self.tile_pos[1])))
+        direction = flow_field.next_step(game.collision_grid, goal, my_tile_pos)
+        if direction and flow_field.distance(my_tile_pos) > 1:
+            self.move_one_tile(direction)
+
     def draw(self, screen, layer):
         """Draws the player to the screen depending on whether or not they are moving or
         standing still.
@@ -421,48 +458,29 @@ class Player(object):
                                                               self.position[1] + offset))
 
 
-    def collision_check(self, player_tile_pos, collision_set, collision_lines_map):
-        """Checks collision tiles around the player.
-
-        :param player_pos: An (x, y) list of the player's current tile position. Must be an
-            integer.
-        :param collision_set: A set() object of (x, y) coordinates that are collidable.
-
-        :type player_pos: List
-        :type collision_set: Set
-
-        :rtype: List
-        :returns: A list indicating what tiles relative to the player are collision tiles.
-            e.g. ["down", "up"]
-
-        """
-
-        collisions = []
+    def collision_check(self, player_tile_pos, direction, collision_grid):
+        """Checks if the player can't move one tile in a direction because of a collision tile,
+        a wall or an NPC.
 
-        # Check to see if the tile below the player is a collision tile.
-        if (player_tile_pos[0], player_tile_pos[1] + 1) in collision_set:
-            collisions.append("down")
+        :param player_tile_pos: An (x, y) tuple of the player's current tile position. Must be
+            integers.
+        :param direction: The direction to check: "up", "down", "left" or "right".
+        :param collision_grid: The collision grid of the current map.
 
-        # Check to see if the tile above the player is a collision tile.
-        if (player_tile_pos[0], player_tile_pos[1] - 1) in collision_set:
-            collisions.append("up")
+        :type player_tile_pos: Tuple
+        :type direction: String
+        :type collision_grid: core.components.map.CollisionGrid
 
-        # Check to see if the tile to the left of the player is a collision tile.
-        if (player_tile_pos[0] - 1, player_tile_pos[1]) in collision_set:
-            collisions.append("left")
+        :rtype: Boolean
+        :returns: True if moving in that direction would collide with something.
 
-        # Check to see if the tile to the right of the player is a collision tile.
-        if (player_tile_pos[0] + 1, player_tile_pos[1]) in collision_set:
-            collisions.append("right")
+        **Examples:**
 
-        # From the players current tile, check to see if any nearby tile
-        # is separated by a wall
-        for tile, direction in collision_lines_map:
-            if player_tile_pos == tile:
-                collisions.append(direction)
+        >>> player.collision_check((5, 5), "up", world.collision_grid)
+        True
 
-        # Return a list of all the collision tiles around the player.
-        return collisions
+        """
+        return collision_grid.is_blocked(player_tile_pos, direction, occupied=True)
 
 
     def add_monster(self, monster):
@@ -529,85 +547,75 @@ class Player(object):
                 image, (image.get_width() * scale,
                         image.get_height() * scale))
 
-    def pathfind(self, dest, game):
-        # first check npc doesn't already have a path
-        if not self.path:
-
-            # will generate a path and store it in
-            # player.path
-            starting_loc = (int(round(self.tile_pos[0])),
-                            int(round(self.tile_pos[1])))
-
-            pathnode = self.pathfind_r(dest,
-                                   [PathfindNode(starting_loc)], # queue
-                                   [], # visited
-                                   0,  # depth (not a limit, just a counter)
-                                   game)
-            if pathnode:
-                # traverse the node to get the path
-                path = []
-                while pathnode:
-                    path.append(pathnode.get_value())
-                    pathnode = pathnode.get_parent()
-
-                print "path is " + str(path)
-
-                # last minute check to remove the top plan step if
-                # it's the same as our location
-                if path[len(path)-1] == self.tile_pos:
-                    plan.pop()
-
-                # store the path
-                self.path = path
-            else:
-                # TODO get current map name for a more useful error
-                logger.error("Pathfinding failed to find a path from " +
-                             str(starting_loc) + " to " + str(dest) +
-                             ". Are you sure that an obstacle-free path exists?")
+    def pathfind(self, dest, game, max_nodes=None, wait=True):
+        """Finds a path from the player's current tile to a destination tile and stores it in
+        self.path, unless the player already has a path. Paths are cached, see
+        :py:class:`core.components.pathfinding.PathCache`.
 
-    def pathfind_r(self, dest, queue, visited, depth, game):
-        # recursive breadth first search algorithm
+        If wait is False, the path is searched for in the background by
+        :py:data:`core.components.pathfinding.worker` and :py:func:`move_by_path` waits for it.
 
-        if len(queue) == 0:
-            # does reaching this case mean we exhausted the search? I think so
-            # which means there is no possible path
-            return False
+        :param dest: The (x, y) tile position to go to. Must be integers.
+        :param game: The main game object that contains all the game's variables.
+        :param max_nodes: The maximum number of tiles to search before giving up, or None to
+            search the whole map if needed.
+        :param wait: Whether to wait for the path to be found.
 
-        elif queue[0].get_value() == dest:
-            # done
-            return queue[0]
+        :type dest: Tuple
+        :type game: core.tools.Control
+        :type max_nodes: Integer
+        :type wait: Boolean
 
-        else:
-            # sort the queue by node depth
-            queue = sorted(queue, key=lambda x: x.get_depth())
-            # pop next tile off queue
-            next_node = queue.pop(0)
-
-            # add neighbors of current tile to queue
-            # if we haven't checked them already
-            for adj_pos in self.get_adjacent_tiles(next_node.get_value(), game):
-                if adj_pos not in visited and adj_pos not in map(lambda x: x.get_value(), queue):
-                    queue = [PathfindNode(adj_pos,next_node)]+queue
-                    visited = [next_node.get_value()]+visited
-
-            # recur
-            path = self.pathfind_r(dest,queue,visited,depth+1,game)
-            #print "path is: " + str(path)
-            return path
+        :rtype: Boolean
+        :returns: True if the player has a path to follow or one is being searched for, False
+            if no path was found.
+
+        **Examples:**
+
+        >>> npc.pathfind((3, 10), game)
+        True
+        >>> npc.path
+        [(3, 10), (4, 10), (5, 10)]
+
+        """
+        # first check npc doesn't already have a path
+        if self.path or self.path_request:
+            return True
+
+        world = game.state_dict["WORLD"]
+        starting_loc = (int(round(self.tile_pos[0])),
+                        int(round(self.tile_pos[1])))
+
+        if not wait:
+            self.path_request = pathfinding.worker.submit(world.current_map.filename,
+                                                          world.collision_grid, starting_loc,
+                                                          tuple(dest), max_nodes)
+            return True
+
+        path = pathfinding.path_cache.find_path(world.current_map.filename, world.collision_grid,
+                                                starting_loc, tuple(dest), max_nodes)
+        if path is None:
+            logger.error("Pathfinding failed to find a path from " + str(starting_loc) +
+                         " to " + str(dest) + " on " + world.current_map.filename +
+                         ". Are you sure that an obstacle-free path exists?")
+            return False
+
+        logger.debug("path is " + str(path))
+        self.path = path
+        return True
 
     def get_adjacent_tiles(self, curr_loc, game):
         # Get a copy of the world state.
         world = game.state_dict["WORLD"]
-        blocked_directions = self.collision_check(curr_loc, world.collision_map, world.collision_lines_map)
         adj_tiles = []
         curr_loc = (int(round(curr_loc[0])),int(round(curr_loc[1])))
-        if "up" not in blocked_directions:
+        if not world.collision_grid.is_blocked(curr_loc, "up"):
             adj_tiles.append((curr_loc[0],curr_loc[1]-1))
-        if "down" not in blocked_directions:
+        if not world.collision_grid.is_blocked(curr_loc, "down"):
             adj_tiles.append((curr_loc[0],curr_loc[1]+1))
-        if "left" not in blocked_directions:
+        if not world.collision_grid.is_blocked(curr_loc, "left"):
             adj_tiles.append((curr_loc[0]-1,curr_loc[1]))
-        if "right" not in blocked_directions:
+        if not world.collision_grid.is_blocked(curr_loc, "right"):
             adj_tiles.append((curr_loc[0]+1,curr_loc[1]))
         return adj_tiles
 
@@ -627,6 +635,10 @@ class Npc(Player):
         self.tile_destination = [0, 0]
         self.current_tile = [0.0, 0.0]
 
+        # The tiles this NPC has marked as occupied in the collision grid of the map.
+        self.collision_grid = None
+        self.occupied_tiles = ()
+
 
     def move(self, tile_size, time_passed_seconds, game):
         """Draws text to the current menu object
@@ -651,23 +663,60 @@ class Npc(Player):
             to collision)
 
         """
-        # Create a temporary set of tile coordinates for NPCs. We'll use this to check for
-        # collisions.
-        npc_positions = set()
+        # Mark the tile we're standing on, so other characters can't walk onto it. This happens
+        # on our first move on a map, after that the tiles are marked as we start and finish
+        # moving from one tile to the next.
+        if self.collision_grid is not game.collision_grid:
+            self.occupy(game.collision_grid,
+                        (int(round(self.tile_pos[0])), int(round(self.tile_pos[1]))))
+
+        self._continue_move(tile_size, time_passed_seconds, game)
+        self._start_move(game)
+
+
+    def occupy(self, collision_grid, *tiles):
+        """Marks the tiles that the NPC is standing on or moving onto in the collision grid and
+        unmarks the tiles it marked before.
+
+        :param collision_grid: The collision grid of the current map.
+        :param tiles: The (x, y) tile positions to mark.
+
+        :type collision_grid: core.components.map.CollisionGrid
+        :type tiles: Tuple
+
+        :rtype: None
+        :returns: None
+
+        **Examples:**
+
+        >>> npc.occupy(world.collision_grid, (5, 5), (5, 4))
+
+        """
+        if self.collision_grid:
+            for tile in self.occupied_tiles:
+                self.collision_grid.vacate(tile)
 
-        # Get all the NPC's tile positions so we can check for collisions.
-        for npc in game.npcs:
-            npc_pos_x = int(round(npc.tile_pos[0]))
-            npc_pos_y = int(round(npc.tile_pos[1]))
-            npc_positions.add( (npc_pos_x, npc_pos_y) )
+        self.collision_grid = collision_grid
+        self.occupied_tiles = tiles
+        for tile in tiles:
+            collision_grid.occupy(tile)
 
-        # Combine our map collision tiles with our npc collision positions
-        collision_set = game.collision_map.union(npc_positions)
-        self._continue_move(collision_set, tile_size, time_passed_seconds, game)
-        self._start_move(collision_set, game)
 
+    def start_tile_move(self, player_pos, direction, game):
+        """Starts moving from one tile to the tile at self.tile_destination. Both tiles stay
+        marked as occupied until the move is finished."""
+        self.moving = True
+        self.move_direction = direction
+        self.occupy(game.collision_grid, player_pos, tuple(self.tile_destination))
 
-    def _start_move(self, collision_set, game):
+
+    def finish_tile_move(self, game):
+        """Stops moving and only keeps the destination tile marked as occupied."""
+        self.moving = False
+        self.occupy(game.collision_grid, tuple(self.tile_destination))
+
+
+    def _start_move(self, game):
 
         # Round the player's tile position to an integer value. We test for collisions based on
         # an integer value.
@@ -690,9 +739,8 @@ class Npc(Player):
                     self.tile_destination = [player_pos[0], player_pos[1] - 1]
 
                     # If the destination tile won't collide with anything, then proceed with moving.
-                    if not "up" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
-                        self.moving = True
-                        self.move_direction = "up"
+                    if not self.collision_check(player_pos, "up", game.collision_grid):
+                        self.start_tile_move(player_pos, "up", game)
 
             elif self.direction["down"]:
                 if not self.moving:
@@ -700,9 +748,8 @@ class Npc(Player):
                     #self.move_destination = [int(global_x), int(global_y - tile_size[1])]
                     self.tile_destination = [player_pos[0], player_pos[1] + 1]
 
-                    if not "down" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
-                        self.moving = True
-                        self.move_direction = "down"
+                    if not self.collision_check(player_pos, "down", game.collision_grid):
+                        self.start_tile_move(player_pos, "down", game)
 
             elif self.direction["left"]:
                 if not self.moving:
@@ -710,9 +757,8 @@ class Npc(Player):
                     #self.move_destination = [int(global_x + tile_size[1]), int(global_y)]
                     self.tile_destination = [player_pos[0] - 1, player_pos[1]]
 
-                    if not "left" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
-                        self.moving = True
-                        self.move_direction = "left"
+                    if not self.collision_check(player_pos, "left", game.collision_grid):
+                        self.start_tile_move(player_pos, "left", game)
 
             elif self.direction["right"]:
                 if not self.moving:
@@ -720,9 +766,8 @@ class Npc(Player):
                     #self.move_destination = [int(global_x - tile_size[1]), int(global_y)]
                     self.tile_destination = [player_pos[0] + 1, player_pos[1]]
 
-                    if not "right" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
-                        self.moving = True
-                        self.move_direction = "right"
+                    if not self.collision_check(player_pos, "right", game.collision_grid):
+                        self.start_tile_move(player_pos, "right", game)
 
         # If we're not holding down an arrow key and the player is not moving, stop the animation
         # and draw the standing gfx
@@ -731,7 +776,7 @@ class Npc(Player):
                 self.moveConductor.stop()
 
 
-    def _continue_move(self, collision_set, tile_size, time_passed_seconds, game):
+    def _continue_move(self, tile_size, time_passed_seconds, game):
         # Round the player's tile position to an integer value. We test for collisions based on
         # an integer value.
         player_pos = (int(round(self.tile_pos[0])), int(round(self.tile_pos[1])))
@@ -743,7 +788,7 @@ class Npc(Player):
             # If we've reached our destination and are no longer holding an arrow key, set moving
             # to false and set the position to the destination
             if self.current_tile[1] <= self.tile_destination[1] and not self.direction["up"]:  # self.direction means that arrow key is being held
-                self.moving = False
+                self.finish_tile_move(game)
                 self.current_tile[1] = self.move_destination[1]	# Set it to the destination so we don't overshoot it
 
             # If we're already in the middle of walking and we haven't reached the tile, THEN
@@ -757,24 +802,22 @@ class Npc(Player):
                 if self.current_tile[1] <= self.tile_destination[1] and self.direction["up"]:
 
                     # If the destination tile won't collide with anything, then proceed with moving.
-                    if not "up" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
-                        self.moving = True
-                        self.move_direction = "up"
-
+                    if not self.collision_check(player_pos, "up", game.collision_grid):
                         # Set the destination position we'd wish to reach if we just started walking.
                         self.tile_destination = [self.tile_destination[0], self.tile_destination[1] + 1]
+                        self.start_tile_move(player_pos, "up", game)
 
 
                     # If we are going to collide with something, set our position to the original
                     # move destination and stop moving
                     else:
-                        self.moving = False
+                        self.finish_tile_move(game)
                         self.current_tile[1] = self.tile_destination[1]
 
 
         if self.move_direction == "down" and self.moving:
             if self.current_tile[1] >= self.tile_destination[1] and not self.direction["down"]:
-                self.moving = False
+                self.finish_tile_move(game)
                 self.current_tile[1] = self.tile_destination[1]	# Set it to the destination so we don't overshoot it
 
             else:
@@ -782,90 +825,50 @@ class Npc(Player):
 
                 if self.current_tile[1] >= self.tile_destination[1] and self.direction["down"]:
 
-                    if not "down" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
-                        self.moving = True
-                        self.move_direction = "down"
-
+                    if not self.collision_check(player_pos, "down", game.collision_grid):
                         self.tile_destination = [self.tile_destination[0], self.tile_destination[1] - 1]
+                        self.start_tile_move(player_pos, "down", game)
 
                     else:
-                        self.moving = False
+                        self.finish_tile_move(game)
                         self.current_tile[1] = self.tile_destination[1]
 
 
         if self.move_direction == "left" and self.moving:
             if self.current_tile[0] <= self.tile_destination[0] and not self.direction["left"]:
-                self.moving = False
+                self.finish_tile_move(game)
                 self.current_tile[0] = self.tile_destination[0]	# Set it to the destination so we don't overshoot it
             else:
                 self.current_tile[0] -= (self.moverate * time_passed_seconds)
 
                 if self.current_tile[0] <= self.tile_destination[0] and self.direction["left"]:
 
-                    if not "left" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
-                         self.moving = True
-                         self.move_direction = "left"
-
+                    if not self.collision_check(player_pos, "left", game.collision_grid):
                          self.tile_destination = [self.tile_destination[0] + 1, self.tile_destination[0]]
+                         self.start_tile_move(player_pos, "left", game)
 
                     else:
-                         self.moving = False
+                         self.finish_tile_move(game)
                          self.current_tile[0] = self.tile_destination[0]
 
 
         if self.move_direction == "right" and self.moving:
             if self.current_tile[0] >= self.tile_destination[0] and not self.direction["right"]:
-                self.moving = False
+                self.finish_tile_move(game)
                 self.current_tile[0] = self.tile_destination[0]	# Set it to the destination so we don't overshoot it
             else:
                 self.current_tile[0] += (self.moverate * time_passed_seconds)
 
                 if self.current_tile[0] >= self.tile_destination[0] and self.direction["right"]:
 
-                    if not "right" in self.collision_check(player_pos, collision_set, game.collision_lines_map):
-                        self.moving = True
-                        self.move_direction = "right"
-
+                    if not self.collision_check(player_pos, "right", game.collision_grid):
                         self.tile_destination = [self.tile_destination[0] - 1, self.move_destination[0]]
+                        self.start_tile_move(player_pos, "right", game)
 
                     else:
-                        self.moving = False
+                        self.finish_tile_move(game)
                         self.current_tile[0] = self.tile_destination[0]
 
         if self.moving:
             x, y = game.get_pos_from_tilepos(self.current_tile)
             self.position = [x, y - tile_size[1]]   # TODO: Figure out why I need to subtract a tile size.
-
-
-class PathfindNode():
-    '''
-    Used in path finding search
-    '''
-    def __init__(self, value, parent=None):
-        self.parent = parent
-        self.value = value
-        if self.parent:
-            self.depth = self.parent.depth+1
-        else:
-            self.depth = 0
-
-    def get_parent(self):
-        return self.parent
-
-    def set_parent(self, parent):
-        self.parent = parent
-        self.depth = parent.depth+1
-
-    def get_value(self):
-        return self.value
-
-    def get_depth(self):
-        return self.depth
-    
-    def __str__(self):
-        s = str(self.value)
-        if self.parent is not None:
-            s += str(self.parent)
-        return s
-
-
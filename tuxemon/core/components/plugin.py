@@ -35,6 +35,10 @@ import os
 import inspect
 import importlib
 import sys
+import cPickle as pickle
+import hashlib
+
+from core import prepare
 
 # Create a logger for optional handling of debug messages.
 logger = logging.getLogger(__name__)
@@ -43,6 +47,11 @@ log_hdlr.setLevel(logging.DEBUG)
 log_hdlr.setFormatter(logging.Formatter("%(asctime)s - %(name)s - "
                                         "%(levelname)s - %(message)s"))
 
+# The version of the plugin manifest format. Increase this whenever the manifest format changes
+# so that old manifests are rebuilt instead of loaded.
+PLUGIN_MANIFEST_VERSION = 1
+
+
 class Plugin(object):
     def __init__(self, name, module):
         self.name = name
@@ -145,3 +154,161 @@ def get_available_methods(plugin_manager):
             methods[method[0]] = {"method": method[1], "module": plugin.name}
 
     return methods
+
+
+class LazyPlugin(object):
+    """A plugin from a plugin manifest whose module is only imported, and whose class is only
+    instantiated, when one of its methods is first called. See :py:func:`load_methods`.
+
+    :param name: The name of the plugin: its module path and class name.
+
+    :type name: String
+
+    """
+    def __init__(self, name):
+        self.name = name
+        self._plugin_object = None
+
+    @property
+    def plugin_object(self):
+        if self._plugin_object is None:
+            module, class_name = self.name.rsplit(".", 1)
+            logger.debug("Importing module: " + str(module))
+            self._plugin_object = getattr(importlib.import_module(module), class_name)()
+
+        return self._plugin_object
+
+
+class LazyMethod(object):
+    """A method of a :py:class:`LazyPlugin` that imports the plugin when it is first called.
+    It has the same "inputs" attribute as the method, so event conditions can be compiled
+    without importing their plugins.
+
+    :param plugin: The plugin that has the method.
+    :param name: The name of the method.
+    :param inputs: The "inputs" attribute of the method, or None if it has none.
+
+    :type plugin: core.components.plugin.LazyPlugin
+    :type name: String
+    :type inputs: Tuple
+
+    """
+    def __init__(self, plugin, name, inputs):
+        self.plugin = plugin
+        self.name = name
+        self.inputs = inputs
+        self.method = None
+
+    def __call__(self, *args, **kwargs):
+        if self.method is None:
+            self.method = getattr(self.plugin.plugin_object, self.name)
+
+        return self.method(*args, **kwargs)
+
+
+def get_manifest_path(plugin_folder):
+    """Returns the path of the plugin manifest for a plugin folder.
+
+    :param plugin_folder: The folder with the plugin files.
+
+    :type plugin_folder: String
+
+    :rtype: String
+    :returns: The path to the plugin manifest.
+
+    """
+    folder = os.path.abspath(plugin_folder)
+    name = os.path.basename(folder)
+    digest = hashlib.md5(folder.encode("utf-8")).hexdigest()[:8]
+    return os.path.join(prepare.CACHE_DIR, "plugins", "%s-%s.manifest" % (name, digest))
+
+
+def get_plugin_files(plugin_folder):
+    """Gets the modification times of the files in a plugin folder that a plugin manifest is
+    built from. The manifest is rebuilt when any of them changes, or files are added or removed.
+
+    :param plugin_folder: The folder with the plugin files.
+
+    :type plugin_folder: String
+
+    :rtype: List
+    :returns: A sorted list of (file name, modification time) pairs.
+
+    """
+    files = []
+    for f in os.listdir(plugin_folder):
+        if f.endswith(".py") or f.endswith(".plugin"):
+            files.append((f, os.path.getmtime(os.path.join(plugin_folder, f))))
+
+    return sorted(files)
+
+
+def load_methods(plugin_folder):
+    """Gets the available methods in a folder of plugins, like :py:func:`get_available_methods`,
+    without importing the plugins. The methods are listed in a manifest under the cache
+    directory, which is built by importing the plugins the first time the folder is loaded and
+    whenever a file in the folder changes. The methods from the manifest are
+    :py:class:`LazyMethod` objects that import their plugin when they are first called.
+
+    :param plugin_folder: The folder to look for plugin files.
+
+    :type plugin_folder: String
+
+    :rtype: Dictionary
+    :returns: A dictionary containing the methods from the plugins.
+
+    **Examples:**
+
+    >>> methods = core.components.plugin.load_methods("core/components/event/actions")
+    >>> methods["teleport"]
+    {'method': <core.components.plugin.LazyMethod object at 0x7f20e1bec398>,
+     'module': 'core.components.event.actions.player.Player'}
+
+    """
+    manifest_path = get_manifest_path(plugin_folder)
+    files = get_plugin_files(plugin_folder)
+
+    manifest = None
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, "rb") as manifest_file:
+                manifest = pickle.load(manifest_file)
+        except Exception, message:
+            logger.warning("Unable to read plugin manifest %s: %s" % (manifest_path, message))
+
+    if (manifest and manifest["version"] == PLUGIN_MANIFEST_VERSION
+        and manifest["folder"] == os.path.abspath(plugin_folder)
+        and manifest["files"] == files):
+        plugins = {}
+        methods = {}
+        for name, (plugin_name, inputs) in manifest["methods"].items():
+            if plugin_name not in plugins:
+                plugins[plugin_name] = LazyPlugin(plugin_name)
+            methods[name] = {"method": LazyMethod(plugins[plugin_name], name, inputs),
+                             "module": plugin_name}
+
+        return methods
+
+    logger.debug("Building plugin manifest: " + manifest_path)
+    methods = get_available_methods(load_directory(plugin_folder))
+    manifest = {"version": PLUGIN_MANIFEST_VERSION,
+                "folder": os.path.abspath(plugin_folder),
+                "files": files,
+                "methods": dict((name, (method["module"],
+                                        getattr(method["method"], "inputs", None)))
+                                for name, method in methods.items())}
+
+    try:
+        if not os.path.isdir(os.path.dirname(manifest_path)):
+            os.makedirs(os.path.dirname(manifest_path))
+
+        # Write to a temporary file first so a crash never leaves a half written manifest.
+        with open(manifest_path + ".tmp", "wb") as manifest_file:
+            pickle.dump(manifest, manifest_file, pickle.HIGHEST_PROTOCOL)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        os.rename(manifest_path + ".tmp", manifest_path)
+    except (IOError, OSError), message:
+        logger.warning("Unable to write plugin manifest %s: %s" % (manifest_path, message))
+
+    return methods
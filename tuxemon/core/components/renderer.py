@@ -0,0 +1,290 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Tuxemon
+# Copyright (C) 2014, William Edwards <shadowapex@gmail.com>,
+#                     Benjamin Bean <superman2k5@gmail.com>
+#
+# This file is part of Tuxemon.
+#
+# Tuxemon is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tuxemon is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tuxemon.  If not, see <http://www.gnu.org/licenses/>.
+#
+# Contributor(s):
+#
+# William Edwards <shadowapex@gmail.com>
+#
+#
+# core.components.renderer Map renderers that draw the ground layers of a map.
+#
+#
+
+import logging
+import pygame
+
+# Create a logger for optional handling of debug messages.
+logger = logging.getLogger(__name__)
+logger.debug("components.renderer successfully imported")
+
+
+class ChunkRenderer(object):
+    """Draws the ground layers of a map from pre-rendered chunks. The tiles of every layer below
+    the "med" layer are baked into one surface per chunk of tiles, so drawing the ground only
+    takes a blit for each chunk that overlaps the screen instead of one for every visible tile.
+
+    Chunks are baked the first time they come near the screen. Baking every chunk when the map
+    loads would keep the whole map in memory at full scale, so chunks that are far away from the
+    screen are thrown away and baked again if they come back into view.
+
+    :param tiles: The tiles of the map to draw.
+    :param layers: The number of layers, starting with the first, that are baked into chunks.
+    :param chunk_size: The [width, height] of a chunk in tiles.
+
+    :type tiles: core.components.map.TileGrid
+    :type layers: Integer
+    :type chunk_size: List
+
+    **Examples:**
+
+    >>> renderer = ChunkRenderer(world.tiles, 3)
+    >>> renderer.draw(screen, world.global_x, world.global_y)
+
+    """
+    # Chunks only cover the map itself, so the screen has to be cleared before drawing them.
+    opaque = False
+
+    def __init__(self, tiles, layers, chunk_size=(16, 16)):
+        self.tiles = tiles
+        self.layers = tiles.layers[:layers]
+        self.chunk_size = chunk_size
+
+        # The size of a chunk in pixels.
+        self.chunk_width = chunk_size[0] * tiles.tile_size[0]
+        self.chunk_height = chunk_size[1] * tiles.tile_size[1]
+
+        # The number of chunks needed to cover the whole map.
+        self.columns = (tiles.width + chunk_size[0] - 1) // chunk_size[0]
+        self.rows = (tiles.height + chunk_size[1] - 1) // chunk_size[1]
+
+        # The baked chunk surfaces keyed by their (x, y) chunk coordinates.
+        self.chunks = {}
+
+
+    def bake(self, chunk_x, chunk_y):
+        """Draws the tiles of the baked layers that are inside a chunk onto a new surface.
+
+        :param chunk_x: The x coordinate of the chunk in chunks.
+        :param chunk_y: The y coordinate of the chunk in chunks.
+
+        :type chunk_x: Integer
+        :type chunk_y: Integer
+
+        :rtype: pygame.Surface
+        :returns: The surface of the chunk.
+
+        """
+        tiles = self.tiles
+        tile_width, tile_height = tiles.tile_size
+
+        start_x = chunk_x * self.chunk_size[0]
+        start_y = chunk_y * self.chunk_size[1]
+        end_x = min(start_x + self.chunk_size[0], tiles.width)
+        end_y = min(start_y + self.chunk_size[1], tiles.height)
+
+        # The world is drawn over a black screen, so chunks can be opaque. Opaque surfaces are
+        # faster to blit and blend the tiles exactly like drawing them on the screen would.
+        surface = pygame.Surface(((end_x - start_x) * tile_width,
+                                  (end_y - start_y) * tile_height)).convert()
+        surface.fill((0, 0, 0))
+
+        images = tiles.images
+        for layer in self.layers:
+            for y in xrange(start_y, end_y):
+                row = y * tiles.width
+                position_y = (y - start_y) * tile_height
+                for x in xrange(start_x, end_x):
+                    gid = layer[row + x]
+                    if gid:
+                        surface.blit(images[gid], ((x - start_x) * tile_width, position_y))
+
+        logger.debug("Baked map chunk (%d, %d)" % (chunk_x, chunk_y))
+        return surface
+
+
+    def draw(self, screen, global_x, global_y):
+        """Draws every chunk that is visible on the screen. Chunks that aren't baked yet are
+        baked, and chunks that are more than a chunk away from the screen are thrown away.
+
+        :param screen: The surface to draw the chunks to.
+        :param global_x: The x offset of the map on the screen in pixels.
+        :param global_y: The y offset of the map on the screen in pixels.
+
+        :type screen: pygame.Surface
+        :type global_x: Integer
+        :type global_y: Integer
+
+        :rtype: None
+        :returns: None
+
+        """
+        screen_width, screen_height = screen.get_size()
+
+        # Find the range of chunks that overlap the screen.
+        start_x = max(int(-global_x) // self.chunk_width, 0)
+        start_y = max(int(-global_y) // self.chunk_height, 0)
+        end_x = min(int(screen_width - global_x) // self.chunk_width + 1, self.columns)
+        end_y = min(int(screen_height - global_y) // self.chunk_height + 1, self.rows)
+
+        for chunk_y in xrange(start_y, end_y):
+            for chunk_x in xrange(start_x, end_x):
+                chunk = self.chunks.get((chunk_x, chunk_y))
+                if not chunk:
+                    chunk = self.bake(chunk_x, chunk_y)
+                    self.chunks[(chunk_x, chunk_y)] = chunk
+
+                screen.blit(chunk, (chunk_x * self.chunk_width + global_x,
+                                    chunk_y * self.chunk_height + global_y))
+
+        # Keep the chunks right next to the screen around, so walking back and forth doesn't
+        # bake the same chunks over and over.
+        for chunk_x, chunk_y in self.chunks.keys():
+            if (chunk_x < start_x - 1 or chunk_x > end_x
+                or chunk_y < start_y - 1 or chunk_y > end_y):
+                del self.chunks[(chunk_x, chunk_y)]
+
+
+class ScrollRenderer(object):
+    """Draws the ground layers of a map by reusing what was drawn on the previous frame. The
+    ground is kept in an offscreen buffer the size of the screen. When the camera moves, the
+    buffer is scrolled by the distance the camera moved and only the strips of the map that
+    scrolled into view are drawn. Each frame then costs a single copy of the buffer to the screen
+    plus the tiles in one or two thin strips.
+
+    :param tiles: The tiles of the map to draw.
+    :param layers: The number of layers, starting with the first, that are drawn into the
+        buffer.
+
+    :type tiles: core.components.map.TileGrid
+    :type layers: Integer
+
+    **Examples:**
+
+    >>> renderer = ScrollRenderer(world.tiles, 3)
+    >>> renderer.draw(screen, world.global_x, world.global_y)
+
+    """
+    # The buffer covers the whole screen, so the screen doesn't need to be cleared first.
+    opaque = True
+
+    def __init__(self, tiles, layers):
+        self.tiles = tiles
+        self.layers = tiles.layers[:layers]
+
+        # The offscreen copy of the ground layers.
+        self.buffer = None
+
+        # The map pixel coordinates drawn at the top left corner of the buffer, or None if
+        # nothing has been drawn yet.
+        self.origin = None
+
+
+    def redraw(self, rect, origin):
+        """Clears an area of the buffer and draws the tiles inside it again.
+
+        :param rect: The area of the buffer to draw.
+        :param origin: The map pixel coordinates at the top left corner of the buffer.
+
+        :type rect: pygame.Rect
+        :type origin: Tuple
+
+        :rtype: None
+        :returns: None
+
+        """
+        tiles = self.tiles
+        tile_width, tile_height = tiles.tile_size
+
+        # Find the tiles that overlap the area, in map coordinates.
+        start_x = max((rect.left + origin[0]) // tile_width, 0)
+        start_y = max((rect.top + origin[1]) // tile_height, 0)
+        end_x = min((rect.right + origin[0] - 1) // tile_width + 1, tiles.width)
+        end_y = min((rect.bottom + origin[1] - 1) // tile_height + 1, tiles.height)
+
+        # Tiles along the edge of the area only partly overlap it. Clip them, so we don't
+        # draw over the part of the buffer that is still correct.
+        self.buffer.set_clip(rect)
+        self.buffer.fill((0, 0, 0), rect)
+
+        images = tiles.images
+        for layer in self.layers:
+            for y in xrange(start_y, end_y):
+                row = y * tiles.width
+                position_y = y * tile_height - origin[1]
+                for x in xrange(start_x, end_x):
+                    gid = layer[row + x]
+                    if gid:
+                        self.buffer.blit(images[gid], (x * tile_width - origin[0], position_y))
+
+        self.buffer.set_clip(None)
+
+
+    def draw(self, screen, global_x, global_y):
+        """Scrolls the buffer to the current camera position, draws the parts of the map that
+        came into view and copies the buffer to the screen.
+
+        :param screen: The surface to draw the map to.
+        :param global_x: The x offset of the map on the screen in pixels.
+        :param global_y: The y offset of the map on the screen in pixels.
+
+        :type screen: pygame.Surface
+        :type global_x: Integer
+        :type global_y: Integer
+
+        :rtype: None
+        :returns: None
+
+        """
+        width, height = screen.get_size()
+        origin = (-int(global_x), -int(global_y))
+
+        if not self.buffer or self.buffer.get_size() != (width, height):
+            self.buffer = pygame.Surface((width, height)).convert()
+            self.origin = None
+
+        if self.origin is None:
+            self.redraw(self.buffer.get_rect(), origin)
+
+        else:
+            # The distance the contents of the buffer have to move.
+            dx = self.origin[0] - origin[0]
+            dy = self.origin[1] - origin[1]
+
+            if abs(dx) >= width or abs(dy) >= height:
+                self.redraw(self.buffer.get_rect(), origin)
+
+            elif dx or dy:
+                self.buffer.scroll(dx, dy)
+
+                # Draw the columns and rows that scrolled into view.
+                if dx > 0:
+                    self.redraw(pygame.Rect(0, 0, dx, height), origin)
+                elif dx < 0:
+                    self.redraw(pygame.Rect(width + dx, 0, -dx, height), origin)
+
+                if dy > 0:
+                    self.redraw(pygame.Rect(0, 0, width, dy), origin)
+                elif dy < 0:
+                    self.redraw(pygame.Rect(0, height + dy, width, -dy), origin)
+
+        self.origin = origin
+        screen.blit(self.buffer, (0, 0))
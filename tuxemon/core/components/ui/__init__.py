@@ -35,6 +35,7 @@ import operator
 
 from core.components import pyganim
 from core.components import plugin
+from core.components import assets
 from core import prepare
 
 # Create a logger for optional handling of debug messages.
@@ -45,7 +46,8 @@ logger.debug("components.ui successfully imported")
 class UserInterface(object):
     """A basic user interface object.
 
-    :param image: Path to the image to load or surface.
+    :param image: Path to the image to load or surface. Images are loaded through
+        :py:data:`core.components.assets.surfaces`, so they are only read from disk once.
     :param position: The [x, y] position to draw the UI element.
     :param screen: The pygame surface to draw the element on.
     :param scale: Whether or not to scale the surface based on game's scale.
@@ -63,22 +65,22 @@ class UserInterface(object):
         if type(images) is str or type(images) is unicode:
             if prepare.BASEDIR not in images:
                 images = prepare.BASEDIR + images
-            surface = pygame.image.load(images).convert_alpha()
+            surface = assets.surfaces.load(images)
             self.original_width = surface.get_width()
             self.original_height = surface.get_height()
             if scale:
-                surface = self.scale_surface(surface)
+                surface = assets.surfaces.load(images, prepare.SCALE)
             self.images = [(surface, animation_speed)]
 
         elif type(images) is list or type(images) is tuple:
             self.images = []
             for item in images:
                 if type(item) is str or type(item) is unicode:
-                    surface = pygame.image.load(item).convert_alpha()
+                    surface = assets.surfaces.load(item)
                     self.original_width = surface.get_width()
                     self.original_height = surface.get_height()
                     if scale:
-                        surface = self.scale_surface(surface)
+                        surface = assets.surfaces.load(item, prepare.SCALE)
                 else:
                     self.original_width = surface.get_width()
                     self.original_height = surface.get_height()
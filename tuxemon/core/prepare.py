@@ -47,10 +47,17 @@ except ImportError:
 # Get the tuxemon base directory
 BASEDIR = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")) + "/"
 
+# Compiled resources such as map caches are stored here so they can be
+# regenerated at any time.
+CACHE_DIR = BASEDIR + "cache/"
+
 # Read the "tuxemon.cfg" configuration file
 CONFIG = config.Config(BASEDIR + "tuxemon.cfg")
 
-# Set up the screen size and caption
+# Set up the screen size and caption. The display size is the size of the window (or the
+# whole monitor in fullscreen). The screen size is the size of the surface the game draws to,
+# which is smaller than the display when rendering at native resolution.
+DISPLAY_SIZE = CONFIG.resolution
 SCREEN_SIZE = CONFIG.resolution
 ORIGINAL_CAPTION = "Tuxemon"
 
@@ -78,6 +85,15 @@ if CONFIG.scaling == "1":
 else:
     SCALE = 1
 
+# When rendering at native resolution, the game draws unscaled images to a small screen surface
+# which is scaled up to the display once per frame. The screen covers the same part of the world
+# that scaling every image would show, so the layout of the game doesn't change.
+if CONFIG.scaling == "native":
+    DISPLAY_SCALE = max(int(DISPLAY_SIZE[0] / NATIVE_RESOLUTION[0]), 1)
+    SCREEN_SIZE = (DISPLAY_SIZE[0] / DISPLAY_SCALE, DISPLAY_SIZE[1] / DISPLAY_SCALE)
+else:
+    DISPLAY_SCALE = 1
+
 
 # Initialization of PyGame dependent systems.
 def init():
@@ -95,8 +111,10 @@ def init():
 
     # These variables will persist throughout the module so they
     # can be called externally. E.g. "prepare.SCREEN", etc.
+    global DISPLAY
     global SCREEN
     global SCREEN_RECT
+    global TEXT_LAYER
     global JOYSTICKS
     global player1
     global FONTS
@@ -107,7 +125,16 @@ def init():
     # Initialize PyGame and our screen surface.
     pg.init()
     pg.display.set_caption(ORIGINAL_CAPTION)
-    SCREEN = pg.display.set_mode(SCREEN_SIZE, CONFIG.fullscreen, 32)
+    DISPLAY = pg.display.set_mode(DISPLAY_SIZE, CONFIG.fullscreen, 32)
+    # When rendering at native resolution, text is drawn to a transparent layer at the display's
+    # resolution so that it isn't scaled up with the rest of the screen.
+    if DISPLAY_SCALE > 1:
+        SCREEN = pg.Surface(SCREEN_SIZE).convert()
+        TEXT_LAYER = pg.Surface((SCREEN_SIZE[0] * DISPLAY_SCALE, SCREEN_SIZE[1] * DISPLAY_SCALE),
+                                pg.SRCALPHA)
+    else:
+        SCREEN = DISPLAY
+        TEXT_LAYER = None
     SCREEN_RECT = SCREEN.get_rect()
 
     # Disable the mouse cursor visibility
@@ -40,6 +40,7 @@ import time
 from core import prepare
 from core import tools
 from core.components import map
+from core.components import assets
 from core.components import eztext
 from core.components import save
 from core.components.ui import bar
@@ -101,8 +102,8 @@ class Combat(tools._State):
         self.status_icons = {}
         self.status_icons['Normal'] = pygame.Surface((prepare.ICON_SIZE[0], prepare.ICON_SIZE[1]))
         self.status_icons['Normal'].set_alpha(0)
-        self.status_icons['Poisoned'] = pygame.image.load(
-            prepare.BASEDIR + 'resources/gfx/ui/icons/status/poison-icon.png').convert_alpha()
+        self.status_icons['Poisoned'] = assets.surfaces.load(
+            prepare.BASEDIR + 'resources/gfx/ui/icons/status/poison-icon.png')
         self.status_icons['FNT'] = pygame.Surface((prepare.ICON_SIZE[0], prepare.ICON_SIZE[1]))
         self.status_icons['FNT'].set_alpha(0)
 
@@ -114,17 +115,12 @@ class Combat(tools._State):
 
         # Load all the party icons to show how many monsters each player has.
         self.party_icons = {}
-        self.party_icons['Normal'] = pygame.image.load(
-            prepare.BASEDIR + 'resources/gfx/ui/icons/party/party_icon01.png').convert_alpha()
-        self.party_icons['Ailment'] = pygame.image.load(
-            prepare.BASEDIR + 'resources/gfx/ui/icons/party/party_icon02.png').convert_alpha()
-        self.party_icons['FNT'] = pygame.image.load(
-            prepare.BASEDIR + 'resources/gfx/ui/icons/party/party_icon03.png').convert_alpha()
-
-        # Scale all the party icons based on the game's scale
-        for icon, surface in self.party_icons.items():
-            self.party_icons[icon] = pygame.transform.scale(surface,
-                (surface.get_width() * prepare.SCALE, surface.get_height() * prepare.SCALE))
+        self.party_icons['Normal'] = assets.surfaces.load(
+            prepare.BASEDIR + 'resources/gfx/ui/icons/party/party_icon01.png', prepare.SCALE)
+        self.party_icons['Ailment'] = assets.surfaces.load(
+            prepare.BASEDIR + 'resources/gfx/ui/icons/party/party_icon02.png', prepare.SCALE)
+        self.party_icons['FNT'] = assets.surfaces.load(
+            prepare.BASEDIR + 'resources/gfx/ui/icons/party/party_icon03.png', prepare.SCALE)
 
         # Bottom info menu
         self.info_menu = menu.Menu(game.screen, prepare.SCREEN_SIZE, game)
@@ -299,6 +295,13 @@ class Combat(tools._State):
 
         from core.components import menu
 
+        # Decode the sounds of every technique the monsters in this battle know, and of fainting,
+        # so they don't have to be decoded in the middle of the battle.
+        assets.sounds.preload(technique.sfx for player in self.players
+                              for current_monster in player.monsters
+                              for technique in current_monster.moves if technique.sfx)
+        assets.sounds.preload(["monster/1/faint.ogg"])
+
         # Create an alias to our UI dictionary, game, and screen
         ui = self.ui
         game = self.game
@@ -1013,8 +1016,7 @@ class Combat(tools._State):
                     monster_sprite.visible = False
 
                     # Play the sound of their HORRIBLE DEATH
-                    sound = mixer.Sound(prepare.BASEDIR + "resources/sounds/monster/1/faint.ogg")
-                    sound.play()
+                    assets.sounds.play("monster/1/faint.ogg")
 
                     # Award experience to player if opponent's monster fainted
                     if player_name == "opponent":
@@ -1189,8 +1191,9 @@ class Combat(tools._State):
             monster_sprite.tackled = True
 
             # Play the technique's sound effect.
-            sound = mixer.Sound(player['monster'].moves[selected_move].sfx)
-            sound.play()
+            sfx = player['monster'].moves[selected_move].sfx
+            if sfx:
+                assets.sounds.play(sfx)
 
         # If the player selected to use an item, use the item.
         elif 'item' in player['action']:
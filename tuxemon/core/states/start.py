@@ -38,6 +38,7 @@ import random
 
 from .. import tools, prepare
 from ..components import pyganim
+from ..components import assets
 from ..components import db
 from ..components import fusion
 
@@ -77,11 +78,8 @@ class StartScreen(tools._State):
         # Set up the splash screen logos
         self.splash_pygame = {}
         self.splash_pygame['path'] = prepare.BASEDIR + "resources/gfx/ui/intro/pygame_logo.png"
-        self.splash_pygame['surface'] = pygame.image.load(self.splash_pygame['path'])
-        self.splash_pygame['surface'] = pygame.transform.scale(self.splash_pygame['surface'],
-                                                           (self.splash_pygame['surface'].get_width() * prepare.SCALE,
-                                                            self.splash_pygame['surface'].get_height() * prepare.SCALE
-                                                            ))
+        self.splash_pygame['surface'] = assets.surfaces.load(self.splash_pygame['path'],
+                                                             prepare.SCALE, convert=None)
 
         splash_border = prepare.SCREEN_SIZE[0] / 20     # The space between the edge of the screen
         self.splash_pygame['position'] = (splash_border,
@@ -89,11 +87,8 @@ class StartScreen(tools._State):
 
         self.splash_cc = {}
         self.splash_cc['path'] = prepare.BASEDIR + "resources/gfx/ui/intro/creative_commons.png"
-        self.splash_cc['surface'] = pygame.image.load(self.splash_cc['path'])
-        self.splash_cc['surface'] = pygame.transform.scale(self.splash_cc['surface'],
-                                                           (self.splash_cc['surface'].get_width() * prepare.SCALE,
-                                                            self.splash_cc['surface'].get_height() * prepare.SCALE
-                                                            ))
+        self.splash_cc['surface'] = assets.surfaces.load(self.splash_cc['path'],
+                                                         prepare.SCALE, convert=None)
         self.splash_cc['position'] = (prepare.SCREEN_SIZE[0] - splash_border - self.splash_cc['surface'].get_width(),
                                       prepare.SCREEN_SIZE[1] - splash_border - self.splash_cc['surface'].get_height())
 
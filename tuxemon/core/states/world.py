@@ -42,6 +42,9 @@ from .. import tools, prepare
 from ..components import screen
 from ..components import config
 from ..components import map
+from ..components import assets
+from ..components import renderer
+from ..components import pathfinding
 from ..components import pyganim
 from ..components import player
 from ..components import event
@@ -95,43 +98,13 @@ class World(tools._State):
             int(math.ceil(self.resolution[1] / self.tile_size[1]) + 1)]
         # self.visible_tiles = [5, 5]
 
-        # Create a new map instance
-        self.current_map = map.Map(prepare.BASEDIR + "resources/maps/%s" % prepare.CONFIG.starting_map)
-        self.tiles, self.collision_map, self.collision_lines_map, self.map_size = \
-            self.current_map.loadfile(self.tile_size)
-
         # Create an empty collision_rectmap list which contains rectangle
         # objects that we can test collision with
         self.collision_rectmap = []
 
-        # Get the events actions and conditions from the current map
-        self.game.events = self.current_map.events
-
-        # Scale the loaded tiles if enabled
-        if prepare.CONFIG.scaling == "1":
-            x_pos = 0   # Here we need to keep track of the x index in list
-
-            # Loop through each row in the map. Each row is a list of Tile
-            # objects in that row.
-            for row in self.tiles:
-                # Here we need to keep track of the y index of the list within
-                # the row
-                y_pos = 0
-
-                # Now loop through each tile in the row and scale it
-                # accordingly.
-                for column in row:
-                    if column:
-                        layer_pos = 0
-                        for tile in column:
-                            tile["surface"] = \
-                                pygame.transform.scale(
-                                    tile["surface"],
-                                    (self.tile_size[0], self.tile_size[1]))
-                            self.tiles[x_pos][y_pos][layer_pos] = tile
-                            layer_pos += 1
-                    y_pos += 1
-                x_pos += 1
+        # Load the starting map
+        self.current_map = None
+        self.load_map(prepare.CONFIG.starting_map)
 
         # Set the world's current state. This is used for various functions.
         self.state = "World"
@@ -144,6 +117,9 @@ class World(tools._State):
         self.player1 = prepare.player1
         self.npcs = []
 
+        # The distances to the player's tile, shared by all NPCs that chase the player.
+        self.player_flow_field = pathfinding.FlowField()
+
         # Set the global coordinates used to pan the screen.
         self.start_position = prepare.CONFIG.starting_position
         self.global_x = self.player1.position[0] - \
@@ -396,7 +372,7 @@ class World(tools._State):
         # Set the currently loaded map. This is needed because the event
         # engine loads event conditions and event actions from the currently
         # loaded map. If we change maps, we need to update this.
-        self.event_engine.current_map = self.current_map
+        self.event_engine.set_map(self.current_map)
 
         ######################################################################
         #                       Fullscreen Animations                        #
@@ -507,8 +483,10 @@ class World(tools._State):
         # config
         self.time_passed_seconds = self.game.time_passed_seconds
 
-        # Fill the screen background with black
-        self.screen.fill((0, 0, 0))
+        # Fill the screen background with black, unless the map renderer draws over the whole
+        # screen anyway.
+        if not (self.map_renderer and self.map_renderer.opaque):
+            self.screen.fill((0, 0, 0))
 
         # Get all the pygame events
         self.events = keys
@@ -665,33 +643,45 @@ class World(tools._State):
              1])  # How many tiles down we have to draw the first tile
         self.tile_buffer = 2  # This is how many tiles we should draw past the visible region
 
-        # Loop through the number of visible tiles and draw only the tiles that
-        # are visible
-        for row in xrange(starting_tile_x - self.tile_buffer, starting_tile_x + self.visible_tiles[0]):
-            if row > 0:
-
-                for column in xrange(starting_tile_y - self.tile_buffer, starting_tile_y + self.visible_tiles[1]):
-                    if row > 0:
-                        try:
-                            if self.tiles[row][column]:		# Check to see if a tile exists at this coordinates
-                                for tile in self.tiles[row][column]:
-                                    # Append the high level tiles to its own
-                                    # list to be drawn over the player. Tiles on layer 4 will be drawn
-                                    # above the player's body, but below the player's head.
-                                    if tile["layer"] == 4:
-                                        self.medlayer_tiles.append(tile)
-                                    elif tile["layer"] > 4:
-                                        self.highlayer_tiles.append(tile)
-                                    else:
-                                        self.screen.blit(tile["surface"],
-                                                        (tile[
-                                                            "position"][0] + self.global_x,
-                                                         tile["position"][1] + self.global_y))
-
-                        # If we try drawing a tile that is out of index range, that means we
-                        # reached the end of the list, so just break the loop
-                        except IndexError:
-                            break
+        # Only draw the tiles that are visible and inside the map.
+        tiles = self.tiles
+        start_x = max(starting_tile_x - self.tile_buffer, 0)
+        end_x = min(starting_tile_x + self.visible_tiles[0], tiles.width)
+        start_y = max(starting_tile_y - self.tile_buffer, 0)
+        end_y = min(starting_tile_y + self.visible_tiles[1], tiles.height)
+
+        # The map renderers draw the ground layers (below layer 4) all at once, so only the
+        # layers that are drawn around the player and NPCs need to be gathered tile by tile.
+        first_layer = 0
+        if self.map_renderer:
+            self.map_renderer.draw(self.screen, self.global_x, self.global_y)
+            first_layer = 3
+
+        images = tiles.images
+        for layer_index in xrange(first_layer, len(tiles.layers)):
+            layer = tiles.layers[layer_index]
+            layer_number = layer_index + 1
+            for y in xrange(start_y, end_y):
+                row = y * tiles.width
+                position_y = y * self.tile_size[1]
+                for x in xrange(start_x, end_x):
+                    gid = layer[row + x]
+                    if not gid:
+                        continue
+
+                    position = (x * self.tile_size[0], position_y)
+
+                    # Append the high level tiles to its own list to be drawn over the player.
+                    # Tiles on layer 4 will be drawn above the player's body, but below the
+                    # player's head.
+                    if layer_number == 4:
+                        self.medlayer_tiles.append((images[gid], position))
+                    elif layer_number > 4:
+                        self.highlayer_tiles.append((images[gid], position))
+                    else:
+                        self.screen.blit(images[gid],
+                                         (position[0] + self.global_x,
+                                          position[1] + self.global_y))
 
         # We need to keep track of the global_x/y that we used to draw the bottom tiles so we use
         # the same values for the higher layer tiles. We have to do this because when we draw the
@@ -720,19 +710,21 @@ class World(tools._State):
         else:
             self.player1.moverate = self.player1.walkrate
 
-        # Check to see if the player is colliding with anything
-        self.collision_rectmap = []
-        for item in self.collision_map:
-            self.collision_rectmap.append(
-                pygame.Rect(
-                    (item[0] * self.tile_size[0]) + self.global_x,
-                    (item[1] * self.tile_size[0]) + self.global_y, self.tile_size[0], self.tile_size[1]))
-
-        # Add any NPC's to the collision rectangle map. We use this to see if
-        # the player is colliding or not
-        for npc in self.npcs:
-            self.collision_rectmap.append(
-                pygame.Rect(npc.position[0], npc.position[1], self.tile_size[0], self.tile_size[1]))
+        # Build the rectangles of the collision tiles and NPCs for the debug collision overlay.
+        # Collisions themselves are checked with the collision grid of the map.
+        if prepare.CONFIG.collision_map == "1":
+            self.collision_rectmap = []
+            for item in self.collision_map:
+                self.collision_rectmap.append(
+                    pygame.Rect(
+                        (item[0] * self.tile_size[0]) + self.global_x,
+                        (item[1] * self.tile_size[0]) + self.global_y,
+                        self.tile_size[0], self.tile_size[1]))
+
+            for npc in self.npcs:
+                self.collision_rectmap.append(
+                    pygame.Rect(npc.position[0], npc.position[1],
+                                self.tile_size[0], self.tile_size[1]))
 
         # Set the global_x/y when the player moves around
         self.global_x, self.global_y = self.player1.move(
@@ -742,6 +734,8 @@ class World(tools._State):
         self.global_x_diff = self.orig_global_x - self.global_x
         self.global_y_diff = self.orig_global_y - self.global_y
 
+        player_tile = (int(round(self.player1.tile_pos[0])), int(round(self.player1.tile_pos[1])))
+
         # Draw any game NPC's
         for npc in self.npcs:
             # Get the NPC's tile position based on his pixel position. Since the NPC's sprite is 1 x 2
@@ -763,8 +757,12 @@ class World(tools._State):
             #print "npc.tile_pos="+str(npc.tile_pos)
 
             # if the npc has a path, move it along its path
-            if npc.path:
-                npc.move_by_path()
+            if npc.path or npc.path_request:
+                npc.move_by_path(self)
+
+            # NPCs with the "chase" behavior walk towards the player.
+            elif npc.behavior == "chase":
+                npc.move_by_flow_field(self.player_flow_field, player_tile, self)
 
             npc.move(self.tile_size, self.time_passed_seconds, self)
 
@@ -782,19 +780,9 @@ class World(tools._State):
 
         # Draw the medium level tiles. These tiles will appear above the player's body,
         # but below the player's head.
-        for tile in self.medlayer_tiles:
-
-            # Get the rectangle object of the tile that is going to be drawn so
-            # we can see if it is going to be outside the visible screen area
-            # or not
-            tile_rect = pygame.Rect(tile["surface"].get_width(), tile["surface"].get_height(), tile[
-                                    "position"][0] + self.global_x, tile["position"][1] + self.global_y)
-
-            # If any part of the tile overlaps with the screen, then draw it to
-            # the screen
-            if self.screen_rect.colliderect(tile_rect):
-                self.screen.blit(
-                    tile["surface"], (tile["position"][0] + self.orig_global_x, tile["position"][1] + self.orig_global_y))
+        for surface, position in self.medlayer_tiles:
+            self.screen.blit(
+                surface, (position[0] + self.orig_global_x, position[1] + self.orig_global_y))
 
         # Draw the top half of our NPCs above layer 4.
         for npc in self.npcs:
@@ -809,19 +797,9 @@ class World(tools._State):
         """
 
         # Draw the high level tiles
-        for tile in self.highlayer_tiles:
-
-            # Get the rectangle object of the tile that is going to be drawn so
-            # we can see if it is going to be outside the visible screen area
-            # or not
-            tile_rect = pygame.Rect(tile["surface"].get_width(), tile["surface"].get_height(), tile[
-                                    "position"][0] + self.global_x, tile["position"][1] + self.global_y)
-
-            # If any part of the tile overlaps with the screen, then draw it to
-            # the screen
-            if self.screen_rect.colliderect(tile_rect):
-                self.screen.blit(
-                    tile["surface"], (tile["position"][0] + self.orig_global_x, tile["position"][1] + self.orig_global_y))
+        for surface, position in self.highlayer_tiles:
+            self.screen.blit(
+                surface, (position[0] + self.orig_global_x, position[1] + self.orig_global_y))
 
         # Draw any map animations over everything.
         for animation_name, animation in self.game.animations.items():
@@ -1135,36 +1113,7 @@ class World(tools._State):
                 self.delayed_facing = None
 
             if prepare.BASEDIR + "resources/maps/" + self.delayed_mapname != self.current_map.filename:
-                self.current_map = map.Map(
-                    prepare.BASEDIR + "resources/maps/" + self.delayed_mapname)
-                self.event_engine.current_map = map.Map(
-                    prepare.BASEDIR + "resources/maps/" + self.delayed_mapname)
-                self.tiles, self.collision_map, self.collision_lines_map, self.map_size = self.current_map.loadfile(
-                    self.tile_size)
-                self.game.events = self.current_map.events
-
-                # Clear out any existing NPCs
-                self.npcs = []
-
-                # Scale the loaded tiles if enabled
-                if prepare.CONFIG.scaling == "1":
-                    x_pos = 0        # Here we need to keep track of the x index of the list
-                    # Loop through each row in the map. Each row is a list of
-                    # Tile objects in that row.
-                    for row in self.tiles:
-                        y_pos = 0       # Here we need to keep track of the y index of the list within the row
-                        # Now loop through each tile in the row and scale it
-                        # accordingly.
-                        for column in row:
-                            if column:
-                                layer_pos = 0
-                                for tile in column:
-                                    tile["surface"] = pygame.transform.scale(
-                                        tile["surface"], (self.tile_size[0], self.tile_size[1]))
-                                    self.tiles[x_pos][y_pos][layer_pos] = tile
-                                    layer_pos += 1
-                            y_pos += 1
-                        x_pos += 1
+                self.load_map(self.delayed_mapname)
 
             self.delayed_teleport = False
 
@@ -1188,6 +1137,55 @@ class World(tools._State):
                 "transition"] = False    # Set the transition variable in event_data to false when we're done
 
 
+    def load_map(self, mapname):
+        """Loads a map from "resources/maps/" and makes it the current map of the world and
+        the event engine. Any NPCs on the previous map are removed.
+
+        :param mapname: The filename of the map to load. E.g. "bedroom_test.tmx"
+
+        :type mapname: String
+
+        :rtype: None
+        :returns: None
+
+        """
+
+        # Paths that are still being searched for lead nowhere on the new map.
+        pathfinding.worker.cancel_all()
+
+        self.current_map = map.Map(prepare.BASEDIR + "resources/maps/" + mapname)
+        self.tiles, self.collision_map, self.collision_lines_map, self.map_size = \
+            self.current_map.loadfile(self.tile_size)
+        self.collision_grid = self.current_map.collision_grid
+
+        # Scale the loaded tiles if enabled
+        if prepare.CONFIG.scaling == "1":
+            self.tiles.scale(self.tile_size)
+
+        # Draw the ground layers with one of the faster map renderers if it is enabled.
+        if prepare.CONFIG.renderer == "chunks":
+            self.map_renderer = renderer.ChunkRenderer(self.tiles, 3)
+        elif prepare.CONFIG.renderer == "scroll":
+            self.map_renderer = renderer.ScrollRenderer(self.tiles, 3)
+        else:
+            self.map_renderer = None
+
+        # Get the events actions and conditions from the current map. The event engine loads
+        # event conditions and event actions from the currently loaded map.
+        self.game.events = self.current_map.events
+        self.game.event_engine.set_map(self.current_map)
+
+        # Decode the sounds that the map's events play now, rather than when they're first played.
+        assets.sounds.preload(act[1] for event in self.current_map.events
+                              for act in event["acts"]
+                              if act[0] == "play_sound" and len(act) > 1)
+
+        # Clear out any existing NPCs, and publish that they're gone so the "npc_exists"
+        # conditions are checked again.
+        self.npcs = []
+        self.game.event_engine.notify("npcs")
+
+
     def get_pos_from_tilepos(self, tile_position):
         """Returns the screen coordinate based on tile position.
 
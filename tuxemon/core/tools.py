@@ -47,6 +47,7 @@ from core.components import monster
 from core.components import item
 from core.components import map as maps
 from core.components import pyganim
+from core.components import assets
 
 # Try and import networking if it is available.
 try:
@@ -95,7 +96,21 @@ class Control(object):
     """
 
     def __init__(self, caption):
-        self.screen = pg.display.get_surface()
+        from core import prepare
+
+        # The surface that the game draws to. When rendering at native resolution this is a
+        # small surface that gets scaled up to the display after every frame.
+        self.display = pg.display.get_surface()
+        self.screen = prepare.SCREEN
+        self.display_scale = prepare.DISPLAY_SCALE
+        self.text_layer = prepare.TEXT_LAYER
+
+        # The area of the display that the scaled up screen covers. The screen is centered if
+        # the display isn't an exact multiple of the screen's size.
+        screen_width, screen_height = self.screen.get_size()
+        self.display_rect = pg.Rect(0, 0, screen_width * self.display_scale,
+                                    screen_height * self.display_scale)
+        self.display_rect.center = self.display.get_rect().center
         self.caption = caption
         self.done = False
         self.clock = pg.time.Clock()
@@ -115,7 +130,6 @@ class Control(object):
             self.server = None
 
         # Set up our game's configuration from the prepare module.
-        from core import prepare
         self.imports = {
                 "prepare": prepare,
                 "ai": ai,
@@ -125,7 +139,8 @@ class Control(object):
                 "player": player,
                 "item": item,
                 "map": maps,
-                "pyganim": pyganim
+                "pyganim": pyganim,
+                "assets": assets
                 }
         self.config = prepare.CONFIG
 
@@ -308,6 +323,15 @@ class Control(object):
         self.key_events = []
         self.keys = list(pg.key.get_pressed())
         for event in pg.event.get():
+
+            # Mouse positions and motion are in display coordinates. Convert them to screen
+            # coordinates, so they can be compared with what was drawn on the screen.
+            if self.display_scale > 1 and "pos" in event.dict:
+                attributes = dict(event.dict, pos=self.get_screen_pos(event.pos))
+                if "rel" in event.dict:
+                    attributes["rel"] = self.get_screen_rel(event.rel)
+                event = pg.event.Event(event.type, attributes)
+
             self.key_events.append(event)
             if event.type == pg.QUIT:
                 self.done = True
@@ -318,7 +342,7 @@ class Control(object):
 
             # Loop through our controller overlay events and pass them to the current state.
             if self.config.controller_overlay == "1":
-                self.mouse_pos = pg.mouse.get_pos()
+                self.mouse_pos = self.get_screen_pos(pg.mouse.get_pos())
                 contr_events = self.controller_event_loop(event)
                 if contr_events:
                     for contr_event in contr_events:
@@ -343,6 +367,54 @@ class Control(object):
                     self.state.get_event(net_event)
 
 
+    def get_screen_pos(self, position):
+        """Converts a position on the display, such as the position of the mouse, to a position
+        on the screen surface the game draws to. These are the same unless the game is rendering
+        at native resolution.
+
+        :param position: The (x, y) position on the display in pixels.
+
+        :type position: Tuple
+
+        :rtype: Tuple
+        :returns: The (x, y) position on the screen in pixels.
+
+        **Examples:**
+
+        >>> game.display_scale
+        5
+        >>> game.get_screen_pos((640, 360))
+        (128, 72)
+
+        """
+        return ((position[0] - self.display_rect.x) / self.display_scale,
+                (position[1] - self.display_rect.y) / self.display_scale)
+
+
+    def get_screen_rel(self, motion):
+        """Converts a relative motion on the display, such as the rel attribute of a
+        MOUSEMOTION event, to a motion on the screen surface the game draws to. See
+        :py:func:`get_screen_pos`.
+
+        :param motion: The (x, y) motion on the display in pixels.
+
+        :type motion: Tuple
+
+        :rtype: Tuple
+        :returns: The (x, y) motion on the screen in pixels, rounded towards zero.
+
+        **Examples:**
+
+        >>> game.display_scale
+        5
+        >>> game.get_screen_rel((12, -12))
+        (2, -2)
+
+        """
+        return (int(float(motion[0]) / self.display_scale),
+                int(float(motion[1]) / self.display_scale))
+
+
     def network_event_loop(self):
         """Process all network events from the mobile controller and pass them
         down to current State. All network events are converted to keyboard
@@ -670,6 +742,15 @@ class Control(object):
 
         # Draw and update our display
         self.update(time_delta)
+
+        # When rendering at native resolution, scale the whole screen up to the display at
+        # once instead of scaling every image that was drawn, then draw the text on top of it.
+        if self.screen is not self.display:
+            pg.transform.scale(self.screen, self.display_rect.size,
+                               self.display.subsurface(self.display_rect))
+            self.display.blit(self.text_layer, self.display_rect)
+            self.text_layer.fill((0, 0, 0, 0))
+
         pg.display.update()
         if self.show_fps:
             fps = self.clock.get_fps()